@@ -0,0 +1,281 @@
+"""
+Offline benchmark suite for cafeteria-asyncio.
+
+Usage::
+
+    python benchmarks/bench.py --output results.json
+    python benchmarks/bench.py --baseline results.json --threshold 1.25
+
+Results are written as JSON, keyed by benchmark name, with the best time in seconds
+per operation over all repeats. When a baseline is given, benchmarks slower than the
+baseline by more than *threshold* are reported and the exit code is non-zero.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cafeteria.asyncio.callbacks import (
+    Callback,
+    CallbackRegistry,
+    SimpleTriggerCallback,
+    trigger_callback,
+)
+from cafeteria.asyncio.commons import cancel_all_tasks
+from cafeteria.asyncio.executors import InlineStrategy
+from cafeteria.asyncio.synchronous import default_bridge, execute_async_method
+
+# benchmark name -> (seconds taken, number of operations)
+Measurement = Tuple[float, int]
+
+BENCHMARKS: List[Tuple[str, Callable[[bool], Dict[str, Measurement]]]] = []
+
+
+def benchmark(function: Callable[[bool], Dict[str, Measurement]]):
+    BENCHMARKS.append((function.__name__, function))
+    return function
+
+
+async def noop_coroutine(*_: Any, **__: Any) -> None:
+    pass
+
+
+def noop(*_: Any, **__: Any) -> None:
+    pass
+
+
+def sizes(quick: bool, full: List[int]) -> List[int]:
+    return [size for size in full if not quick or size <= 10_000]
+
+
+@benchmark
+def dispatch(quick: bool) -> Dict[str, Measurement]:
+    """
+    Per dispatch time to dispatch an event and for all triggered callbacks to complete.
+    Each sample dispatches enough events to trigger a similar number of callbacks for
+    every size, so that small sizes are not timed from a single call.
+    """
+    results = {}
+    total = 5_000 if quick else 50_000
+
+    async def measure(callbacks: List[Any], number: int) -> float:
+        registry = CallbackRegistry(callbacks={"event": callbacks})
+        # as timeit does, keep garbage collection pauses out of the measurement
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(number):
+                registry.dispatch("event")
+            await registry.drain()
+            return time.perf_counter() - started
+        finally:
+            gc.enable()
+
+    for size in sizes(quick, [1, 10, 100, 1_000, 10_000, 100_000]):
+        number = max(1, total // size)
+        for kind, function in (("coroutine", noop_coroutine), ("sync", noop)):
+            # distinct callbacks, registering the same one repeatedly is not typical
+            callbacks = [Callback(function, i) for i in range(size)]
+            results[f"dispatch[{kind},{size}]"] = (
+                asyncio.run(measure(callbacks, number)),
+                number,
+            )
+    return results
+
+
+@benchmark
+def registry_operations(quick: bool) -> Dict[str, Measurement]:
+    """
+    Per operation cost of register, exists and deregister with a growing registry.
+    """
+    results = {}
+    for size in sizes(quick, [100, 1_000, 10_000, 100_000]):
+        callbacks = [Callback(noop, i) for i in range(size)]
+        registry = CallbackRegistry()
+
+        started = time.perf_counter()
+        for callback in callbacks:
+            registry.register("event", callback)
+        results[f"register[{size}]"] = (time.perf_counter() - started, size)
+
+        started = time.perf_counter()
+        for callback in callbacks:
+            registry.exists("event", callback)
+        results[f"exists[{size}]"] = (time.perf_counter() - started, size)
+
+        started = time.perf_counter()
+        for callback in reversed(callbacks):
+            registry.deregister("event", callback)
+        results[f"deregister[{size}]"] = (time.perf_counter() - started, size)
+    return results
+
+
+@benchmark
+def trigger(quick: bool) -> Dict[str, Measurement]:
+    """
+    Per callback overhead of trigger_callback, excluding waiting for completion.
+    """
+    count = 10_000 if quick else 100_000
+    inline = Callback(noop)
+    inline.strategy = InlineStrategy()
+    eager = Callback(noop_coroutine)
+    eager.eager = True
+    kinds = {
+        "coroutine": noop_coroutine,
+        "coroutine-eager": eager,
+        "sync": noop,
+        "sync-inline": inline,
+        "callback": Callback(noop_coroutine, "foo", bar="baz"),
+        "simple-trigger-callback": SimpleTriggerCallback(noop_coroutine),
+    }
+
+    async def measure(callback: Any) -> float:
+        results = []
+        started = time.perf_counter()
+        for _ in range(count):
+            results.append(trigger_callback(callback, "event"))
+        elapsed = time.perf_counter() - started
+        await asyncio.gather(*results)
+        return elapsed
+
+    return {
+        f"trigger_callback[{kind}]": (asyncio.run(measure(callback)), count)
+        for kind, callback in kinds.items()
+    }
+
+
+@benchmark
+def cancellation(quick: bool) -> Dict[str, Measurement]:
+    """
+    Time to cancel and wait for a large number of running tasks.
+    """
+    results = {}
+
+    async def measure(size: int) -> float:
+        async def cleanup() -> None:
+            try:
+                await asyncio.sleep(3600)
+            finally:
+                await asyncio.sleep(0)
+
+        for _ in range(size):
+            asyncio.ensure_future(cleanup())
+        await asyncio.sleep(0)
+
+        started = time.perf_counter()
+        await cancel_all_tasks()
+        return time.perf_counter() - started
+
+    for size in sizes(quick, [1_000, 10_000, 50_000]):
+        results[f"cancel_all_tasks[{size}]"] = (asyncio.run(measure(size)), size)
+    return results
+
+
+@benchmark
+def synchronous(quick: bool) -> Dict[str, Measurement]:
+    """
+    Per call overhead of executing a coroutine from synchronous code.
+    """
+    count = 1_000 if quick else 10_000
+    default_bridge().run(noop_coroutine())
+
+    started = time.perf_counter()
+    for _ in range(count):
+        execute_async_method(noop_coroutine())
+    results = {"execute_async_method": (time.perf_counter() - started, count)}
+
+    started = time.perf_counter()
+    default_bridge().map(noop_coroutine, range(count))
+    results["bridge_map"] = (time.perf_counter() - started, count)
+    return results
+
+
+def run(quick: bool, repeat: int, selected: Optional[List[str]]) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = dict()
+    for name, function in BENCHMARKS:
+        if selected and name not in selected:
+            continue
+        print(f"Running {name}", file=sys.stderr)
+        for _ in range(repeat):
+            for key, (elapsed, operations) in function(quick).items():
+                per_operation = elapsed / operations
+                best = results.get(key)
+                if best is None or per_operation < best["seconds_per_op"]:
+                    results[key] = {
+                        "seconds_per_op": per_operation,
+                        "ops_per_second": operations / elapsed if elapsed else 0.0,
+                        "operations": operations,
+                    }
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "quick": quick,
+            "repeat": repeat,
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    regressions = []
+    for key, result in sorted(current["results"].items()):
+        reference = baseline["results"].get(key)
+        if reference is None or not reference["seconds_per_op"]:
+            continue
+        ratio = result["seconds_per_op"] / reference["seconds_per_op"]
+        status = "REGRESSION" if ratio > threshold else "ok"
+        print(f"{status:>10} {ratio:6.2f}x {key}", file=sys.stderr)
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="maximum allowed slowdown ratio against the baseline",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--quick", action="store_true", help="skip the largest problem sizes"
+    )
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help=f"benchmarks to run, one of: {', '.join(n for n, _ in BENCHMARKS)}",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.quick, args.repeat, args.benchmarks)
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
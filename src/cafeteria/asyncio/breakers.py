@@ -0,0 +1,203 @@
+import collections
+import time
+from enum import Enum
+from typing import Any, Deque, Optional
+
+
+class BreakerState(Enum):
+    #: calls are allowed, outcomes are tracked
+    CLOSED = "closed"
+    #: calls are rejected until the reset timeout has passed
+    OPEN = "open"
+    #: a limited number of trial calls are allowed to determine if the callback has
+    #: recovered
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """
+    Track the health of a callback registered with a
+    :class:`cafeteria.asyncio.callbacks.CallbackRegistry`, rejecting calls while it is
+    failing, slow or saturated so that it cannot exhaust threads and memory shared with
+    healthy callbacks.
+
+    The breaker opens once at least *minimum_calls* of the last *window* calls
+    completed, and the share of those that failed, or took longer than
+    *slow_call_duration*, reaches *failure_rate*. After *reset_timeout* seconds it
+    becomes half-open, allowing *half_open_calls* trial calls. If all of them succeed
+    the breaker closes, otherwise it opens again.
+
+    Calls exceeding *max_concurrency* are rejected without affecting the state. Rejected
+    calls trigger *fallback* instead, if set, or are skipped.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        minimum_calls: int = 10,
+        slow_call_duration: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        fallback: Optional[Any] = None,
+    ) -> None:
+        """
+        :param failure_rate: Share of failed or slow calls, between 0 and 1, opening
+            the breaker.
+        :param window: Number of most recent calls the failure rate is computed over.
+        :param minimum_calls: Number of calls required before the breaker may open.
+        :param slow_call_duration: If specified, calls taking longer than this many
+            seconds, including time spent queued, count as failed.
+        :param max_concurrency: If specified, the maximum number of calls in flight.
+        :param reset_timeout: Seconds the breaker stays open before allowing trial
+            calls.
+        :param half_open_calls: Number of successful trial calls required to close the
+            breaker.
+        :param fallback: Callback triggered, with the same arguments, instead of a
+            rejected call.
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError(f"failure_rate must be in (0, 1], got {failure_rate}")
+        if window < 1 or not 1 <= minimum_calls <= window:
+            raise ValueError("minimum_calls must be between 1 and window")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be positive, got {max_concurrency}")
+        if half_open_calls < 1:
+            raise ValueError(f"half_open_calls must be positive, got {half_open_calls}")
+        self.failure_rate = failure_rate
+        self.window = window
+        self.minimum_calls = minimum_calls
+        self.slow_call_duration = slow_call_duration
+        self.max_concurrency = max_concurrency
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.fallback = fallback
+
+        self._state = BreakerState.CLOSED
+        # outcomes of the most recent calls, True if failed
+        self._outcomes: Deque[bool] = collections.deque(maxlen=window)
+        self._failures = 0
+        self._opened = 0.0
+        self._trials = 0
+        self._successes = 0
+        self._in_flight = 0
+        self._rejected = 0
+
+    def copy(self) -> "CircuitBreaker":
+        """
+        :return: A new breaker with the same configuration, in its initial state.
+        """
+        return CircuitBreaker(
+            failure_rate=self.failure_rate,
+            window=self.window,
+            minimum_calls=self.minimum_calls,
+            slow_call_duration=self.slow_call_duration,
+            max_concurrency=self.max_concurrency,
+            reset_timeout=self.reset_timeout,
+            half_open_calls=self.half_open_calls,
+            fallback=self.fallback,
+        )
+
+    @property
+    def state(self) -> BreakerState:
+        if (
+            self._state is BreakerState.OPEN
+            and time.monotonic() - self._opened >= self.reset_timeout
+        ):
+            self._half_open()
+        return self._state
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def rejected(self) -> int:
+        """
+        Number of calls rejected since the breaker was created.
+        """
+        return self._rejected
+
+    @property
+    def observed_failure_rate(self) -> float:
+        """
+        Share of failed or slow calls in the current window.
+        """
+        return self._failures / len(self._outcomes) if self._outcomes else 0.0
+
+    def acquire(self) -> bool:
+        """
+        Determine if a call is allowed, reserving a slot for it if so. Every allowed
+        call must be followed by a call to :meth:`release`.
+
+        :return: `True` if the call is allowed.
+        """
+        state = self.state
+        if state is BreakerState.OPEN or (
+            state is BreakerState.HALF_OPEN and self._trials >= self.half_open_calls
+        ):
+            self._rejected += 1
+            return False
+        if self.max_concurrency is not None and self._in_flight >= self.max_concurrency:
+            self._rejected += 1
+            return False
+        if state is BreakerState.HALF_OPEN:
+            self._trials += 1
+        self._in_flight += 1
+        return True
+
+    def release(self, duration: float, failed: bool) -> None:
+        """
+        Record the outcome of an allowed call.
+
+        :param duration: Seconds the call took.
+        :param failed: `True` if the call raised an exception or was cancelled.
+        """
+        self._in_flight -= 1
+        if self.slow_call_duration is not None and duration > self.slow_call_duration:
+            failed = True
+
+        if self._state is BreakerState.HALF_OPEN:
+            if failed:
+                self._open()
+            else:
+                self._successes += 1
+                if self._successes >= self.half_open_calls:
+                    self._close()
+            return
+        if self._state is BreakerState.OPEN:
+            # a call allowed before the breaker opened
+            return
+
+        if len(self._outcomes) == self.window and self._outcomes[0]:
+            self._failures -= 1
+        self._outcomes.append(failed)
+        if failed:
+            self._failures += 1
+            calls = len(self._outcomes)
+            if (
+                calls >= self.minimum_calls
+                and self._failures >= self.failure_rate * calls
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        self._state = BreakerState.OPEN
+        self._opened = time.monotonic()
+
+    def _half_open(self) -> None:
+        self._state = BreakerState.HALF_OPEN
+        self._trials = 0
+        self._successes = 0
+
+    def _close(self) -> None:
+        self._state = BreakerState.CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(state={self._state.value}, "
+            f"in_flight={self._in_flight}, rejected={self._rejected})"
+        )
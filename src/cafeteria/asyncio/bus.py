@@ -0,0 +1,552 @@
+import asyncio
+import collections
+import contextvars
+import inspect
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from cafeteria.asyncio.callbacks import (
+    Callback,
+    CallbackRegistry,
+    CallbackResultType,
+    CallbackType,
+    EventType,
+)
+from cafeteria.asyncio.instrumentation import DispatchRecord
+from cafeteria.asyncio.tracing import SpanKind, _current_span
+
+
+class OverflowPolicy(Enum):
+    """
+    Policy applied when an event is published to a full buffer.
+    """
+
+    #: wait for space to become available, only possible when publishing async
+    BLOCK = "block"
+    #: discard the oldest buffered event to make space for the new event
+    DROP_OLDEST = "drop-oldest"
+    #: discard the new event
+    DROP_NEWEST = "drop-newest"
+    #: raise :class:`asyncio.QueueFull`
+    RAISE = "raise"
+
+
+class Event(NamedTuple):
+    event_type: EventType
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+
+
+@dataclass
+class BatchCallback(Callback):
+    """
+    A callback that, when registered with a :class:`QueuedCallbackRegistry`, is
+    triggered with a list of :class:`Event` instances once *max_batch* events are
+    buffered or *max_delay* seconds have passed since the first buffered event.
+    """
+
+    def __init__(
+        self,
+        function,
+        *args: Any,
+        max_batch: int = 100,
+        max_delay: float = 0.05,
+        **kwargs: Any,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be positive, got {max_batch}")
+        super().__init__(function, *args, **kwargs)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+    __hash__ = Callback.__hash__
+
+
+class _Batch:
+    __slots__ = ("callback", "event_type", "events", "timer")
+
+    def __init__(self, callback: BatchCallback, event_type: EventType) -> None:
+        self.callback = callback
+        self.event_type = event_type
+        self.events: List[Event] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class QueuedCallbackRegistry(CallbackRegistry):
+    """
+    A :class:`CallbackRegistry` that buffers dispatched events in bounded queues. Events
+    are delivered to callbacks by a fixed number of worker coroutines, each waiting for
+    the callbacks of one event to complete before taking the next one. Callbacks are
+    triggered with the context variables set when the event was dispatched.
+    """
+
+    def __init__(
+        self,
+        callbacks: Optional[
+            Dict[EventType, Union[CallbackType, List[CallbackType]]]
+        ] = None,
+        maxsize: int = 1024,
+        workers: int = 1,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        partition_by_event_type: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param callbacks: Callbacks to register, keyed by event type.
+        :param maxsize: Maximum number of events buffered per queue.
+        :param workers: Number of worker coroutines consuming each queue.
+        :param overflow: Policy applied when publishing to a full queue.
+        :param partition_by_event_type: If `True`, each event type is buffered in, and
+            consumed from, its own queue so that bursts of one event type do not delay
+            others.
+        :param kwargs: Keyword arguments of :class:`CallbackRegistry`. Dispatch spans
+            of a *tracer* start when an event is queued, the time until it is delivered
+            is recorded as queued.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        if workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}")
+
+        self.maxsize = maxsize
+        self.workers = workers
+        self.overflow = overflow
+        self.partition_by_event_type = partition_by_event_type
+
+        self._queues: Dict[EventType, asyncio.Queue] = dict()
+        self._workers: List[asyncio.Task] = []
+        self._batches: Dict[int, _Batch] = dict()
+        self._started = False
+        self._dropped = 0
+
+        super().__init__(callbacks=callbacks, **kwargs)
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of events discarded due to the overflow policy.
+        """
+        return self._dropped
+
+    @property
+    def queued(self) -> int:
+        """
+        Number of events currently buffered.
+        """
+        return sum(queue.qsize() for queue in self._queues.values())
+
+    def _queue(self, event_type: EventType) -> asyncio.Queue:
+        key = event_type if self.partition_by_event_type else None
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.Queue(maxsize=self.maxsize)
+            if self._started:
+                self._spawn_workers(queue)
+        return queue
+
+    def _spawn_workers(self, queue: asyncio.Queue) -> None:
+        for _ in range(self.workers):
+            self._workers.append(asyncio.ensure_future(self._worker(queue)))
+
+    def _item(self, event: Event) -> Tuple[Event, contextvars.Context]:
+        """
+        Create a queue item for *event*, capturing the current context to deliver it in.
+        """
+        context = contextvars.copy_context()
+        if self._tracer is not None:
+            span = self._tracer._start(SpanKind.DISPATCH, event.event_type)
+            context.run(_current_span.set, span)
+        return event, context
+
+    def _discard(self, item: Tuple[Event, contextvars.Context]) -> None:
+        if self._tracer is not None:
+            span = item[1][_current_span]
+            span.failed = True
+            self._tracer._seal(span)
+
+    def _enqueue(self, queue: asyncio.Queue, event: Event) -> None:
+        if not queue.full():
+            queue.put_nowait(self._item(event))
+        elif self.overflow is OverflowPolicy.DROP_OLDEST:
+            self._discard(queue.get_nowait())
+            queue.task_done()
+            queue.put_nowait(self._item(event))
+            self._dropped += 1
+        elif self.overflow is OverflowPolicy.DROP_NEWEST:
+            self._dropped += 1
+        else:
+            raise asyncio.QueueFull(
+                f"Event queue full ({self.maxsize}), cannot enqueue {event.event_type}"
+            )
+
+    def dispatch(self, event_type: EventType, *args: Any, **kwargs: Any) -> None:
+        """
+        Queue an event for delivery to callbacks registered for *event_type*. As this
+        cannot wait for space, :class:`asyncio.QueueFull` is raised when the queue is
+        full and the overflow policy is :attr:`OverflowPolicy.BLOCK`. Use
+        :meth:`publish` to wait instead.
+
+        If the registry is bound to an event loop, events dispatched from other threads
+        are handed to the loop before being queued, overflow errors are then logged. If
+        a policy is set for *event_type*, events are queued once the policy delivers
+        them, see :meth:`set_policy`.
+
+        :param event_type: Event type to dispatch
+        :param args: Positional arguments to be passed into the callback before any
+            pre-configured positional arguments.
+        :param kwargs: Keyword arguments to be passed when triggering the callback.
+            These override any pre-configured arguments.
+        """
+        if self._loop is not None and self._off_loop():
+            self._handoff(event_type, args, kwargs)
+            return
+        if self._policies:
+            policy = self._policies.get(event_type)
+            if policy is not None:
+                policy.submit(event_type, args, kwargs, self._enqueue_event)
+                return
+        self._enqueue_event(event_type, args, kwargs)
+
+    def _enqueue_event(
+        self, event_type: EventType, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> None:
+        self._enqueue(self._queue(event_type), Event(event_type, args, kwargs))
+
+    async def publish(self, event_type: EventType, *args: Any, **kwargs: Any) -> None:
+        """
+        Queue an event for delivery to callbacks registered for *event_type*, waiting
+        for space if the queue is full and the overflow policy is
+        :attr:`OverflowPolicy.BLOCK`. If a policy is set for *event_type*, the event is
+        submitted to the policy as by :meth:`dispatch` instead.
+
+        :param event_type: Event type to dispatch
+        :param args: Positional arguments to be passed into the callback before any
+            pre-configured positional arguments.
+        :param kwargs: Keyword arguments to be passed when triggering the callback.
+            These override any pre-configured arguments.
+        """
+        if self._policies and event_type in self._policies:
+            self.dispatch(event_type, *args, **kwargs)
+            return
+        queue = self._queue(event_type)
+        event = Event(event_type, args, kwargs)
+        if self.overflow is OverflowPolicy.BLOCK:
+            await queue.put(self._item(event))
+        else:
+            self._enqueue(queue, event)
+
+    def start(self) -> None:
+        """
+        Start worker coroutines for all queues. This requires a running event loop.
+        Events dispatched before starting are buffered until then.
+        """
+        if self._started:
+            return
+        self._started = True
+        for queue in self._queues.values():
+            self._spawn_workers(queue)
+
+    async def stop(self, drain: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Stop all worker coroutines.
+
+        :param drain: If `True`, wait for buffered events, pending batches and
+            outstanding callback work to complete before stopping workers. Otherwise,
+            pending batches are discarded.
+        :param timeout: If specified, the maximum number of seconds to wait when
+            draining.
+        :return: `True` if the registry was drained completely.
+        """
+        drained = True
+        if drain:
+            loop = asyncio.get_running_loop()
+            deadline = None if timeout is None else loop.time() + timeout
+            self.start()
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(queue.join() for queue in self._queues.values())),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                drained = False
+            for batch in list(self._batches.values()):
+                self._flush_batch(batch)
+            remaining = None if deadline is None else max(0, deadline - loop.time())
+            drained = await self.drain(timeout=remaining) and drained
+        else:
+            # discard pending batches so their flush timers never fire
+            for batch in self._batches.values():
+                if batch.timer is not None:
+                    batch.timer.cancel()
+            self._batches.clear()
+
+        workers, self._workers = self._workers, []
+        self._started = False
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        return drained
+
+    async def __aenter__(self) -> "QueuedCallbackRegistry":
+        self.start()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.stop()
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            event, context = await queue.get()
+            try:
+                await self._deliver(event, context)
+            except Exception:
+                self.logger.exception("Failed to deliver event %s", event.event_type)
+            finally:
+                queue.task_done()
+
+    async def _deliver(
+        self, event: Event, context: Optional[contextvars.Context] = None
+    ) -> None:
+        if context is None:
+            results = self._fan_out(event)
+        else:
+            results = context.run(self._fan_out, event)
+
+        if results:
+            for result in await asyncio.gather(*results, return_exceptions=True):
+                if isinstance(result, Exception):
+                    self.logger.error(
+                        "Callback failed handling event %s",
+                        event.event_type,
+                        exc_info=result,
+                    )
+
+    def _fan_out(self, event: Event) -> List[CallbackResultType]:
+        if self._subscriptions:
+            overflow = self._offer(event)
+            if overflow is not None:
+                self.logger.error(
+                    "Failed to publish event %s", event.event_type, exc_info=overflow
+                )
+
+        span = None
+        if self._tracer is not None:
+            span = _current_span.get()
+            if span is not None and span.kind is SpanKind.DISPATCH:
+                span.queued = time.perf_counter() - span.started
+            else:
+                span = None
+
+        plan = self._plan(event.event_type)
+        if self._sink is not None:
+            self._sink.record_dispatch(DispatchRecord(event.event_type, len(plan)))
+
+        results = []
+        try:
+            for callback in plan:
+                if isinstance(callback, BatchCallback):
+                    result = self._add_to_batch(callback, event)
+                else:
+                    result = self._trigger(
+                        event.event_type, callback, event.args, event.kwargs
+                    )
+                if inspect.isawaitable(result):
+                    results.append(result)
+        finally:
+            if span is not None:
+                self._tracer._seal(span)
+        return results
+
+    def _add_to_batch(
+        self, callback: BatchCallback, event: Event
+    ) -> Optional[CallbackResultType]:
+        batch = self._batches.get(id(callback))
+        if batch is None:
+            batch = self._batches[id(callback)] = _Batch(callback, event.event_type)
+
+        batch.events.append(event)
+        if len(batch.events) >= callback.max_batch:
+            return self._flush_batch(batch)
+
+        if batch.timer is None:
+            batch.timer = asyncio.get_running_loop().call_later(
+                callback.max_delay, self._flush_batch, batch
+            )
+        return None
+
+    def _flush_batch(self, batch: _Batch) -> Optional[CallbackResultType]:
+        if batch.timer is not None:
+            batch.timer.cancel()
+        del self._batches[id(batch.callback)]
+        if not batch.events:
+            return None
+        result = batch.callback.trigger(batch.events)
+        self._track(batch.event_type, result)
+        return result
+
+
+class Subscription:
+    """
+    A bounded buffer of events dispatched to a :class:`CallbackRegistry`, consumed as an
+    asynchronous iterator. Create instances using
+    :meth:`cafeteria.asyncio.callbacks.CallbackRegistry.subscribe`.
+
+    Iteration ends once the subscription is closed and all buffered events have been
+    consumed.
+    """
+
+    def __init__(
+        self,
+        registry: CallbackRegistry,
+        event_type: EventType,
+        maxsize: int = 1024,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        if overflow is OverflowPolicy.BLOCK:
+            raise ValueError("Subscriptions cannot block dispatching when full")
+        self.registry = registry
+        self.event_type = event_type
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._buffer: Deque[Event] = collections.deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self._closed = False
+        self._dropped = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of events discarded due to the overflow policy.
+        """
+        return self._dropped
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def offer(self, event: Event) -> None:
+        """
+        Append *event* to the buffer, applying the overflow policy if it is full. Events
+        offered after the subscription is closed are ignored.
+
+        :param event: The event to buffer.
+        """
+        if self._closed:
+            return
+        if len(self._buffer) >= self.maxsize:
+            if self.overflow is OverflowPolicy.DROP_NEWEST:
+                self._dropped += 1
+                return
+            if self.overflow is OverflowPolicy.RAISE:
+                raise asyncio.QueueFull(
+                    f"Subscription to {self.event_type} full ({self.maxsize}), "
+                    f"cannot buffer {event.event_type}"
+                )
+            self._buffer.popleft()
+            self._dropped += 1
+        self._buffer.append(event)
+        self._wake()
+
+    def close(self) -> None:
+        """
+        Unsubscribe from the registry. Events already buffered can still be consumed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.registry._unsubscribe(self)
+        self._wake()
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def _wait(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until an event is buffered, the subscription is closed or *timeout*
+        seconds have passed.
+        """
+        if self._waiter is None or self._waiter.done():
+            self._waiter = asyncio.get_running_loop().create_future()
+        await asyncio.wait((self._waiter,), timeout=timeout)
+
+    async def get(self) -> Event:
+        """
+        Retrieve the next event, waiting for one to be dispatched if required.
+
+        :raises StopAsyncIteration: If the subscription is closed and no events are
+            buffered.
+        """
+        while not self._buffer:
+            if self._closed:
+                raise StopAsyncIteration
+            await self._wait()
+        return self._buffer.popleft()
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Event:
+        return await self.get()
+
+    async def batches(
+        self, size: int, timeout: Optional[float] = None
+    ) -> AsyncIterator[List[Event]]:
+        """
+        Iterate over buffered events in lists of up to *size* events. Each batch waits
+        for at least one event, then up to *timeout* seconds for the batch to fill. If
+        *timeout* is `None`, batches contain only events already buffered.
+
+        :param size: Maximum number of events per batch.
+        :param timeout: Maximum number of seconds to wait for a batch to fill once it
+            contains an event.
+        """
+        if size < 1:
+            raise ValueError(f"size must be positive, got {size}")
+        buffer = self._buffer
+        while True:
+            while not buffer:
+                if self._closed:
+                    return
+                await self._wait()
+
+            if timeout is not None and len(buffer) < size:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + timeout
+                while len(buffer) < size and not self._closed:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    await self._wait(remaining)
+
+            yield [buffer.popleft() for _ in range(min(size, len(buffer)))]
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        self.close()
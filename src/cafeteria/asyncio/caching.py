@@ -0,0 +1,119 @@
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from cafeteria.asyncio.callbacks import Callback, CallbackResultType
+
+
+@dataclass
+class CachedCallback(Callback):
+    """
+    A callback for idempotent functions. Concurrent triggers with identical, hashable
+    arguments share a single in-flight task or future (single-flight). If *maxsize* is
+    positive, results of successful calls are additionally memoized in an LRU cache,
+    optionally expiring after *ttl* seconds.
+
+    As the task or future is shared, cancelling it cancels it for every caller. Triggers
+    with unhashable arguments, or without a running event loop, are not deduplicated.
+    """
+
+    def __init__(
+        self,
+        function,
+        *args: Any,
+        maxsize: int = 0,
+        ttl: Optional[float] = None,
+        **kwargs: Any,
+    ) -> None:
+        if maxsize < 0:
+            raise ValueError(f"maxsize must not be negative, got {maxsize}")
+        super().__init__(function, *args, **kwargs)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._in_flight: Dict[Hashable, asyncio.Future] = dict()
+        # key -> (result, expiry), ordered from least to most recently used
+        self._cache: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = (
+            OrderedDict()
+        )
+
+    __hash__ = Callback.__hash__
+
+    @staticmethod
+    def _key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[Hashable]:
+        key = (args, frozenset(kwargs.items())) if kwargs else args
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def trigger(self, *args: Any, **kwargs: Any) -> CallbackResultType:
+        """
+        Trigger this callback, sharing the result of an identical in-flight trigger or
+        returning a memoized result if available.
+
+        :param args: Positional arguments to prepend.
+        :param kwargs: Keyword arguments to update defaults with.
+        :return: An awaitable result.
+        """
+        key = self._key(args, kwargs)
+        if key is None:
+            return super().trigger(*args, **kwargs)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return super().trigger(*args, **kwargs)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            result, expiry = cached
+            if expiry is None or expiry > time.monotonic():
+                self._cache.move_to_end(key)
+                future = loop.create_future()
+                future.set_result(result)
+                return future
+            del self._cache[key]
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            return future
+
+        future = super().trigger(*args, **kwargs)
+        if asyncio.isfuture(future):
+            if future.done():
+                self._complete(key, future)
+            else:
+                self._in_flight[key] = future
+                future.add_done_callback(functools.partial(self._complete, key))
+        return future
+
+    def _complete(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+        if not self.maxsize or future.cancelled() or future.exception() is not None:
+            return
+
+        expiry = None if self.ttl is None else time.monotonic() + self.ttl
+        self._cache[key] = (future.result(), expiry)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Remove the memoized result for the given trigger arguments, if any.
+        """
+        key = self._key(args, kwargs)
+        if key is not None:
+            self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove all memoized results. In-flight calls are not affected.
+        """
+        self._cache.clear()
@@ -1,41 +1,316 @@
 import asyncio
+import collections.abc
+import contextlib
+import contextvars
+import copy
+import functools
+import heapq
+import importlib
+import importlib.metadata
+import inspect
+import itertools
 import logging
+import sys
+import threading
+import time
 import warnings
-from dataclasses import dataclass, field
+import weakref
+from dataclasses import dataclass
 from enum import Enum
 from typing import (
+    TYPE_CHECKING,
     Any,
+    Awaitable,
     Callable,
     Coroutine,
     Dict,
     Generator,
     Hashable,
+    Iterable,
+    Iterator,
     List,
     Optional,
+    Set,
     Tuple,
     Union,
 )
 
+from cafeteria.asyncio.breakers import CircuitBreaker
+from cafeteria.asyncio.executors import ExecutionStrategy
+from cafeteria.asyncio.instrumentation import (
+    CallbackRecord,
+    DispatchRecord,
+    MetricsSink,
+)
+from cafeteria.asyncio.matching import EventPattern
+from cafeteria.asyncio.policies import DispatchPolicy
+from cafeteria.asyncio.tracing import Span, SpanKind, Tracer, _current_span
 from cafeteria.logging import LoggedObject
 
+if TYPE_CHECKING:
+    from cafeteria.asyncio.bus import Event, OverflowPolicy, Subscription
+
 CallbackType = Union[Callable, Coroutine, "Callback"]
 CallbackResultType = Union[asyncio.Task, Generator, Coroutine]
 EventType = Optional[Union[Enum, Hashable, None]]
 
 logger = logging.getLogger()
 
+# upper bound on cached dispatch plans, guards against unbounded growth when
+# dispatching a large number of distinct event types
+_DISPATCH_PLAN_CACHE_SIZE = 4096
+
+# timing of the callback currently being triggered by an instrumented registry on this
+# thread, allows recording when execution actually starts
+_instrumented = threading.local()
+
+
+class _Timing:
+    __slots__ = ("started",)
+
+    def __init__(self) -> None:
+        self.started: Optional[float] = None
+
+
+class _Timed:
+    __slots__ = ("function", "timing")
+
+    def __init__(self, function: Callable, timing: _Timing) -> None:
+        self.function = function
+        self.timing = timing
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        self.timing.started = time.perf_counter()
+        return self.function(*args, **kwargs)
+
+
+class _Guard:
+    """
+    Tracks a synchronous call allowed by a circuit breaker. Cancelling the future of a
+    call executed off the event loop does not stop it, the breaker is released once it
+    returns instead.
+    """
+
+    __slots__ = ("lock", "running", "release")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.running = False
+        self.release: Optional[Callable[[], Any]] = None
+
+
+class _Guarded:
+    __slots__ = ("function", "guard")
+
+    def __init__(self, function: Callable, guard: _Guard) -> None:
+        self.function = function
+        self.guard = guard
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        guard = self.guard
+        with guard.lock:
+            guard.running = True
+        try:
+            return self.function(*args, **kwargs)
+        finally:
+            with guard.lock:
+                guard.running = False
+                release = guard.release
+            if release is not None:
+                release()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # calls executed by another process cannot be tracked, only the function is sent
+        return functools.partial, (self.function,)
+
+
+class _WrappedCoroutine(collections.abc.Coroutine):
+    """
+    Base class of coroutines wrapping a callback coroutine, see :func:`_unwrap`.
+    """
+
+    __slots__ = ("coroutine",)
+
+    def __init__(self, coroutine: Coroutine) -> None:
+        self.coroutine = coroutine
+
+    def send(self, value: Any) -> Any:
+        return self.coroutine.send(value)
+
+    def throw(self, *args: Any) -> Any:
+        return self.coroutine.throw(*args)
+
+    def close(self) -> None:
+        self.coroutine.close()
+
+    def __await__(self):
+        return self.coroutine.__await__()
+
+
+def _unwrap(coroutine: Coroutine) -> Coroutine:
+    """
+    Retrieve the callback coroutine wrapped to start eagerly or to time its execution.
+    """
+    while isinstance(coroutine, _WrappedCoroutine):
+        coroutine = coroutine.coroutine
+    return coroutine
+
+
+class _TimedCoroutine(_WrappedCoroutine):
+    """
+    Records when the wrapped coroutine is first stepped.
+    """
+
+    __slots__ = ("timing",)
+
+    def __init__(self, coroutine: Coroutine, timing: _Timing) -> None:
+        super().__init__(coroutine)
+        self.timing = timing
+
+    def send(self, value: Any) -> Any:
+        if self.timing.started is None:
+            self.timing.started = time.perf_counter()
+        return self.coroutine.send(value)
+
+
+if sys.version_info >= (3, 12):
+
+    def _create_eager_task(coroutine: Coroutine) -> asyncio.Future:
+        return asyncio.Task(
+            coroutine, loop=asyncio.get_running_loop(), eager_start=True
+        )
+
+else:
+    from asyncio.tasks import _current_tasks
+
+    class _StartedCoroutine(_WrappedCoroutine):
+        """
+        Wraps a coroutine stepped once on behalf of the task driving it, before that
+        task runs, replaying the value it yielded on the first step of the task. The
+        task ends immediately if the coroutine completed within that step.
+        """
+
+        __slots__ = ("context", "yielded", "finished")
+
+        def __init__(self, coroutine: Coroutine, context: contextvars.Context) -> None:
+            super().__init__(coroutine)
+            self.context = context
+            self.yielded: List[Any] = []
+            self.finished = False
+
+        def send(self, value: Any) -> Any:
+            if self.finished:
+                raise StopIteration
+            if self.yielded:
+                return self.yielded.pop()
+            return self.context.run(self.coroutine.send, value)
+
+        def throw(self, *args: Any) -> Any:
+            if self.finished:
+                raise StopIteration
+            self.yielded.clear()
+            return self.context.run(self.coroutine.throw, *args)
+
+    def _create_eager_task(coroutine: Coroutine) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        started = _StartedCoroutine(coroutine, context)
+        task = loop.create_task(started)
+
+        # step as the current task, like eager tasks on 3.12+, so that timeouts, task
+        # groups and current_task() within the first step target the callback task
+        dispatcher = _current_tasks.get(loop)
+        _current_tasks[loop] = task
+        try:
+            started.yielded.append(context.run(coroutine.send, None))
+            return task
+        except StopIteration as e:
+            future = loop.create_future()
+            future.set_result(e.value)
+        except asyncio.CancelledError:
+            future = loop.create_future()
+            future.cancel()
+        except Exception as e:
+            future = loop.create_future()
+            future.set_exception(e)
+        finally:
+            if dispatcher is None:
+                del _current_tasks[loop]
+            else:
+                _current_tasks[loop] = dispatcher
+            started.finished = not started.yielded
+        return future
+
+
+# how a function is triggered, classified once when a callback is created
+_NESTED, _COROUTINE_FUNCTION, _CALLABLE = range(3)
+
+
+def _classify(function: CallbackType) -> int:
+    if isinstance(function, Callback):
+        return _NESTED
+    if asyncio.iscoroutinefunction(function):
+        return _COROUTINE_FUNCTION
+    return _CALLABLE
+
+
+def _hash(function: CallbackType, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> int:
+    # consistent with __eq__, falling back to hashing the function only when arguments
+    # are not hashable
+    try:
+        return hash((function, args, frozenset(kwargs.items())))
+    except TypeError:
+        pass
+    try:
+        return hash(function)
+    except TypeError:
+        return hash(type(function))
+
 
 @dataclass
 class Callback:
+    # slotted to keep per subscriber memory low, subclasses may add attributes freely
+    __slots__ = (
+        "function",
+        "args",
+        "kwargs",
+        "strategy",
+        "eager",
+        "_kind",
+        "_hash",
+        "__weakref__",
+    )
+
     function: CallbackType
-    args: Tuple[Any] = field(default_factory=list)
-    kwargs: Dict[str, Any] = field(default_factory=dict)
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
 
     def __init__(self, function, *args: Any, **kwargs: Any) -> None:
-        super().__init__()
         self.function = function
         self.args = args
         self.kwargs = kwargs
+        # strategy used to execute synchronous functions, loop default executor if unset
+        self.strategy: Optional[ExecutionStrategy] = None
+        # start coroutine functions eagerly, only creating a task if they suspend
+        self.eager: Optional[bool] = None
+        self._kind = _classify(function)
+        # callbacks are used as registry keys, arguments are not expected to change
+        self._hash = _hash(function, args, kwargs)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if other is self:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.function == other.function
+            and self.args == other.args
+            and self.kwargs == other.kwargs
+        )
 
     def trigger(self, *args: Any, **kwargs) -> CallbackResultType:
         """
@@ -46,10 +321,17 @@ class Callback:
         :param kwargs: Keyword arguments to update defaults with.
         :return: An awaitable result.
         """
-        kwargz = dict(**self.kwargs)
-        kwargz.update(kwargs)
-        argz = args + self.args
-        return trigger_callback(self.function, *argz, **kwargz)
+        # default keyword arguments are shared without copying unless overridden, they
+        # are only ever unpacked into a call
+        if not kwargs:
+            kwargs = self.kwargs
+        elif self.kwargs:
+            kwargs = {**self.kwargs, **kwargs}
+        if self.args:
+            args += self.args
+        return _invoke(
+            self.function, self._kind, args, kwargs, self.strategy, self.eager
+        )
 
 
 @dataclass
@@ -59,9 +341,13 @@ class SimpleTriggerCallback(Callback):
     arguments provided at the time of trigger.
     """
 
+    __slots__ = ()
+
     def __init__(self, function, *args: Any, **kwargs: Any) -> None:
         super().__init__(function, *args, **kwargs)
 
+    __hash__ = Callback.__hash__
+
     def trigger(self, *_, **__) -> CallbackResultType:
         """
         Trigger callback ignoring provided arguments.
@@ -69,6 +355,212 @@ class SimpleTriggerCallback(Callback):
         return super().trigger()
 
 
+@dataclass(eq=False)
+class WeakCallback(Callback):
+    """
+    A callback holding only a weak reference to its function, using
+    :class:`weakref.WeakMethod` for bound methods. Once the function, or the object a
+    bound method belongs to, is garbage collected the callback is dead, triggering it
+    does nothing and *finalizer*, if set, is called with this callback.
+
+    A weak callback compares equal to a :class:`Callback` of the same live function and
+    arguments, allowing it to be de-registered either way.
+    """
+
+    __slots__ = ("finalizer", "_reference")
+
+    def __init__(
+        self,
+        function,
+        *args: Any,
+        finalizer: Optional[Callable[["WeakCallback"], None]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.finalizer = finalizer
+        # the hash is computed while the function is alive, and remains stable once it
+        # is collected
+        super().__init__(function, *args, **kwargs)
+
+    @property
+    def function(self) -> Optional[CallbackType]:
+        return self._reference()
+
+    @function.setter
+    def function(self, function: CallbackType) -> None:
+        if inspect.ismethod(function):
+            self._reference = weakref.WeakMethod(function, self._expired)
+        else:
+            self._reference = weakref.ref(function, self._expired)
+
+    @property
+    def alive(self) -> bool:
+        return self._reference() is not None
+
+    def _expired(self, _: weakref.ref) -> None:
+        if self.finalizer is not None:
+            self.finalizer(self)
+
+    __hash__ = Callback.__hash__
+
+    def __eq__(self, other: Any) -> bool:
+        if other is self:
+            return True
+        if type(other) not in (Callback, WeakCallback):
+            return NotImplemented
+        function = self.function
+        return (
+            function is not None
+            and function == other.function
+            and self.args == other.args
+            and self.kwargs == other.kwargs
+        )
+
+    def trigger(self, *args: Any, **kwargs: Any) -> CallbackResultType:
+        """
+        Trigger this callback if its function is still alive.
+
+        :param args: Positional arguments to prepend.
+        :param kwargs: Keyword arguments to update defaults with.
+        :return: An awaitable result, or `None` if the callback is dead.
+        """
+        function = self.function
+        if function is None:
+            return None
+        if not kwargs:
+            kwargs = self.kwargs
+        elif self.kwargs:
+            kwargs = {**self.kwargs, **kwargs}
+        if self.args:
+            args += self.args
+        return _invoke(function, self._kind, args, kwargs, self.strategy, self.eager)
+
+
+def _import(path: str) -> Any:
+    """
+    Import the object at *path*, either "package.module:attribute.name" or
+    "package.module.attribute".
+    """
+    module_name, _, attributes = path.partition(":")
+    if not attributes:
+        module_name, _, attributes = path.rpartition(".")
+    if not module_name or not attributes:
+        raise ValueError(f"Invalid import path {path!r}")
+    target = importlib.import_module(module_name)
+    for attribute in attributes.split("."):
+        target = getattr(target, attribute)
+    return target
+
+
+@dataclass(eq=False)
+class LazyCallback(Callback):
+    """
+    A callback declared by the import path of its function, "package.module:function"
+    or "package.module.function". The function is only imported the first time the
+    callback is triggered, and cached from then on, so that modules of callbacks that
+    are never triggered are never imported.
+
+    If the function cannot be imported, the error is logged once and cached. The
+    callback then fails every time it is triggered, without importing again.
+
+    Lazy callbacks compare equal if their import paths and arguments are equal.
+    """
+
+    __slots__ = ("path", "_resolved", "_error")
+
+    def __init__(self, path: str, *args: Any, **kwargs: Any) -> None:
+        self.path = path
+        self._resolved = False
+        self._error: Optional[Exception] = None
+        super().__init__(path, *args, **kwargs)
+
+    @property
+    def resolved(self) -> bool:
+        return self._resolved
+
+    def resolve(self) -> CallbackType:
+        """
+        Import the function if not already imported.
+
+        :return: The function.
+        :raises ImportError: If the module cannot be imported.
+        :raises AttributeError: If the module does not contain the function.
+        """
+        if not self._resolved:
+            if self._error is not None:
+                raise self._error.with_traceback(None)
+            try:
+                function = _import(self.path)
+            except Exception as e:
+                self._error = e
+                raise
+            self._kind = _classify(function)
+            self.function = function
+            self._resolved = True
+        return self.function
+
+    __hash__ = Callback.__hash__
+
+    def __eq__(self, other: Any) -> bool:
+        if other is self:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.path == other.path
+            and self.args == other.args
+            and self.kwargs == other.kwargs
+        )
+
+    def trigger(self, *args: Any, **kwargs: Any) -> CallbackResultType:
+        """
+        Trigger this callback, importing its function first if required.
+
+        :param args: Positional arguments to prepend.
+        :param kwargs: Keyword arguments to update defaults with.
+        :return: An awaitable result, failed if the function cannot be imported.
+        """
+        if not self._resolved:
+            first = self._error is None
+            try:
+                self.resolve()
+            except Exception as e:
+                if first:
+                    logger.exception("Failed to import callback %s", self.path)
+                return _failed(e)
+        return super().trigger(*args, **kwargs)
+
+
+def _failed(error: Exception) -> Optional[asyncio.Future]:
+    """
+    Create a future failed with an *error* that was already logged, or `None` without
+    a running event loop.
+    """
+    try:
+        future = asyncio.get_running_loop().create_future()
+    except RuntimeError:
+        return None
+    future.set_exception(error)
+    # mark the exception as retrieved, it is only raised if the result is awaited
+    future.exception()
+    return future
+
+
+def _as_callback(callback: Union[CallbackType, str]) -> Callback:
+    if isinstance(callback, Callback):
+        return callback
+    if isinstance(callback, str):
+        return LazyCallback(callback)
+    return Callback(function=callback)
+
+
+def _entry_points(group: str) -> Iterable[Any]:
+    entry_points = importlib.metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=group)
+    # python < 3.10
+    return entry_points.get(group, ())
+
+
 def trigger_callback(callback: CallbackType, *args, **kwargs) -> CallbackResultType:
     """
     Helper function to trigger a callback (coroutine or callable) with the provided
@@ -80,23 +572,80 @@ def trigger_callback(callback: CallbackType, *args, **kwargs) -> CallbackResultT
     :param kwargs: The keyword arguments to use when triggering a callback.
     :return: An awaitable result.
     """
-    if isinstance(callback, Callback):
+    return _trigger_callback(callback, args, kwargs, None, False)
+
+
+def _trigger_callback(
+    callback: CallbackType,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    strategy: Optional[ExecutionStrategy],
+    eager: Optional[bool],
+) -> CallbackResultType:
+    return _invoke(callback, _classify(callback), args, kwargs, strategy, eager)
+
+
+def _invoke(
+    callback: CallbackType,
+    kind: int,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    strategy: Optional[ExecutionStrategy],
+    eager: Optional[bool],
+) -> CallbackResultType:
+    if kind == _NESTED:
         return callback.trigger(*args, **kwargs)
 
-    if asyncio.iscoroutinefunction(callback):
+    timing = getattr(_instrumented, "timing", None)
+    if kind == _COROUTINE_FUNCTION:
         try:
-            return asyncio.create_task(callback(*args, **kwargs))
+            coroutine = callback(*args, **kwargs)
+            if timing is not None:
+                coroutine = _TimedCoroutine(coroutine, timing)
+            if eager:
+                return _create_eager_task(coroutine)
+            return asyncio.create_task(coroutine)
         except RuntimeError:
             logger.warning(
                 "Callback triggered without a running loop, skipping %s", callback
             )
-    else:
-        try:
-            return asyncio.get_running_loop().run_in_executor(
-                None, lambda: callback(*args, **kwargs)
-            )
-        except RuntimeError:
-            callback(*args, **kwargs)
+        return None
+
+    if timing is not None:
+        callback = _Timed(callback, timing)
+    guard = getattr(_instrumented, "guard", None)
+    if guard is not None:
+        callback = _Guarded(callback, guard)
+
+    if strategy is not None:
+        return strategy.submit(callback, args, kwargs)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        callback(*args, **kwargs)
+        return None
+    # executors do not propagate context variables to their threads
+    return loop.run_in_executor(
+        None,
+        functools.partial(contextvars.copy_context().run, callback, *args, **kwargs),
+    )
+
+
+async def _run_workers(worker: Callable[[], Awaitable[None]], count: int) -> None:
+    """
+    Run *count* concurrent instances of *worker*, cancelling all of them if one fails.
+    """
+    if count == 1:
+        await worker()
+        return
+
+    tasks = [asyncio.ensure_future(worker()) for _ in range(count)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
 
 
 class CallbackRegistry(LoggedObject):
@@ -105,8 +654,77 @@ class CallbackRegistry(LoggedObject):
         callbacks: Optional[
             Dict[EventType, Union[CallbackType, List[CallbackType]]]
         ] = None,
+        max_concurrency: Optional[int] = None,
+        strategy: Optional[ExecutionStrategy] = None,
+        instrumentation: Optional[MetricsSink] = None,
+        eager: bool = False,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        tracer: Optional[Tracer] = None,
     ) -> None:
-        self._callbacks: Dict[EventType, List[Callback]] = dict()
+        """
+        :param callbacks: Callbacks to register, keyed by event type.
+        :param max_concurrency: If specified, the maximum number of callbacks executed
+            concurrently across all :meth:`dispatch_and_wait` calls on this registry.
+        :param strategy: Default strategy used to execute synchronous callbacks that do
+            not specify their own.
+        :param instrumentation: If specified, dispatch and callback execution metrics
+            are recorded to this sink.
+        :param eager: If `True`, coroutine callbacks that do not specify otherwise start
+            executing immediately when dispatched, a task is only created if they
+            suspend.
+        :param loop: If specified, bind the registry to this event loop, see
+            :meth:`bind`.
+        :param circuit_breaker: If specified, a copy of this breaker guards each
+            registered callback that does not specify its own, see :meth:`register`.
+        :param tracer: If specified, a span is reported to this tracer for every
+            dispatch and every callback triggered, see :mod:`cafeteria.asyncio.tracing`.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be positive, got {max_concurrency}")
+        self._max_concurrency = max_concurrency
+        # created lazily as semaphores bind to the running loop on older pythons
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._strategy = strategy
+        self._sink = instrumentation
+        self._tracer = tracer
+        self._eager = eager
+        self._policies: Dict[EventType, DispatchPolicy] = dict()
+        # strong references to outstanding callback results, keyed by event type
+        self._in_flight: Dict[EventType, Set[asyncio.Future]] = dict()
+
+        # registered callbacks keyed by a registration sequence number, this keeps
+        # dispatch order stable while allowing constant time removal
+        self._callbacks: Dict[EventType, Dict[int, Callback]] = dict()
+        # callback -> registration sequence numbers, allows constant time lookups
+        self._index: Dict[EventType, Dict[Callback, List[int]]] = dict()
+        # registered event patterns, in registration order
+        self._patterns: Dict[EventPattern, None] = dict()
+        # registered event types (exact, patterns or default) matching an event type
+        # and immutable dispatch plans, both reset whenever the registry changes
+        self._resolutions: Dict[EventType, Tuple[EventType, ...]] = dict()
+        self._plans: Dict[EventType, Tuple[Callback, ...]] = dict()
+        self._sequence = itertools.count()
+        # streaming subscriptions keyed by event type or pattern, and the cached
+        # subscriptions receiving each dispatched event type
+        self._subscriptions: Dict[EventType, List["Subscription"]] = dict()
+        self._fan_outs: Dict[EventType, Tuple["Subscription", ...]] = dict()
+
+        # guards registry mutation and dispatch plan computation, dispatching reads
+        # immutable plans without locking; re-entrant as weak callback finalizers may
+        # run while the lock is held
+        self._lock = threading.RLock()
+        # events dispatched from other threads, awaiting hand off to the bound loop
+        self._loop = loop
+        self._handoffs: List[
+            Tuple[contextvars.Context, EventType, Tuple[Any, ...], Dict[str, Any]]
+        ] = []
+        self._handoff_scheduled = False
+
+        self._circuit_breaker = circuit_breaker
+        # circuit breakers guarding callbacks, until all their registrations are removed
+        self._breakers: Dict[Callback, CircuitBreaker] = dict()
+
         if callbacks is not None:
             for event_type, callback in callbacks.items():
                 if not isinstance(callback, list):
@@ -114,37 +732,326 @@ class CallbackRegistry(LoggedObject):
                 for c in callback:
                     self.register(event_type, c)
 
+    def _invalidate(self) -> None:
+        self._resolutions.clear()
+        self._plans.clear()
+        self._fan_outs.clear()
+
+    def _resolve(self, event_type: EventType) -> Tuple[EventType, ...]:
+        """
+        Retrieve the registered event types, exact or patterns, matching *event_type*.
+        If none match, this resolves to the default event type if registered. This is
+        computed once per event type until the registry changes.
+
+        :param event_type: Concrete event type to resolve.
+        :return: Registered event types with callbacks to trigger for *event_type*.
+        """
+        keys = self._resolutions.get(event_type)
+        if keys is None:
+            with self._lock:
+                keys = tuple(
+                    itertools.chain(
+                        (event_type,) if event_type in self._callbacks else (),
+                        (
+                            pattern
+                            for pattern in self._patterns
+                            if event_type is not None
+                            and pattern != event_type
+                            and pattern.matches(event_type)
+                        ),
+                    )
+                )
+                if not keys and None in self._callbacks:
+                    keys = (None,)
+                if len(self._resolutions) >= _DISPATCH_PLAN_CACHE_SIZE:
+                    self._invalidate()
+                self._resolutions[event_type] = keys
+        return keys
+
+    def _plan(self, event_type: EventType) -> Tuple[Callback, ...]:
+        """
+        Retrieve the cached dispatch plan for an *event_type*, computing it if this
+        is the first time the event type is seen since the registry last changed.
+
+        :param event_type: Event type to retrieve the dispatch plan for.
+        :return: Callbacks to trigger, in registration order.
+        """
+        plan = self._plans.get(event_type)
+        if plan is None:
+            with self._lock:
+                keys = self._resolve(event_type)
+                if len(keys) == 1:
+                    plan = tuple(self._callbacks[keys[0]].values())
+                else:
+                    # entries are ordered by sequence, merging retains order
+                    plan = tuple(
+                        callback
+                        for _, callback in heapq.merge(
+                            *(self._callbacks[key].items() for key in keys)
+                        )
+                    )
+                self._plans[event_type] = plan
+        return plan
+
+    def _subscribers(self, event_type: EventType) -> Tuple["Subscription", ...]:
+        """
+        Retrieve the subscriptions receiving events of *event_type*, subscribed to it
+        exactly or to a matching pattern. This is computed once per event type until
+        subscriptions change.
+
+        :param event_type: Concrete event type to resolve.
+        :return: Subscriptions in subscription order.
+        """
+        subscriptions = self._fan_outs.get(event_type)
+        if subscriptions is None:
+            with self._lock:
+                subscriptions = tuple(
+                    subscription
+                    for key, subscribed in self._subscriptions.items()
+                    if key == event_type
+                    or (
+                        event_type is not None
+                        and isinstance(key, EventPattern)
+                        and key.matches(event_type)
+                    )
+                    for subscription in subscribed
+                )
+                if len(self._fan_outs) >= _DISPATCH_PLAN_CACHE_SIZE:
+                    self._fan_outs.clear()
+                self._fan_outs[event_type] = subscriptions
+        return subscriptions
+
+    def subscribe(
+        self,
+        event_type: EventType,
+        maxsize: int = 1024,
+        overflow: Optional["OverflowPolicy"] = None,
+    ) -> "Subscription":
+        """
+        Subscribe to events of *event_type*, returning an asynchronous iterator over
+        dispatched :class:`cafeteria.asyncio.bus.Event` instances. Unlike callbacks,
+        dispatching to a subscription only appends the event to its bounded buffer,
+        a single event instance is shared by all subscriptions.
+
+        If *event_type* is an :class:`cafeteria.asyncio.matching.EventPattern`, events
+        of every matching event type are received. Subscribing to `None` receives only
+        events explicitly dispatched as `None`.
+
+        :param event_type: The type of event to subscribe to.
+        :param maxsize: Maximum number of events buffered.
+        :param overflow: Policy applied when the buffer is full, by default the oldest
+            buffered event is discarded. As dispatching cannot wait,
+            :attr:`cafeteria.asyncio.bus.OverflowPolicy.BLOCK` is not supported. With
+            :attr:`cafeteria.asyncio.bus.OverflowPolicy.RAISE`, dispatching raises
+            :class:`asyncio.QueueFull` once callbacks and other subscriptions have
+            received the event.
+        :return: The subscription, close it to unsubscribe.
+        """
+        from cafeteria.asyncio.bus import OverflowPolicy, Subscription
+
+        subscription = Subscription(
+            self,
+            event_type,
+            maxsize=maxsize,
+            overflow=OverflowPolicy.DROP_OLDEST if overflow is None else overflow,
+        )
+        self._add_subscription(subscription)
+        return subscription
+
+    def _add_subscription(self, subscription: "Subscription") -> None:
+        with self._lock:
+            self._subscriptions.setdefault(subscription.event_type, []).append(
+                subscription
+            )
+            self._fan_outs.clear()
+
+    def _unsubscribe(self, subscription: "Subscription") -> None:
+        with self._lock:
+            subscribed = self._subscriptions.get(subscription.event_type)
+            if subscribed is None or subscription not in subscribed:
+                return
+            subscribed.remove(subscription)
+            if not subscribed:
+                del self._subscriptions[subscription.event_type]
+            self._fan_outs.clear()
+
+    def _publish(
+        self, event_type: EventType, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Optional[asyncio.QueueFull]:
+        if self._subscribers(event_type):
+            from cafeteria.asyncio.bus import Event
+
+            return self._offer(Event(event_type, args, kwargs))
+        return None
+
+    def _offer(self, event: "Event") -> Optional[asyncio.QueueFull]:
+        """
+        Offer *event* to every subscription of its type. A full subscription does not
+        keep the event from the others, the first overflow error is returned instead.
+        """
+        overflow = None
+        for subscription in self._subscribers(event.event_type):
+            try:
+                subscription.offer(event)
+            except asyncio.QueueFull as e:
+                if overflow is None:
+                    overflow = e
+        return overflow
+
     def callbacks(self, event_type: EventType = None) -> List[Callback]:
         """
         Retrieve all callbacks registered for a particular *event_type*. If *event_type*
         is `None` or does not have any callbacks already registered, the default
-        callbacks are returned.
+        callbacks are returned. Callbacks registered for an
+        :class:`cafeteria.asyncio.matching.EventPattern` matching *event_type* are
+        included.
 
         :param event_type: Event type to retrieve callbacks for.
         :return: Registered callbacks or default callbacks if none registered for the
             event type.
         """
-        return self._callbacks.get(event_type, self._callbacks.get(None, []))
+        return list(self._plan(event_type))
+
+    def _prepare(
+        self, callback: Union[CallbackType, str], weak: bool = False
+    ) -> Callback:
+        """
+        Wrap *callback* as a :class:`Callback` if required, applying registry defaults
+        for any options not explicitly configured on the callback.
+
+        :param callback: The callback handler to prepare.
+        :param weak: Wrap *callback* as a :class:`WeakCallback`.
+        :return: The callback to register.
+        """
+        if weak or isinstance(callback, WeakCallback):
+            # always a new instance, as its finalizer is bound to the registration
+            callback = self._weaken(callback)
+            shared = False
+        else:
+            shared = isinstance(callback, Callback)
+            if not shared:
+                callback = _as_callback(callback)
+
+        defaults = dict()
+        if self._strategy is not None and callback.strategy is None:
+            defaults["strategy"] = self._strategy
+        if self._eager and callback.eager is None:
+            defaults["eager"] = True
+
+        if shared and defaults:
+            # do not leak registry defaults into callbacks that may be shared
+            callback = copy.copy(callback)
+
+        for name, value in defaults.items():
+            setattr(callback, name, value)
+        return callback
 
-    def register(self, event_type: EventType, callback: CallbackType) -> None:
+    @staticmethod
+    def _weaken(callback: Union[CallbackType, str]) -> "WeakCallback":
+        if isinstance(callback, str):
+            callback = LazyCallback(callback)
+        if not isinstance(callback, Callback):
+            return WeakCallback(callback)
+        if type(callback) not in (Callback, WeakCallback):
+            raise TypeError(
+                f"{type(callback).__name__} instances cannot be registered weakly"
+            )
+        weak = WeakCallback(callback.function, *callback.args, **callback.kwargs)
+        weak.strategy = callback.strategy
+        weak.eager = callback.eager
+        return weak
+
+    def register(
+        self,
+        event_type: EventType,
+        callback: Union[CallbackType, str],
+        weak: bool = False,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
         """
         This method allows for a handler to be registered for a specified event type. If
         the *event_type* is `None` this is registered as a default callback triggered
         only when explicitly dispatched or no other event type matched the specified
         event type when dispatching.
 
+        If *event_type* is an :class:`cafeteria.asyncio.matching.EventPattern`, the
+        callback is triggered for every event type matching the pattern.
+
+        If *weak* is `True`, only a weak reference to the handler is kept (see
+        :class:`WeakCallback`) and the registration is removed automatically once the
+        handler, or the object a bound method handler belongs to, is garbage collected.
+
+        If *circuit_breaker* is specified, or a default is configured for the registry,
+        calls to the handler are guarded by the breaker (see
+        :class:`cafeteria.asyncio.breakers.CircuitBreaker`). Equal handlers share a
+        single breaker, the first one configured.
+
+        If *callback* is a string, it is the import path of the handler, which is only
+        imported once first triggered (see :class:`LazyCallback`).
+
         :param event_type: The type of event to associate the callback handler with.
         :param callback: The callback handler to associate with this event.
+        :param weak: Keep only a weak reference to the callback handler.
+        :param circuit_breaker: Circuit breaker guarding the callback handler.
         """
-        if not isinstance(callback, Callback):
-            callback = Callback(function=callback)
+        # keep the original referenced until registered, temporary handlers are
+        # otherwise collected before the registration exists
+        prepared = self._prepare(callback, weak=weak)
 
-        if event_type not in self._callbacks:
-            self._callbacks[event_type] = list()
-        self._callbacks[event_type].append(callback)
-        self.logger.debug("Registered %s to %s", event_type, callback)
+        with self._lock:
+            sequence = next(self._sequence)
+            if isinstance(prepared, WeakCallback):
+                prepared.finalizer = functools.partial(
+                    self._prune, event_type, sequence
+                )
+            self._callbacks.setdefault(event_type, dict())[sequence] = prepared
+            self._index.setdefault(event_type, dict()).setdefault(prepared, []).append(
+                sequence
+            )
+            if isinstance(event_type, EventPattern):
+                self._patterns[event_type] = None
+            if circuit_breaker is None and self._circuit_breaker is not None:
+                circuit_breaker = self._circuit_breaker.copy()
+            if circuit_breaker is not None:
+                self._breakers.setdefault(prepared, circuit_breaker)
+            self._invalidate()
+        self.logger.debug("Registered %s to %s", event_type, prepared)
+
+    def register_entry_points(
+        self,
+        group: str,
+        parse_event_type: Optional[Callable[[str], EventType]] = None,
+    ) -> int:
+        """
+        Register a :class:`LazyCallback` for every entry point in *group*, the entry
+        point name being the event type and its value the import path of the handler.
+        Only package metadata is read, handlers are imported once first triggered.
+
+        For example, a distribution declaring the following entry point registers
+        `myapp.handlers:on_created` for the "order.created" event type::
 
-    def deregister(self, event_type: EventType, callback: CallbackType) -> None:
+            [project.entry-points."myapp.handlers"]
+            "order.created" = "myapp.handlers:on_created"
+
+        :param group: The entry point group.
+        :param parse_event_type: Converts entry point names to event types, for example
+            an :class:`enum.Enum` subclass. Names are used as is if not specified.
+        :return: The number of handlers registered.
+        """
+        registered = 0
+        for entry_point in _entry_points(group):
+            event_type = entry_point.name
+            if parse_event_type is not None:
+                event_type = parse_event_type(event_type)
+            # strip any extras, "package.module:function [extra]"
+            path = entry_point.value.partition("[")[0].strip()
+            self.register(event_type, LazyCallback(path))
+            registered += 1
+        return registered
+
+    def deregister(
+        self, event_type: EventType, callback: Union[CallbackType, str]
+    ) -> None:
         """
         This method allows for a handler to be de-registered for a specified event type
         if it has already been registered. If *event_type* is set to `None`, *callback*
@@ -153,15 +1060,57 @@ class CallbackRegistry(LoggedObject):
         :param event_type: The type of event the callback handler is associated with.
         :param callback: The callback handler to de-register.
         """
-        if not isinstance(callback, Callback):
-            callback = Callback(function=callback)
+        callback = _as_callback(callback)
 
-        try:
-            self._callbacks.get(event_type, []).remove(callback)
-        except ValueError:
-            pass
+        with self._lock:
+            index = self._index.get(event_type)
+            if index is None or callback not in index:
+                return
+
+            # remove the earliest registration first, matching list.remove() semantics
+            self._remove(event_type, callback, index[callback][0])
+
+    def _prune(self, event_type: EventType, sequence: int, callback: Callback) -> None:
+        """
+        Finalizer removing the registration of a dead :class:`WeakCallback`.
+        """
+        with self._lock:
+            entries = self._callbacks.get(event_type)
+            if entries is None or entries.get(sequence) is not callback:
+                # already de-registered
+                return
+            self._remove(event_type, callback, sequence)
+        self.logger.debug("Pruned dead callback %s for %s", callback, event_type)
 
-    def exists(self, event_type: EventType, callback: CallbackType) -> bool:
+    def _remove(self, event_type: EventType, callback: Callback, sequence: int) -> None:
+        index = self._index[event_type]
+        key = callback
+        if callback not in index:
+            # a dead weak callback no longer compares equal to the live callback it was
+            # indexed with, locate the registration by sequence instead
+            key = next(k for k, sequences in index.items() if sequence in sequences)
+        sequences = index[key]
+        sequences.remove(sequence)
+        if not sequences:
+            del index[key]
+
+        if key in self._breakers and not any(
+            key in callbacks for callbacks in self._index.values()
+        ):
+            # the breaker is shared by all registrations of the callback, guarded or not
+            del self._breakers[key]
+
+        entries = self._callbacks[event_type]
+        del entries[sequence]
+        if not entries:
+            # no callbacks left for this event type, defaults apply from now on
+            del self._callbacks[event_type]
+            del self._index[event_type]
+            self._patterns.pop(event_type, None)
+
+        self._invalidate()
+
+    def exists(self, event_type: EventType, callback: Union[CallbackType, str]) -> bool:
         """
         Check if callback exists for the specified *event_type*
 
@@ -169,16 +1118,341 @@ class CallbackRegistry(LoggedObject):
         :param callback: The callback handler to de-register.
         :return: `True` if *callback* exists for the specified *event_type*.
         """
-        if not isinstance(callback, Callback):
-            callback = Callback(function=callback)
-        return callback in self.callbacks(event_type)
+        callback = _as_callback(callback)
+        with self._lock:
+            return any(
+                callback in self._index[key] for key in self._resolve(event_type)
+            )
+
+    def circuit_breaker(
+        self, callback: Union[CallbackType, str]
+    ) -> Optional[CircuitBreaker]:
+        """
+        Retrieve the circuit breaker guarding *callback*, if any.
+
+        :param callback: A registered callback handler.
+        :return: The circuit breaker, or `None` if the callback is not guarded.
+        """
+        callback = _as_callback(callback)
+        return self._breakers.get(callback)
+
+    @property
+    def in_flight(self) -> Dict[EventType, int]:
+        """
+        Number of callback tasks/futures that have not yet completed, keyed by the
+        event type they were dispatched for.
+        """
+        return {
+            event_type: len(futures) for event_type, futures in self._in_flight.items()
+        }
+
+    def _track(self, event_type: EventType, result: CallbackResultType) -> None:
+        """
+        Hold a strong reference to *result* until it completes, preventing pending tasks
+        from being garbage collected and allowing them to be drained.
+
+        :param event_type: Event type the result was dispatched for.
+        :param result: The result returned when triggering a callback.
+        """
+        if asyncio.isfuture(result) and not result.done():
+            futures = self._in_flight.get(event_type)
+            if futures is None:
+                futures = self._in_flight[event_type] = set()
+            futures.add(result)
+            result.add_done_callback(functools.partial(self._untrack, event_type))
+
+    def _trigger(
+        self,
+        event_type: EventType,
+        callback: Callback,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> CallbackResultType:
+        """
+        Trigger *callback* for an *event_type*, tracking and instrumenting the result.
+        """
+        if self._breakers:
+            breaker = self._breakers.get(callback)
+            if breaker is not None:
+                return self._guard(event_type, callback, breaker, args, kwargs)
+        return self._execute(event_type, callback, args, kwargs)
+
+    def _guard(
+        self,
+        event_type: EventType,
+        callback: Callback,
+        breaker: CircuitBreaker,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> CallbackResultType:
+        """
+        Trigger *callback* if allowed by its circuit breaker, otherwise trigger the
+        breaker fallback if any.
+        """
+        if not breaker.acquire():
+            self.logger.debug("Rejected %s for %s by %s", callback, event_type, breaker)
+            if breaker.fallback is None:
+                return None
+            return self._execute(event_type, Callback(breaker.fallback), args, kwargs)
+
+        started = time.monotonic()
+        guard = _instrumented.guard = _Guard()
+        try:
+            result = self._execute(event_type, callback, args, kwargs)
+        except Exception:
+            breaker.release(time.monotonic() - started, True)
+            raise
+        finally:
+            _instrumented.guard = None
+        release = functools.partial(
+            self._release, event_type, callback, breaker, started, guard
+        )
+        if asyncio.isfuture(result) and not result.done():
+            result.add_done_callback(release)
+        else:
+            release(result)
+        return result
+
+    def _release(
+        self,
+        event_type: EventType,
+        callback: Callback,
+        breaker: CircuitBreaker,
+        started: float,
+        guard: _Guard,
+        result: CallbackResultType,
+    ) -> None:
+        cancelled = asyncio.isfuture(result) and result.cancelled()
+        if cancelled:
+            with guard.lock:
+                if guard.running:
+                    # the call keeps its slot until the executor completes it
+                    guard.release = functools.partial(
+                        result.get_loop().call_soon_threadsafe,
+                        self._release,
+                        event_type,
+                        callback,
+                        breaker,
+                        started,
+                        guard,
+                        result,
+                    )
+                    return
+
+        # observe exceptions of executor futures and tasks, nothing else may
+        error = None
+        if asyncio.isfuture(result) and not cancelled:
+            error = result.exception()
+        # cancelled calls, including timed out ones, did not succeed either
+        breaker.release(time.monotonic() - started, cancelled or error is not None)
+        if error is not None:
+            self.logger.error(
+                "Callback %s failed handling event %s",
+                callback,
+                event_type,
+                exc_info=error,
+            )
+
+    def _execute(
+        self,
+        event_type: EventType,
+        callback: Callback,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> CallbackResultType:
+        if self._sink is None and self._tracer is None:
+            result = callback.trigger(*args, **kwargs)
+            self._track(event_type, result)
+            return result
+
+        span = None
+        if self._tracer is not None:
+            span = self._tracer._start(SpanKind.CALLBACK, event_type, callback)
+            # the callback span becomes current for the context the callback runs in
+            token = _current_span.set(span)
+        timing = _instrumented.timing = _Timing()
+        triggered = time.perf_counter()
+        try:
+            result = callback.trigger(*args, **kwargs)
+        except Exception:
+            self._record(event_type, callback, timing, triggered, span, None, True)
+            raise
+        finally:
+            _instrumented.timing = None
+            if span is not None:
+                _current_span.reset(token)
+
+        if asyncio.isfuture(result) and not result.done():
+            self._track(event_type, result)
+            result.add_done_callback(
+                functools.partial(
+                    self._record, event_type, callback, timing, triggered, span
+                )
+            )
+        else:
+            self._record(event_type, callback, timing, triggered, span, result)
+        return result
+
+    def _record(
+        self,
+        event_type: EventType,
+        callback: Callback,
+        timing: _Timing,
+        triggered: float,
+        span: Optional[Span],
+        result: CallbackResultType,
+        failed: bool = False,
+    ) -> None:
+        completed = time.perf_counter()
+        started = timing.started or triggered
+        if asyncio.isfuture(result):
+            failed = result.cancelled() or result.exception() is not None
+        if self._sink is not None:
+            self._sink.record_callback(
+                CallbackRecord(
+                    event_type,
+                    callback,
+                    started - triggered,
+                    completed - started,
+                    failed,
+                )
+            )
+        if span is not None:
+            span.queued = started - triggered
+            span.duration = completed - started
+            span.failed = failed
+            self._tracer._end(span)
+
+    def _untrack(self, event_type: EventType, future: asyncio.Future) -> None:
+        futures = self._in_flight.get(event_type)
+        if futures is not None:
+            futures.discard(future)
+            if not futures:
+                del self._in_flight[event_type]
+
+    def _outstanding(self) -> Set[asyncio.Future]:
+        # never wait on the current task, a callback may drain its own registry
+        outstanding = set().union(*self._in_flight.values())
+        outstanding.discard(asyncio.current_task())
+        return outstanding
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no callback work is outstanding for this registry, including work
+        dispatched while draining. Outstanding work is not cancelled on timeout.
+
+        :param timeout: If specified, the maximum number of seconds to wait for.
+        :return: `True` if all outstanding work completed, `False` on timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        outstanding = self._outstanding()
+        while outstanding:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            await asyncio.wait(outstanding, timeout=remaining)
+            outstanding = self._outstanding()
+        return True
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for callback work outstanding at the time of the call to complete. Unlike
+        :meth:`drain`, work dispatched after this call is not waited for.
+
+        :param timeout: If specified, the maximum number of seconds to wait for.
+        :return: `True` if all outstanding work completed, `False` on timeout.
+        """
+        outstanding = self._outstanding()
+        if not outstanding:
+            return True
+        _, pending = await asyncio.wait(outstanding, timeout=timeout)
+        return not pending
+
+    def set_policy(
+        self, event_type: EventType, policy: Optional[DispatchPolicy]
+    ) -> None:
+        """
+        Apply a :class:`cafeteria.asyncio.policies.DispatchPolicy`, for example to
+        debounce, throttle or coalesce events, when dispatching *event_type*. Any
+        previously set policy is flushed and replaced.
+
+        :param event_type: The event type to apply the policy to.
+        :param policy: The policy to apply, or `None` to remove the current policy.
+        """
+        previous = self._policies.pop(event_type, None)
+        if previous is not None:
+            previous.flush()
+        if policy is not None:
+            self._policies[event_type] = policy
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """
+        The event loop this registry is bound to, if any.
+        """
+        return self._loop
+
+    def bind(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Bind this registry to *loop*, or the running event loop if not specified. Events
+        dispatched from any other thread, for example from synchronous callbacks running
+        in an executor, are then buffered and handed to the loop to be dispatched in
+        order. The loop is woken once per batch of buffered events rather than once per
+        event.
+
+        :param loop: The event loop to bind to.
+        """
+        self._loop = loop or asyncio.get_running_loop()
+
+    def _off_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is not self._loop
+        except RuntimeError:
+            return True
+
+    def _handoff(
+        self, event_type: EventType, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> None:
+        with self._lock:
+            self._handoffs.append(
+                (contextvars.copy_context(), event_type, args, kwargs)
+            )
+            if self._handoff_scheduled:
+                # the loop is already due to receive this batch
+                return
+            self._handoff_scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._receive_handoffs)
+        except RuntimeError:
+            # the loop is closed, nothing will ever receive these events
+            with self._lock:
+                self._handoffs.clear()
+                self._handoff_scheduled = False
+            raise
+
+    def _receive_handoffs(self) -> None:
+        with self._lock:
+            handoffs, self._handoffs = self._handoffs, []
+            self._handoff_scheduled = False
+        for context, event_type, args, kwargs in handoffs:
+            try:
+                # dispatch with the context variables of the dispatching thread
+                context.run(self.dispatch, event_type, *args, **kwargs)
+            except Exception:
+                self.logger.exception("Failed to dispatch event %s", event_type)
 
     def dispatch(self, event_type: EventType, *args: Any, **kwargs: Any):
         """
         Dispatch callbacks registered for an *event_type*. This arguments expects
         any additional positional/keyword arguments required when triggering the
         callback. If *event_type* is `None` or does not have any callbacks already
-         registered, the default callbacks (if any) are triggered.
+         registered, the default callbacks (if any) are triggered. If a policy is set
+         for *event_type*, callbacks are triggered as determined by the policy.
+
+        If the registry is bound to an event loop, this is safe to call from any
+        thread, see :meth:`bind`.
 
         :param event_type: Event type to dispatch
         :param args: Positional arguments to be passed into the callback before any
@@ -186,10 +1460,156 @@ class CallbackRegistry(LoggedObject):
         :param kwargs: Keyword arguments to be passed when triggering the callback.
             These override any pre-configured arguments.
         """
-        self.logger.debug("Received event: %s", event_type)
-        for callback in self.callbacks(event_type):
-            self.logger.debug("Executing callback %s", callback)
-            _ = callback.trigger(*args, **kwargs)
+        if self._loop is not None and self._off_loop():
+            self._handoff(event_type, args, kwargs)
+            return
+        if self._policies:
+            policy = self._policies.get(event_type)
+            if policy is not None:
+                policy.submit(event_type, args, kwargs, self._dispatch)
+                return
+        self._dispatch(event_type, args, kwargs)
+
+    @contextlib.contextmanager
+    def _traced_dispatch(self, event_type: EventType) -> Iterator[Span]:
+        """
+        Report a dispatch span for *event_type*, current while the block executes. The
+        span ends once all callbacks triggered within the block have completed.
+        """
+        span = self._tracer._start(SpanKind.DISPATCH, event_type)
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+            self._tracer._seal(span)
+
+    def _dispatch(
+        self, event_type: EventType, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> None:
+        if self._subscriptions:
+            overflow = self._publish(event_type, args, kwargs)
+            if overflow is not None:
+                # callbacks are still triggered when a subscription is full
+                self._trigger_plan(event_type, args, kwargs)
+                raise overflow
+        self._trigger_plan(event_type, args, kwargs)
+
+    def _trigger_plan(
+        self, event_type: EventType, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> None:
+        plan = self._plan(event_type)
+        if self._sink is not None or self._breakers or self._tracer is not None:
+            if self._sink is not None:
+                self._sink.record_dispatch(DispatchRecord(event_type, len(plan)))
+            if self._tracer is None:
+                for callback in plan:
+                    self._trigger(event_type, callback, args, kwargs)
+                return
+
+            with self._traced_dispatch(event_type):
+                for callback in plan:
+                    self._trigger(event_type, callback, args, kwargs)
+            return
+
+        # avoid per callback logging overhead unless debug logging is enabled
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug("Received event: %s", event_type)
+        for callback in plan:
+            if debug:
+                self.logger.debug("Executing callback %s", callback)
+            self._track(event_type, callback.trigger(*args, **kwargs))
+
+    async def dispatch_and_wait(
+        self,
+        event_type: EventType,
+        args: Tuple[Any, ...] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        *,
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Dispatch callbacks registered for an *event_type* and wait for them to complete.
+        Unlike :meth:`dispatch`, callbacks are only triggered once a concurrency slot is
+        available, providing backpressure when a large number of callbacks are
+        registered.
+
+        :param event_type: Event type to dispatch
+        :param args: Positional arguments to be passed into the callback before any
+            pre-configured positional arguments.
+        :param kwargs: Keyword arguments to be passed when triggering the callback.
+            These override any pre-configured arguments.
+        :param concurrency: If specified, the maximum number of callbacks executed
+            concurrently for this dispatch. The registry wide limit, if configured,
+            applies in addition to this.
+        :param return_exceptions: If `True`, exceptions raised by callbacks are returned
+            as results. Otherwise, the first exception raised cancels any remaining
+            callbacks and is propagated.
+        :param timeout: If specified, the maximum number of seconds to wait for each
+            callback to complete. Callbacks exceeding this raise
+            :class:`asyncio.TimeoutError`.
+        :return: Callback results in registration order.
+        """
+        if concurrency is not None and concurrency < 1:
+            raise ValueError(f"concurrency must be positive, got {concurrency}")
+
+        kwargs = kwargs or dict()
+        overflow = None
+        if self._subscriptions:
+            overflow = self._publish(event_type, args, kwargs)
+
+        plan = self._plan(event_type)
+        if not plan:
+            if overflow is not None:
+                raise overflow
+            return []
+
+        results: List[Any] = [None] * len(plan)
+        pending = iter(enumerate(plan))
+
+        if self._max_concurrency is not None and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        semaphore = self._semaphore
+
+        async def execute(callback: Callback) -> Any:
+            result = self._trigger(event_type, callback, args, kwargs)
+            if not inspect.isawaitable(result):
+                return result
+            if timeout is None:
+                return await result
+            return await asyncio.wait_for(result, timeout)
+
+        async def worker() -> None:
+            # workers share the pending iterator, each callback is executed only once
+            for position, callback in pending:
+                try:
+                    if semaphore is None:
+                        results[position] = await execute(callback)
+                    else:
+                        async with semaphore:
+                            results[position] = await execute(callback)
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results[position] = e
+
+        # no more workers than callbacks allowed to execute concurrently
+        workers = min(
+            limit
+            for limit in (concurrency, self._max_concurrency, len(plan))
+            if limit is not None
+        )
+        if self._tracer is None:
+            await _run_workers(worker, workers)
+        else:
+            with self._traced_dispatch(event_type):
+                await _run_workers(worker, workers)
+        if overflow is not None:
+            raise overflow
+        return results
 
     async def handle_event(
         self, event_type: EventType, *args: Any, **kwargs: Any
@@ -1,45 +1,156 @@
 import asyncio
+import logging
 import signal
 import warnings
 from asyncio import AbstractEventLoop
-from typing import Optional, Union
+from typing import Any, Awaitable, Callable, Optional, Sequence, Set, Union
+
+ShutdownPhase = Callable[[], Awaitable[Any]]
+
+logger = logging.getLogger()
 
 
 async def cancel_all_tasks(
-    loop: Optional[AbstractEventLoop] = None, *ignore: asyncio.Task
-):
+    loop: Optional[AbstractEventLoop] = None,
+    *ignore: asyncio.Task,
+    timeout: Optional[float] = None,
+) -> Set[asyncio.Task]:
     """
-    Cancel and wait for all running tasks in the specified or current event loop.
+    Cancel all running tasks in the specified or current event loop at once and wait
+    for them to complete.
 
     :param loop: Optional `AbstractEventLoop` to add signal handlers for, if not
         provided, running loop is used.
     :param ignore: If specified, these tasks are ignored even when running.
+    :param timeout: If specified, the maximum number of seconds to wait for cancelled
+        tasks to complete.
+    :return: Tasks that did not complete within *timeout*.
     """
-    for task in asyncio.all_tasks(loop):
-        if task is asyncio.current_task() or task in ignore:
+    current = asyncio.current_task(loop)
+    tasks = [
+        task
+        for task in asyncio.all_tasks(loop)
+        if not (task is current or task in ignore or task.done())
+    ]
+    if not tasks:
+        return set()
+
+    for task in tasks:
+        task.cancel()
+
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in done:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "Task %s raised during cancellation", task, exc_info=task.exception()
+            )
+    if pending:
+        logger.warning(
+            "%d tasks did not complete within %ss of cancellation",
+            len(pending),
+            timeout,
+        )
+    return pending
+
+
+async def graceful_shutdown(
+    *phases: ShutdownPhase,
+    loop: Optional[AbstractEventLoop] = None,
+    timeout: Optional[float] = None,
+    ignore: Sequence[asyncio.Task] = (),
+) -> Set[asyncio.Task]:
+    """
+    Shutdown in phases, for example stopping producers and draining callback registries,
+    before cancelling all remaining tasks. Phases are executed in order, a phase that
+    fails does not prevent subsequent phases. Once *timeout* is exceeded, remaining
+    phases are skipped.
+
+    :param phases: Zero argument coroutine functions to await in order.
+    :param loop: Optional `AbstractEventLoop` to cancel tasks for, if not provided,
+        running loop is used.
+    :param timeout: If specified, the maximum number of seconds for the whole shutdown.
+    :param ignore: If specified, these tasks are not cancelled.
+    :return: Tasks that did not complete within *timeout*.
+    """
+    running_loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else running_loop.time() + timeout
+
+    def remaining() -> Optional[float]:
+        return None if deadline is None else max(0.0, deadline - running_loop.time())
+
+    for phase in phases:
+        if remaining() == 0:
+            logger.warning("Shutdown deadline exceeded, skipping phase %s", phase)
             continue
-        if not (task.done() or task.cancelled()):
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+        try:
+            await asyncio.wait_for(phase(), remaining())
+        except asyncio.TimeoutError:
+            logger.warning("Shutdown phase %s did not complete in time", phase)
+        except Exception:
+            logger.exception("Shutdown phase %s failed", phase)
+
+    return await cancel_all_tasks(loop, *ignore, timeout=remaining())
+
+
+class _TerminationHandler:
+    """
+    Signal handler escalating on repeated signals. The first signal starts a graceful
+    shutdown, the second cancels all remaining tasks immediately without waiting for
+    shutdown phases and the third stops the event loop.
+    """
+
+    def __init__(
+        self,
+        loop: AbstractEventLoop,
+        phases: Sequence[ShutdownPhase],
+        timeout: Optional[float],
+    ) -> None:
+        self.loop = loop
+        self.phases = phases
+        self.timeout = timeout
+        self.received = 0
+        self.shutdown: Optional[asyncio.Future] = None
+
+    def __call__(self) -> None:
+        self.received += 1
+        if self.received == 1:
+            self.shutdown = asyncio.ensure_future(
+                graceful_shutdown(*self.phases, loop=self.loop, timeout=self.timeout),
+                loop=self.loop,
+            )
+        elif self.received == 2:
+            logger.warning("Termination requested again, cancelling all tasks")
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+        else:
+            logger.warning("Termination requested again, stopping event loop")
+            self.loop.stop()
 
 
 def cancel_tasks_on_termination(
-    loop: Optional[AbstractEventLoop] = None, *args: Union[signal.Signals, int, str]
+    loop: Optional[AbstractEventLoop] = None,
+    *args: Union[signal.Signals, int, str],
+    phases: Sequence[ShutdownPhase] = (),
+    timeout: Optional[float] = None,
 ) -> None:
     """
     Helper method to add a signal handlers for specified or current event loop. Handlers
     are registered for SIGINT, SIGTERM and any additional signals passed in.
 
+    The first signal received starts a :func:`graceful_shutdown`, the second cancels all
+    remaining tasks immediately and any further signal stops the event loop.
+
     :param loop: Optional `AbstractEventLoop` to add signal handlers for, if not
         provided, running loop is used.
     :param args: Additional signals to register cancellation for.
+    :param phases: Shutdown phases to execute before cancelling remaining tasks.
+    :param timeout: If specified, the maximum number of seconds for graceful shutdown.
     """
     if loop is None:
         loop = asyncio.get_running_loop()
 
+    handler = _TerminationHandler(loop, phases, timeout)
+
     for sig in {signal.SIGINT, signal.SIGTERM, *args}:
         if not isinstance(sig, signal.Signals):
             if isinstance(sig, int):
@@ -53,9 +164,7 @@ def cancel_tasks_on_termination(
                 raise ValueError(
                     f"Signal should be one of signal.Signals, int or str, got {type(sig)}"
                 )
-        loop.add_signal_handler(
-            sig, lambda: asyncio.ensure_future(cancel_all_tasks(loop=loop), loop=loop)
-        )
+        loop.add_signal_handler(sig, handler)
 
 
 def handle_signals(event_loop: AbstractEventLoop, *signames: str) -> None:
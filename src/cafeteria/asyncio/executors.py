@@ -0,0 +1,205 @@
+import asyncio
+import contextvars
+import functools
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class StrategySaturatedError(RuntimeError):
+    """
+    Raised (via the returned future) when an execution strategy has reached its
+    configured maximum number of pending calls and no fallback strategy is available.
+    """
+
+
+class ExecutionStrategy(ABC):
+    """
+    Base class for strategies used to execute synchronous (non-coroutine) callbacks
+    from within an event loop.
+    """
+
+    def __init__(
+        self,
+        max_pending: Optional[int] = None,
+        fallback: Optional["ExecutionStrategy"] = None,
+    ) -> None:
+        """
+        :param max_pending: If specified, the maximum number of calls submitted via this
+            strategy that may be pending completion at any given time.
+        :param fallback: Strategy to submit calls to once *max_pending* is reached. If
+            not specified, calls exceeding the limit fail with
+            :class:`StrategySaturatedError`.
+        """
+        if max_pending is not None and max_pending < 1:
+            raise ValueError(f"max_pending must be positive, got {max_pending}")
+        self.max_pending = max_pending
+        self.fallback = fallback
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of calls submitted via this strategy that have not yet completed.
+        """
+        return self._pending
+
+    def submit(
+        self, function: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Optional[asyncio.Future]:
+        """
+        Submit a call to *function* for execution. If there is no running event loop,
+        the function is called inline and `None` is returned.
+
+        :param function: The callable to execute.
+        :param args: Positional arguments to call *function* with.
+        :param kwargs: Keyword arguments to call *function* with.
+        :return: A future resolving to the result of the call.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            function(*args, **kwargs)
+            return None
+
+        if self.max_pending is not None and self._pending >= self.max_pending:
+            if self.fallback is not None:
+                return self.fallback.submit(function, args, kwargs)
+            future = loop.create_future()
+            future.set_exception(
+                StrategySaturatedError(
+                    f"{type(self).__name__} has {self._pending} pending calls"
+                )
+            )
+            return future
+
+        future = self._submit(loop, function, args, kwargs)
+        if not future.done():
+            self._pending += 1
+            future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _: asyncio.Future) -> None:
+        self._pending -= 1
+
+    @abstractmethod
+    def _submit(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        function: Callable,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> asyncio.Future:
+        raise NotImplementedError
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Release any resources held by this strategy.
+
+        :param wait: If `True`, wait for pending calls to complete.
+        """
+
+
+class InlineStrategy(ExecutionStrategy):
+    """
+    Execute callbacks directly on the event loop. This avoids a thread hop for trivial
+    callbacks, but blocks the loop for the duration of the call.
+    """
+
+    def _submit(self, loop, function, args, kwargs) -> asyncio.Future:
+        future = loop.create_future()
+        try:
+            future.set_result(function(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class ExecutorStrategy(ExecutionStrategy):
+    """
+    Execute callbacks using a :class:`concurrent.futures.Executor`. If no executor is
+    provided, the event loop's default executor is used. Context variables are
+    propagated to callbacks, unless executed in another process.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_pending: Optional[int] = None,
+        fallback: Optional[ExecutionStrategy] = None,
+    ) -> None:
+        super().__init__(max_pending=max_pending, fallback=fallback)
+        self._executor = executor
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        return self._executor
+
+    def _submit(self, loop, function, args, kwargs) -> asyncio.Future:
+        executor = self.executor
+        if isinstance(executor, ProcessPoolExecutor):
+            # contexts cannot be pickled, nor shared with another process
+            return loop.run_in_executor(
+                executor, functools.partial(function, *args, **kwargs)
+            )
+        # executors do not propagate context variables to their threads
+        return loop.run_in_executor(
+            executor,
+            functools.partial(
+                contextvars.copy_context().run, function, *args, **kwargs
+            ),
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+
+class ThreadPoolStrategy(ExecutorStrategy):
+    """
+    Execute callbacks on a dedicated, lazily created :class:`ThreadPoolExecutor`
+    isolating them from other users of the loop's default executor.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        fallback: Optional[ExecutionStrategy] = None,
+        thread_name_prefix: str = "",
+    ) -> None:
+        super().__init__(max_pending=max_pending, fallback=fallback)
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.thread_name_prefix,
+            )
+        return self._executor
+
+
+class ProcessPoolStrategy(ExecutorStrategy):
+    """
+    Execute callbacks on a dedicated, lazily created :class:`ProcessPoolExecutor`. This
+    is suitable for CPU bound callbacks, the callback and all arguments must be
+    picklable.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        fallback: Optional[ExecutionStrategy] = None,
+    ) -> None:
+        super().__init__(max_pending=max_pending, fallback=fallback)
+        self.max_workers = max_workers
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
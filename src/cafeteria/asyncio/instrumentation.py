@@ -0,0 +1,201 @@
+import bisect
+import logging
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# latency histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class DispatchRecord(NamedTuple):
+    event_type: Any
+    callbacks: int
+
+
+class CallbackRecord(NamedTuple):
+    event_type: Any
+    callback: Any
+    #: seconds between triggering the callback and it starting execution
+    queued: float
+    #: seconds the callback spent executing
+    duration: float
+    failed: bool
+
+
+def callback_name(callback: Any) -> str:
+    """
+    Retrieve a readable name for a callback, unwrapping
+    :class:`cafeteria.asyncio.callbacks.Callback` instances.
+    """
+    from cafeteria.asyncio.callbacks import Callback
+
+    while isinstance(callback, Callback):
+        callback = callback.function
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+class Histogram:
+    """
+    A fixed bucket histogram with constant time recording.
+    """
+
+    __slots__ = ("bounds", "buckets", "count", "total", "min", "max")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.buckets: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the *q* quantile as the upper bound of the bucket it falls in.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for position, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return (
+                    self.bounds[position] if position < len(self.bounds) else self.max
+                )
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MetricsSink(ABC):
+    """
+    Receives instrumentation records from an instrumented
+    :class:`cafeteria.asyncio.callbacks.CallbackRegistry`. Implement this to export
+    metrics to an external system. Methods are called on the event loop, and should
+    return quickly.
+    """
+
+    @abstractmethod
+    def record_dispatch(self, record: DispatchRecord) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_callback(self, record: CallbackRecord) -> None:
+        raise NotImplementedError
+
+
+class InMemorySink(MetricsSink):
+    """
+    Aggregate counters and latency histograms in memory, keyed by event type and
+    callback name.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.bounds = bounds
+        self.reset()
+
+    def reset(self) -> None:
+        self.dispatches: Counter = Counter()
+        self.calls: Counter = Counter()
+        self.failures: Counter = Counter()
+        self.queued: Dict[Tuple[Any, str], Histogram] = defaultdict(
+            lambda: Histogram(self.bounds)
+        )
+        self.durations: Dict[Tuple[Any, str], Histogram] = defaultdict(
+            lambda: Histogram(self.bounds)
+        )
+
+    def record_dispatch(self, record: DispatchRecord) -> None:
+        self.dispatches[record.event_type] += 1
+
+    def record_callback(self, record: CallbackRecord) -> None:
+        key = (record.event_type, callback_name(record.callback))
+        self.calls[key] += 1
+        if record.failed:
+            self.failures[key] += 1
+        self.queued[key].record(record.queued)
+        self.durations[key].record(record.duration)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        :return: A point in time copy of all aggregated metrics.
+        """
+        return {
+            "dispatches": dict(self.dispatches),
+            "callbacks": {
+                key: {
+                    "calls": calls,
+                    "failures": self.failures[key],
+                    "queued": self.queued[key].snapshot(),
+                    "duration": self.durations[key].snapshot(),
+                }
+                for key, calls in self.calls.items()
+            },
+        }
+
+
+class LoggingSink(MetricsSink):
+    """
+    Log every instrumentation record.
+    """
+
+    def __init__(
+        self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG
+    ) -> None:
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def record_dispatch(self, record: DispatchRecord) -> None:
+        self.logger.log(
+            self.level,
+            "Dispatched %s to %d callbacks",
+            record.event_type,
+            record.callbacks,
+        )
+
+    def record_callback(self, record: CallbackRecord) -> None:
+        self.logger.log(
+            self.level,
+            "Callback %s for %s %s after %.6fs queued, %.6fs executing",
+            callback_name(record.callback),
+            record.event_type,
+            "failed" if record.failed else "completed",
+            record.queued,
+            record.duration,
+        )
@@ -0,0 +1,425 @@
+import asyncio
+import collections
+import json
+import os
+import pickle
+import struct
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+)
+
+from cafeteria.asyncio.bus import (
+    Event,
+    OverflowPolicy,
+    QueuedCallbackRegistry,
+    Subscription,
+)
+from cafeteria.asyncio.callbacks import CallbackRegistry, EventType
+from cafeteria.logging import LoggedObject
+
+# frames are prefixed with the payload length as an unsigned 32 bit integer
+_HEADER = struct.Struct("!I")
+
+
+class Serializer(ABC):
+    """
+    Converts batches of events to and from bytes for an :class:`IPCTransport`. All
+    processes exchanging events must use compatible serializers.
+    """
+
+    @abstractmethod
+    def dumps(self, events: Sequence[Event]) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data: bytes) -> List[Event]:
+        raise NotImplementedError
+
+
+class PickleSerializer(Serializer):
+    """
+    Serialize events using :mod:`pickle`, supporting any picklable event type and
+    arguments. Only exchange events with trusted processes, unpickling data can execute
+    arbitrary code.
+    """
+
+    def __init__(self, protocol: int = pickle.HIGHEST_PROTOCOL) -> None:
+        self.protocol = protocol
+
+    def dumps(self, events: Sequence[Event]) -> bytes:
+        return pickle.dumps([tuple(event) for event in events], protocol=self.protocol)
+
+    def loads(self, data: bytes) -> List[Event]:
+        return [Event(*event) for event in pickle.loads(data)]
+
+
+class JSONSerializer(Serializer):
+    """
+    Serialize events as JSON. Event types and arguments must be JSON serializable,
+    tuples are received as lists.
+    """
+
+    def __init__(self, default: Optional[Callable[[Any], Any]] = None) -> None:
+        """
+        :param default: Called to convert objects that are not otherwise serializable,
+            see :func:`json.dumps`.
+        """
+        self.default = default
+
+    def dumps(self, events: Sequence[Event]) -> bytes:
+        return json.dumps(
+            [[event.event_type, event.args, event.kwargs] for event in events],
+            default=self.default,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def loads(self, data: bytes) -> List[Event]:
+        return [
+            Event(event_type, tuple(args), kwargs)
+            for event_type, args, kwargs in json.loads(data)
+        ]
+
+
+class _Outbox(Subscription):
+    """
+    A subscription passing events dispatched to the local registry to a transport.
+    """
+
+    def __init__(self, transport: "IPCTransport", event_type: EventType) -> None:
+        super().__init__(transport.registry, event_type, maxsize=1)
+        self.transport = transport
+
+    def offer(self, event: Event) -> None:
+        if not self._closed:
+            self.transport._offer(event)
+
+
+class IPCTransport(LoggedObject):
+    """
+    Exchange events between a :class:`CallbackRegistry` and registries in other local
+    processes over Unix domain sockets. Events of *event_types* dispatched to the local
+    registry are sent to connected peers, and events received from peers are
+    dispatched to the local registry, so that callbacks are registered and events
+    dispatched as usual in every process.
+
+    One process serves a socket path, the others connect to it. The serving process
+    relays events between its peers, peers may in turn serve others as long as
+    connections do not form a cycle.
+
+    Events are sent in batches of up to *batch_size* events, each serialized as a single
+    length prefixed frame. Events buffered while a batch is being written are sent
+    together in the next one, so batches grow with load without delaying events when
+    idle. Events are discarded while no peers are connected.
+
+    Events received from peers are not sent back out again, while events dispatched by
+    callbacks handling them are. Dispatch policies merging events, such as
+    :class:`cafeteria.asyncio.policies.Coalesce`, deliver new events that are sent back
+    out, so avoid forwarding event types with such policies. For a
+    :class:`cafeteria.asyncio.bus.QueuedCallbackRegistry`, received events are queued
+    directly, waiting for space if its overflow policy is to block.
+
+    The transport runs on the event loop it is started on, to dispatch events from
+    other threads, bind the registry to that loop, see :meth:`CallbackRegistry.bind`.
+    """
+
+    def __init__(
+        self,
+        registry: CallbackRegistry,
+        event_types: Iterable[EventType],
+        serializer: Optional[Serializer] = None,
+        batch_size: int = 256,
+        linger: Optional[float] = None,
+        maxsize: int = 65536,
+        max_frame: int = 64 * 1024 * 1024,
+    ) -> None:
+        """
+        :param registry: The local registry.
+        :param event_types: Event types, or event patterns, to send to peers.
+        :param serializer: Serializer for events, defaults to a
+            :class:`PickleSerializer`.
+        :param batch_size: Maximum number of events per frame.
+        :param linger: If specified, the maximum number of seconds to wait for a batch
+            to fill before sending it.
+        :param maxsize: Maximum number of events buffered for sending, the oldest are
+            discarded when exceeded.
+        :param max_frame: Maximum size, in bytes, of a received frame. Peers sending
+            larger frames are disconnected.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.registry = registry
+        self.event_types = tuple(event_types)
+        self.serializer = serializer or PickleSerializer()
+        self.batch_size = batch_size
+        self.linger = linger
+        self.maxsize = maxsize
+        self.max_frame = max_frame
+
+        self._outboxes: List[_Outbox] = []
+        self._pending: Deque[Event] = collections.deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self._sender: Optional[asyncio.Task] = None
+        self._servers: List[asyncio.AbstractServer] = []
+        # connected peers and the tasks reading events from them
+        self._peers: Dict[asyncio.StreamWriter, asyncio.Task] = dict()
+        self._dropped = 0
+        # the last event buffered, the same event is offered once per matching outbox
+        self._last: Optional[Event] = None
+        # received events, which must not be sent back out, until offered to an outbox;
+        # keyed by the identity of their keyword arguments, which registries pass on
+        # unchanged when publishing events to subscriptions
+        self._received: Dict[int, Event] = dict()
+
+    @property
+    def peers(self) -> int:
+        """
+        Number of connected peers.
+        """
+        return len(self._peers)
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of events discarded as the send buffer was full.
+        """
+        return self._dropped
+
+    def _start(self) -> None:
+        if self._sender is not None:
+            return
+        self._outboxes = [_Outbox(self, event_type) for event_type in self.event_types]
+        for outbox in self._outboxes:
+            self.registry._add_subscription(outbox)
+        self._sender = asyncio.ensure_future(self._send_pending())
+
+    async def serve(self, path: str) -> None:
+        """
+        Accept peers connecting to the Unix domain socket at *path*. The socket is only
+        accessible to the current user.
+
+        :param path: File system path of the socket.
+        """
+        self._start()
+        server = await asyncio.start_unix_server(self._accept, path=path)
+        os.chmod(path, 0o600)
+        self._servers.append(server)
+
+    async def connect(self, path: str) -> None:
+        """
+        Connect to a peer serving the Unix domain socket at *path*.
+
+        :param path: File system path of the socket.
+        """
+        self._start()
+        reader, writer = await asyncio.open_unix_connection(path)
+        self._peers[writer] = asyncio.ensure_future(self._receive(reader, writer))
+
+    async def _accept(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._peers[writer] = asyncio.current_task()
+        try:
+            await self._receive(reader, writer)
+        except asyncio.CancelledError:
+            # the task is owned by the server, which reports any exception as an error
+            pass
+
+    async def close(self) -> None:
+        """
+        Send buffered events, then disconnect from all peers and stop serving.
+        """
+        for outbox in self._outboxes:
+            outbox.close()
+        self._outboxes = []
+
+        sender, self._sender = self._sender, None
+        if sender is not None:
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+            while self._pending:
+                await self._send_batch()
+
+        servers, self._servers = self._servers, []
+        for server in servers:
+            server.close()
+
+        # on Python 3.12+ servers are only closed once all their connections are
+        peers, self._peers = self._peers, dict()
+        for writer, task in peers.items():
+            writer.close()
+            if task is not asyncio.current_task():
+                task.cancel()
+        await asyncio.gather(*peers.values(), return_exceptions=True)
+        for server in servers:
+            await server.wait_closed()
+        self._pending.clear()
+        self._received.clear()
+        self._last = None
+
+    def _offer(self, event: Event) -> None:
+        if event is self._last:
+            return
+        self._last = event
+        if self._received:
+            received = self._received.get(id(event.kwargs))
+            if (
+                received is not None
+                and received.kwargs is event.kwargs
+                and received.args is event.args
+            ):
+                del self._received[id(event.kwargs)]
+                return
+
+        if len(self._pending) >= self.maxsize:
+            self._pending.popleft()
+            self._dropped += 1
+        self._pending.append(event)
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def _wait(self, timeout: Optional[float] = None) -> None:
+        if self._waiter is None or self._waiter.done():
+            self._waiter = asyncio.get_running_loop().create_future()
+        await asyncio.wait((self._waiter,), timeout=timeout)
+
+    async def _send_pending(self) -> None:
+        pending = self._pending
+        while True:
+            while not pending:
+                await self._wait()
+            if self.linger is not None and len(pending) < self.batch_size:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + self.linger
+                while len(pending) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    await self._wait(remaining)
+            await self._send_batch()
+
+    async def _send_batch(self) -> None:
+        pending = self._pending
+        batch = [pending.popleft() for _ in range(min(self.batch_size, len(pending)))]
+        if not self._peers:
+            return
+        try:
+            payload = self.serializer.dumps(batch)
+        except Exception:
+            payload = self._dumps_individually(batch)
+            if payload is None:
+                return
+        await self._write(_HEADER.pack(len(payload)) + payload)
+
+    def _dumps_individually(self, batch: List[Event]) -> Optional[bytes]:
+        serializable = []
+        for event in batch:
+            try:
+                self.serializer.dumps([event])
+            except Exception:
+                self.logger.exception("Failed to serialize event %s", event.event_type)
+            else:
+                serializable.append(event)
+        return self.serializer.dumps(serializable) if serializable else None
+
+    async def _write(
+        self, frame: bytes, exclude: Optional[asyncio.StreamWriter] = None
+    ) -> None:
+        writers = [writer for writer in self._peers if writer is not exclude]
+        for writer in writers:
+            writer.write(frame)
+        for writer in writers:
+            try:
+                await writer.drain()
+            except ConnectionError:
+                self._disconnect(writer)
+
+    def _disconnect(self, writer: asyncio.StreamWriter) -> None:
+        task = self._peers.pop(writer, None)
+        writer.close()
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _receive(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                header = await reader.readexactly(_HEADER.size)
+                (size,) = _HEADER.unpack(header)
+                if size > self.max_frame:
+                    self.logger.error(
+                        "Received frame of %d bytes exceeding %d, disconnecting peer",
+                        size,
+                        self.max_frame,
+                    )
+                    return
+                payload = await reader.readexactly(size)
+                if len(self._peers) > 1:
+                    await self._write(header + payload, exclude=writer)
+
+                try:
+                    events = self.serializer.loads(payload)
+                except Exception:
+                    self.logger.exception("Failed to deserialize %d bytes", size)
+                    continue
+                for event in events:
+                    await self._dispatch(event)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.logger.debug("Peer disconnected")
+        finally:
+            self._disconnect(writer)
+
+    async def _dispatch(self, event: Event) -> None:
+        registry = self.registry
+        event_type = event.event_type
+        try:
+            if any(
+                isinstance(subscription, _Outbox)
+                for subscription in registry._subscribers(event_type)
+            ):
+                self._remember(event)
+
+            # dispatch as CallbackRegistry.dispatch() would, passing arguments on
+            # unchanged so that the event is recognised when offered to an outbox
+            policy = registry._policies.get(event_type) if registry._policies else None
+            if isinstance(registry, QueuedCallbackRegistry):
+                if policy is not None:
+                    policy.submit(
+                        event_type, event.args, event.kwargs, registry._enqueue_event
+                    )
+                    return
+                queue = registry._queue(event_type)
+                if registry.overflow is OverflowPolicy.BLOCK:
+                    await queue.put(registry._item(event))
+                else:
+                    registry._enqueue(queue, event)
+            elif policy is not None:
+                policy.submit(event_type, event.args, event.kwargs, registry._dispatch)
+            else:
+                registry._dispatch(event_type, event.args, event.kwargs)
+        except Exception:
+            self.logger.exception("Failed to dispatch event %s", event.event_type)
+
+    def _remember(self, event: Event) -> None:
+        received = self._received
+        received[id(event.kwargs)] = event
+        if len(received) > self.maxsize:
+            # discarded by the registry before reaching the outbox
+            del received[next(iter(received))]
+
+    async def __aenter__(self) -> "IPCTransport":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
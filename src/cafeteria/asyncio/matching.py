@@ -0,0 +1,54 @@
+import fnmatch
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Pattern
+
+
+class EventPattern(ABC):
+    """
+    An event type that, when used to register a callback with a
+    :class:`cafeteria.asyncio.callbacks.CallbackRegistry`, matches a family of concrete
+    event types. Patterns must be hashable.
+    """
+
+    @abstractmethod
+    def matches(self, event_type: Any) -> bool:
+        """
+        :param event_type: The concrete event type being dispatched.
+        :return: `True` if callbacks registered for this pattern should be triggered.
+        """
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class Wildcard(EventPattern):
+    """
+    Match string event types using shell-style wildcards, for example "order.*" matches
+    "order.created" as well as "order.item.added".
+    """
+
+    pattern: str
+    _regex: Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_regex", re.compile(fnmatch.translate(self.pattern)))
+
+    def matches(self, event_type: Any) -> bool:
+        return isinstance(event_type, str) and self._regex.match(event_type) is not None
+
+
+@dataclass(frozen=True)
+class TypeHierarchy(EventPattern):
+    """
+    Match event types that are subclasses or instances of a class. For example,
+    `TypeHierarchy(LookupError)` matches `KeyError` and `KeyError("key")` while
+    `TypeHierarchy(Color)` matches every member of the `Color` enum.
+    """
+
+    cls: type
+
+    def matches(self, event_type: Any) -> bool:
+        if isinstance(event_type, type):
+            return issubclass(event_type, self.cls)
+        return isinstance(event_type, self.cls)
@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import Executor
+from typing import Any, Dict, NamedTuple, Optional, Union
+
+from cafeteria.asyncio.callbacks import _unwrap
+from cafeteria.asyncio.executors import ExecutionStrategy
+from cafeteria.logging import LoggedObject
+
+
+class LoopHealth(NamedTuple):
+    #: maximum delay, in seconds, of the monitor timer since the previous report
+    lag: float
+    #: number of live tasks, keyed by coroutine name
+    tasks: Dict[str, int]
+    #: number of work items waiting for an executor thread, if known
+    executor_queue: Optional[int]
+
+
+class BlockedLoop(NamedTuple):
+    #: seconds the loop has been blocked for when detected
+    duration: float
+    #: the task running when the loop was detected as blocked, if any
+    task: Optional[str]
+    #: formatted stack of the event loop thread
+    stack: str
+
+
+class HealthReporter(ABC):
+    """
+    Receives reports from a :class:`LoopMonitor`. Implement this to export loop health
+    to an external system.
+    """
+
+    @abstractmethod
+    def report_health(self, health: LoopHealth) -> None:
+        """
+        Called periodically on the event loop, this should return quickly.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def report_blocked(self, blocked: BlockedLoop) -> None:
+        """
+        Called from the monitor's watchdog thread once per blocking incident, as the
+        event loop itself is unable to run.
+        """
+        raise NotImplementedError
+
+
+class LoggingHealthReporter(HealthReporter):
+    """
+    Log loop health at *level* and blocking incidents as warnings.
+    """
+
+    def __init__(
+        self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG
+    ) -> None:
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def report_health(self, health: LoopHealth) -> None:
+        self.logger.log(
+            self.level,
+            "Loop lag %.6fs, %d tasks, executor queue %s",
+            health.lag,
+            sum(health.tasks.values()),
+            health.executor_queue,
+        )
+
+    def report_blocked(self, blocked: BlockedLoop) -> None:
+        self.logger.warning(
+            "Event loop blocked for %.3fs running %s\n%s",
+            blocked.duration,
+            blocked.task or "a callback",
+            blocked.stack,
+        )
+
+
+def _coroutine_name(task: asyncio.Task) -> str:
+    coroutine = _unwrap(task.get_coro())
+    return getattr(coroutine, "__qualname__", None) or type(coroutine).__name__
+
+
+class LoopMonitor(LoggedObject):
+    """
+    Monitor the health of an event loop. A timer on the loop measures how late it runs
+    (loop lag) and reports live task counts and executor queue depth every *interval*
+    seconds. A watchdog thread detects the loop being blocked for longer than
+    *block_threshold* seconds, capturing the stack of the loop thread.
+
+    The overhead is a timer callback every *block_threshold* / 2 seconds (or *interval*
+    seconds if shorter), and a scan of all tasks every *interval* seconds.
+    """
+
+    def __init__(
+        self,
+        interval: float = 10.0,
+        block_threshold: float = 0.5,
+        reporter: Optional[HealthReporter] = None,
+        executor: Optional[Union[Executor, ExecutionStrategy]] = None,
+    ) -> None:
+        """
+        :param interval: Seconds between health reports.
+        :param block_threshold: Seconds the loop must be unresponsive for before it is
+            reported as blocked.
+        :param reporter: Receives health reports, logs them if not specified.
+        :param executor: Executor or execution strategy to report the queue depth of,
+            the loop default executor if not specified.
+        """
+        if interval <= 0 or block_threshold <= 0:
+            raise ValueError("interval and block_threshold must be positive")
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.reporter = reporter or LoggingHealthReporter()
+        self.executor = executor
+        self._period = min(interval, block_threshold / 2)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._due = 0.0
+        self._next_report = 0.0
+        self._lag = 0.0
+        # monotonic time the loop last ran the monitor timer, read by the watchdog
+        self._heartbeat = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> None:
+        """
+        Start monitoring the running event loop.
+        """
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._heartbeat = time.monotonic()
+        now = self._loop.time()
+        self._next_report = now + self.interval
+        self._lag = 0.0
+        self._schedule(now)
+
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        """
+        Stop monitoring, this must be called on the monitored event loop.
+        """
+        if self._loop is None:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._stopped.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        self._loop = None
+
+    def _schedule(self, now: float) -> None:
+        self._due = now + self._period
+        self._timer = self._loop.call_at(self._due, self._beat)
+
+    def _beat(self) -> None:
+        self._heartbeat = time.monotonic()
+        now = self._loop.time()
+        lag = now - self._due
+        if lag > self._lag:
+            self._lag = lag
+
+        if now >= self._next_report:
+            self._next_report = now + self.interval
+            health = LoopHealth(self._lag, self._tasks(), self._executor_queue())
+            self._lag = 0.0
+            try:
+                self.reporter.report_health(health)
+            except Exception:
+                self.logger.exception("Failed to report loop health")
+        self._schedule(now)
+
+    def _tasks(self) -> Dict[str, int]:
+        return dict(Counter(map(_coroutine_name, asyncio.all_tasks(self._loop))))
+
+    def _executor_queue(self) -> Optional[int]:
+        executor = self.executor
+        if isinstance(executor, ExecutionStrategy):
+            return executor.pending
+        if executor is None:
+            # not exposed publicly, only created once first used
+            executor = getattr(self._loop, "_default_executor", None)
+        queue = getattr(executor, "_work_queue", None)
+        return None if queue is None else queue.qsize()
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stopped.wait(self._period):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat
+            if blocked < self.block_threshold or heartbeat == reported:
+                continue
+            # report each incident once, until the loop runs the monitor timer again
+            reported = heartbeat
+            try:
+                self.reporter.report_blocked(self._blocked(blocked))
+            except Exception:
+                self.logger.exception("Failed to report blocked loop")
+
+    def _blocked(self, duration: float) -> BlockedLoop:
+        frame = sys._current_frames().get(self._thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        task = asyncio.current_task(self._loop)
+        return BlockedLoop(
+            duration, None if task is None else _coroutine_name(task), stack
+        )
+
+    async def __aenter__(self) -> "LoopMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        self.stop()
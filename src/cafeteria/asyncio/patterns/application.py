@@ -1,12 +1,24 @@
 import asyncio
+import multiprocessing
+import os
+import signal
+import time
 from abc import abstractmethod
-from typing import Any
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from typing import Any, Coroutine, Dict, List, Optional, Sequence
 
-from cafeteria.asyncio.commons import cancel_tasks_on_termination
+from cafeteria.asyncio.commons import ShutdownPhase, cancel_tasks_on_termination
+from cafeteria.asyncio.monitoring import LoopMonitor
 from cafeteria.logging import LoggedObject
 
 
 class AsyncioGracefulApplication(LoggedObject):
+    #: if set, monitors the health of the application event loop while running
+    monitor: Optional[LoopMonitor] = None
+    #: if set, the maximum number of seconds for a graceful shutdown on termination
+    shutdown_timeout: Optional[float] = None
+
     @abstractmethod
     async def main(self) -> Any:
         """
@@ -15,9 +27,27 @@ class AsyncioGracefulApplication(LoggedObject):
         """
         raise NotImplementedError
 
+    def shutdown_phases(self) -> Sequence[ShutdownPhase]:
+        """
+        Phases executed, in order, when termination is requested before cancelling all
+        remaining tasks. See :func:`cafeteria.asyncio.commons.graceful_shutdown`.
+        """
+        return ()
+
     async def __main(self) -> Any:
-        cancel_tasks_on_termination()
-        return await self.main()
+        cancel_tasks_on_termination(
+            phases=self.shutdown_phases(), timeout=self.shutdown_timeout
+        )
+        return await self._monitored(self.main())
+
+    async def _monitored(self, coroutine: Coroutine) -> Any:
+        if self.monitor is None:
+            return await coroutine
+        self.monitor.start()
+        try:
+            return await coroutine
+        finally:
+            self.monitor.stop()
 
     def run(self, debug: bool = False):
         try:
@@ -25,3 +55,183 @@ class AsyncioGracefulApplication(LoggedObject):
             return asyncio.run(self.__main(), debug=debug)
         except (asyncio.CancelledError, KeyboardInterrupt):
             self.logger.debug("Application halted")
+
+
+class AsyncioWorkerProcessApplication(AsyncioGracefulApplication):
+    """
+    An application running :meth:`main` in multiple worker processes, each with its
+    own event loop. The supervising process forwards termination signals to workers,
+    restarts crashed workers with exponential backoff and returns once all workers
+    have exited.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        start_method: Optional[str] = None,
+        restart_backoff: float = 0.5,
+        max_restart_backoff: float = 30.0,
+        shutdown_timeout: float = 30.0,
+        supervisor_check_interval: float = 1.0,
+    ) -> None:
+        """
+        :param workers: Number of worker processes, defaults to the number of CPUs.
+        :param start_method: The :mod:`multiprocessing` start method to use, platform
+            default if not specified. With "spawn", the application must be picklable.
+        :param restart_backoff: Initial delay in seconds before restarting a crashed
+            worker, doubled for each consecutive crash.
+        :param max_restart_backoff: Maximum delay in seconds before restarting a crashed
+            worker. A worker running for longer than this is considered healthy again.
+        :param shutdown_timeout: Seconds to wait for workers to exit on termination
+            before killing them, this also bounds the graceful shutdown of each worker.
+        :param supervisor_check_interval: Seconds between checks by each worker that
+            the supervisor is still running. Workers orphaned by a supervisor that was
+            killed shut down gracefully.
+        """
+        super().__init__()
+        self.workers = workers or os.cpu_count() or 1
+        self.start_method = start_method
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.shutdown_timeout = shutdown_timeout
+        self.supervisor_check_interval = supervisor_check_interval
+        self.worker_index: Optional[int] = None
+
+    @abstractmethod
+    async def main(self, worker_index: int, worker_count: int) -> Any:
+        """
+        The main method executed in each worker process.
+
+        :param worker_index: Index of this worker, between 0 and *worker_count* - 1.
+        :param worker_count: Total number of worker processes.
+        """
+        raise NotImplementedError
+
+    async def _worker_main(self, worker_index: int, supervisor: int) -> Any:
+        cancel_tasks_on_termination(
+            phases=self.shutdown_phases(), timeout=self.shutdown_timeout
+        )
+        watcher = asyncio.ensure_future(self._watch_supervisor(supervisor))
+        try:
+            return await self._monitored(self.main(worker_index, self.workers))
+        finally:
+            watcher.cancel()
+
+    async def _watch_supervisor(self, supervisor: int) -> None:
+        # detached workers do not receive signals of a killed supervisor, stop once
+        # reparented instead of running as orphans
+        while os.getppid() == supervisor:
+            await asyncio.sleep(self.supervisor_check_interval)
+        self.logger.warning(
+            "Supervisor %d exited, stopping worker %d", supervisor, self.worker_index
+        )
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def _run_worker(self, worker_index: int, supervisor: int, debug: bool) -> None:
+        # workers are signalled by the supervisor only, not by the terminal
+        os.setpgrp()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, signal.SIG_DFL)
+
+        self.worker_index = worker_index
+        try:
+            self.logger.debug("Starting worker %d", worker_index)
+            asyncio.run(self._worker_main(worker_index, supervisor), debug=debug)
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            self.logger.debug("Worker %d halted", worker_index)
+
+    def run(self, debug: bool = False) -> List[Optional[int]]:
+        """
+        Start worker processes and supervise them until all have exited.
+
+        :param debug: Run worker event loops in debug mode.
+        :return: Exit codes of the last process for each worker index.
+        """
+        context = multiprocessing.get_context(self.start_method)
+        processes: Dict[int, BaseProcess] = dict()
+        started: Dict[int, float] = dict()
+        failures: Dict[int, int] = dict()
+        restarts: Dict[int, float] = dict()
+        exitcodes: List[Optional[int]] = [None] * self.workers
+        stopping = False
+        supervisor = os.getpid()
+
+        def start(index: int) -> None:
+            process = context.Process(
+                target=self._run_worker,
+                args=(index, supervisor, debug),
+                name=f"{type(self).__name__}-{index}",
+            )
+            process.start()
+            processes[index] = process
+            started[index] = time.monotonic()
+
+        def terminate(signum: int, _: Any) -> None:
+            nonlocal stopping
+            self.logger.debug("Received signal %d, stopping workers", signum)
+            stopping = True
+            restarts.clear()
+            for process in processes.values():
+                if process.pid is not None and process.is_alive():
+                    os.kill(process.pid, signum)
+
+        handlers = {
+            sig: signal.signal(sig, terminate)
+            for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            self.logger.debug("Starting %d workers", self.workers)
+            for index in range(self.workers):
+                start(index)
+
+            deadline = None
+            while processes or restarts:
+                now = time.monotonic()
+                if stopping and deadline is None:
+                    deadline = now + self.shutdown_timeout
+                if deadline is not None and now >= deadline:
+                    for process in processes.values():
+                        self.logger.warning("Killing worker %s", process.name)
+                        process.kill()
+
+                timeouts = [when - now for when in restarts.values()]
+                if deadline is not None:
+                    timeouts.append(deadline - now)
+                timeout = max(0.0, min(timeouts)) if timeouts else None
+                wait([p.sentinel for p in processes.values()], timeout=timeout)
+
+                for index, process in list(processes.items()):
+                    if process.is_alive():
+                        continue
+                    process.join()
+                    del processes[index]
+                    exitcodes[index] = process.exitcode
+                    if process.exitcode == 0 or stopping:
+                        continue
+
+                    if time.monotonic() - started[index] > self.max_restart_backoff:
+                        failures[index] = 0
+                    backoff = min(
+                        self.max_restart_backoff,
+                        self.restart_backoff * 2 ** failures.get(index, 0),
+                    )
+                    failures[index] = failures.get(index, 0) + 1
+                    self.logger.warning(
+                        "Worker %s exited with %s, restarting in %.2fs",
+                        process.name,
+                        process.exitcode,
+                        backoff,
+                    )
+                    restarts[index] = time.monotonic() + backoff
+
+                now = time.monotonic()
+                for index, when in list(restarts.items()):
+                    if when <= now:
+                        del restarts[index]
+                        start(index)
+        finally:
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+
+        self.logger.debug("All workers exited")
+        return exitcodes
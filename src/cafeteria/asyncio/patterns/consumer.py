@@ -0,0 +1,375 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+from cafeteria.asyncio.commons import ShutdownPhase
+from cafeteria.asyncio.patterns.application import AsyncioGracefulApplication
+
+#: latencies are never considered slow below this many seconds, as jitter dominates
+_LATENCY_FLOOR = 0.001
+
+
+class Source(ABC):
+    """
+    A source of items consumed by an :class:`AsyncioConsumerApplication`.
+    """
+
+    @abstractmethod
+    async def fetch(self, limit: int) -> Sequence[Any]:
+        """
+        Wait for at least one item to be available and return up to *limit* items.
+
+        :param limit: Maximum number of items to return.
+        :return: The items, or an empty sequence if the source is exhausted.
+        """
+        raise NotImplementedError
+
+    async def acknowledge(
+        self, items: Sequence[Any], error: Optional[BaseException]
+    ) -> None:
+        """
+        Called once *items* have been handled, for example to commit offsets.
+
+        :param items: Items previously returned by :meth:`fetch`.
+        :param error: The exception raised handling the items, if any.
+        """
+
+    async def close(self) -> None:
+        """
+        Called once the consumer has stopped and all items have been handled.
+        """
+
+
+class QueueSource(Source):
+    """
+    Consume items from an :class:`asyncio.Queue`, marking them as done once handled.
+    """
+
+    def __init__(self, queue: asyncio.Queue) -> None:
+        self.queue = queue
+
+    async def fetch(self, limit: int) -> Sequence[Any]:
+        items = [await self.queue.get()]
+        while len(items) < limit and not self.queue.empty():
+            items.append(self.queue.get_nowait())
+        return items
+
+    async def acknowledge(
+        self, items: Sequence[Any], error: Optional[BaseException]
+    ) -> None:
+        for _ in items:
+            self.queue.task_done()
+
+
+class IterableSource(Source):
+    """
+    Consume items from a synchronous or asynchronous iterable, exhausted once the
+    iterable is.
+    """
+
+    def __init__(self, iterable: Union[Iterable[Any], AsyncIterable[Any]]) -> None:
+        if isinstance(iterable, AsyncIterable):
+            self._async_iterator = iterable.__aiter__()
+            self._iterator = None
+        else:
+            self._async_iterator = None
+            self._iterator = iter(iterable)
+
+    async def fetch(self, limit: int) -> Sequence[Any]:
+        items: List[Any] = []
+        try:
+            while len(items) < limit:
+                if self._iterator is not None:
+                    items.append(next(self._iterator))
+                else:
+                    items.append(await self._async_iterator.__anext__())
+        except (StopIteration, StopAsyncIteration):
+            pass
+        return items
+
+
+class AdaptiveLimiter:
+    """
+    A concurrency limit adjusted using additive increase, multiplicative decrease
+    (AIMD). While all slots are in use and calls complete within *latency_tolerance*
+    times the baseline latency, the limit grows by *increase* per round of calls. A
+    failed or slow call multiplies the limit by *decrease*, at most once per round, so
+    that the calls in flight when overload started do not collapse the limit.
+
+    The baseline latency is *latency_target* if specified, otherwise the lowest latency
+    observed, slowly drifting towards the average to adapt to changing workloads.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 256,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        latency_target: Optional[float] = None,
+    ) -> None:
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Limits must satisfy 1 <= minimum <= initial <= maximum")
+        if not 0 < decrease < 1:
+            raise ValueError(f"decrease must be in (0, 1), got {decrease}")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.latency_target = latency_target
+
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._baseline: Optional[float] = latency_target
+        self._average: Optional[float] = None
+        # calls to complete before the limit may be decreased again
+        self._recovering = 0
+        self._completed = 0
+        self._started = time.monotonic()
+        self._waiter: Optional[asyncio.Future] = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def available(self) -> int:
+        return max(0, self.limit - self._in_flight)
+
+    @property
+    def latency(self) -> Optional[float]:
+        """
+        Exponentially weighted average latency of completed calls.
+        """
+        return self._average
+
+    @property
+    def throughput(self) -> float:
+        """
+        Calls completed per second since the limiter was created.
+        """
+        elapsed = time.monotonic() - self._started
+        return self._completed / elapsed if elapsed > 0 else 0.0
+
+    def acquire_nowait(self) -> bool:
+        """
+        Reserve a slot if one is available.
+
+        :return: `True` if a slot was reserved.
+        """
+        if self._in_flight >= self.limit:
+            return False
+        self._in_flight += 1
+        return True
+
+    async def acquire(self) -> None:
+        """
+        Wait for a slot to become available and reserve it.
+        """
+        while not self.acquire_nowait():
+            if self._waiter is None or self._waiter.done():
+                self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
+
+    def cancel(self) -> None:
+        """
+        Release a slot without recording an outcome, for example if the slot was
+        reserved but not used.
+        """
+        self._in_flight -= 1
+        self._wake()
+
+    def release(self, latency: float, failed: bool = False) -> None:
+        """
+        Release a slot, adjusting the limit based on the outcome of the call.
+
+        :param latency: Seconds the call took.
+        :param failed: `True` if the call failed.
+        """
+        saturated = self._in_flight >= self.limit
+        self._in_flight -= 1
+        self._completed += 1
+        self._observe(latency)
+
+        recovering = self._recovering
+        if recovering:
+            self._recovering -= 1
+        threshold = self.latency_tolerance * max(self._baseline, _LATENCY_FLOOR)
+        if failed or latency > threshold:
+            if not recovering:
+                self._limit = max(self.minimum, self._limit * self.decrease)
+                self._recovering = self._in_flight
+        elif saturated:
+            self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _observe(self, latency: float) -> None:
+        if self._average is None:
+            self._average = latency
+        else:
+            self._average += 0.1 * (latency - self._average)
+        if self.latency_target is None:
+            if self._baseline is None or latency < self._baseline:
+                self._baseline = latency
+            else:
+                self._baseline += 0.001 * (self._average - self._baseline)
+
+
+class AsyncioConsumerApplication(AsyncioGracefulApplication):
+    #: if set, a coroutine method handling a batch of items, enables batching
+    handle_batch: Optional[Callable[[Sequence[Any]], Awaitable[None]]] = None
+
+    """
+    An application consuming items from a :class:`Source`, handling them concurrently
+    up to a limit adjusted by an :class:`AdaptiveLimiter`.
+
+    If :attr:`handle_batch` is defined, up to *batch_size* items are fetched and
+    handled at a time, each batch occupying a single concurrency slot. Otherwise each
+    item is passed to :meth:`handle`.
+
+    On termination, no further items are fetched and items in flight are handled before
+    the application exits, for up to *shutdown_timeout* seconds.
+    """
+
+    def __init__(
+        self,
+        source: Source,
+        limiter: Optional[AdaptiveLimiter] = None,
+        batch_size: int = 100,
+        shutdown_timeout: Optional[float] = 30.0,
+    ) -> None:
+        """
+        :param source: The source to consume items from.
+        :param limiter: Concurrency limiter, defaults to an :class:`AdaptiveLimiter`.
+        :param batch_size: Maximum number of items per batch when batching.
+        :param shutdown_timeout: Maximum number of seconds to wait for items in flight
+            on termination.
+        """
+        super().__init__()
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self.source = source
+        self.limiter = limiter or AdaptiveLimiter()
+        self.batch_size = batch_size
+        self.shutdown_timeout = shutdown_timeout
+        self._producer: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self._stopping = False
+        self._closing: Optional[asyncio.Future] = None
+
+    @abstractmethod
+    async def handle(self, item: Any) -> None:
+        """
+        Handle a single item.
+        """
+        raise NotImplementedError
+
+    @property
+    def batching(self) -> bool:
+        return self.handle_batch is not None
+
+    def shutdown_phases(self) -> Sequence[ShutdownPhase]:
+        return (self.stop,)
+
+    async def main(self) -> None:
+        self._stopping = False
+        self._closing = None
+        self._producer = asyncio.ensure_future(self._produce())
+        try:
+            await self._producer
+        except asyncio.CancelledError:
+            if not self._stopping:
+                self._producer.cancel()
+                raise
+        await self._close()
+
+    async def stop(self) -> None:
+        """
+        Stop fetching items, wait for items in flight to be handled and close the
+        source.
+        """
+        self._stopping = True
+        if self._producer is not None:
+            self._producer.cancel()
+        await self._close()
+
+    async def _close(self) -> None:
+        await self._drain()
+        if self._closing is None:
+            self._closing = asyncio.ensure_future(self.source.close())
+        # the source is closed once, even if the main task is cancelled meanwhile
+        await asyncio.shield(self._closing)
+
+    async def _drain(self) -> None:
+        while self._in_flight:
+            await asyncio.wait(set(self._in_flight))
+
+    async def _produce(self) -> None:
+        batching = self.batching
+        while not self._stopping:
+            await self.limiter.acquire()
+            try:
+                limit = self.batch_size if batching else 1 + self.limiter.available
+                items = await self.source.fetch(limit)
+            except BaseException:
+                self.limiter.cancel()
+                raise
+            if not items:
+                self.limiter.cancel()
+                self.logger.debug("Source exhausted")
+                return
+
+            if batching:
+                self._spawn(items, True)
+                continue
+            self._spawn(items[:1], False)
+            for item in items[1:]:
+                # slots were available when fetching, unless the limit decreased since
+                self._spawn([item], False, self.limiter.acquire_nowait())
+
+    def _spawn(self, items: Sequence[Any], batch: bool, reserved: bool = True) -> None:
+        task = asyncio.ensure_future(self._process(items, batch, reserved))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _process(
+        self, items: Sequence[Any], batch: bool, reserved: bool = True
+    ) -> None:
+        if not reserved:
+            await self.limiter.acquire()
+        started = time.monotonic()
+        error: Optional[BaseException] = None
+        try:
+            if batch:
+                await self.handle_batch(items)
+            else:
+                await self.handle(items[0])
+        except Exception as e:
+            error = e
+            self.logger.exception("Failed to handle %d items", len(items))
+        finally:
+            self.limiter.release(time.monotonic() - started, error is not None)
+        await self.source.acknowledge(items, error)
@@ -0,0 +1,216 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+Call = Tuple[Tuple[Any, ...], Dict[str, Any]]
+Deliver = Callable[[Any, Tuple[Any, ...], Dict[str, Any]], None]
+
+
+def last(calls: List[Call]) -> Call:
+    """
+    Merge function for :class:`Coalesce`, keeping only the most recent arguments.
+    """
+    return calls[-1]
+
+
+def accumulate(calls: List[Call]) -> Call:
+    """
+    Merge function for :class:`Coalesce`, triggering callbacks with a single positional
+    argument containing the list of `(args, kwargs)` of all coalesced dispatches.
+    """
+    return (calls,), dict()
+
+
+class _State:
+    __slots__ = ("deliver", "timer", "pending", "calls")
+
+    def __init__(self, deliver: Deliver) -> None:
+        self.deliver = deliver
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.pending: Optional[Call] = None
+        self.calls: List[Call] = []
+
+
+class DispatchPolicy(ABC):
+    """
+    Base class for policies controlling when, and with which arguments, events
+    dispatched via :meth:`cafeteria.asyncio.callbacks.CallbackRegistry.dispatch` are
+    delivered to callbacks. Policies are implemented using event loop timers, no tasks
+    are created per event.
+    """
+
+    def __init__(self, key: Optional[Callable[..., Hashable]] = None) -> None:
+        """
+        :param key: If specified, called with the dispatch arguments to partition
+            events, the policy is applied independently for each key.
+        """
+        self.key = key
+        self._states: Dict[Tuple[Any, Hashable], _State] = dict()
+
+    def submit(
+        self,
+        event_type: Any,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        deliver: Deliver,
+    ) -> None:
+        """
+        Submit a dispatched event to this policy. Without a running event loop, events
+        are delivered immediately.
+
+        :param event_type: The dispatched event type.
+        :param args: Positional arguments the event was dispatched with.
+        :param kwargs: Keyword arguments the event was dispatched with.
+        :param deliver: Called with the event type, positional and keyword arguments to
+            trigger callbacks.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            deliver(event_type, args, kwargs)
+            return
+
+        key = (event_type, None if self.key is None else self.key(*args, **kwargs))
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _State(deliver)
+        self._submit(loop, key, state, (args, kwargs))
+
+    @abstractmethod
+    def _submit(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        key: Tuple[Any, Hashable],
+        state: _State,
+        call: Call,
+    ) -> None:
+        raise NotImplementedError
+
+    def _deliver(self, key: Tuple[Any, Hashable], state: _State, call: Call) -> None:
+        state.deliver(key[0], *call)
+
+    def _pending(self, state: _State) -> Optional[Call]:
+        return state.pending
+
+    def flush(self) -> None:
+        """
+        Deliver all pending events immediately.
+        """
+        states, self._states = self._states, dict()
+        for key, state in states.items():
+            if state.timer is not None:
+                state.timer.cancel()
+            call = self._pending(state)
+            if call is not None:
+                self._deliver(key, state, call)
+
+    def cancel(self) -> None:
+        """
+        Discard all pending events.
+        """
+        states, self._states = self._states, dict()
+        for state in states.values():
+            if state.timer is not None:
+                state.timer.cancel()
+
+
+class Debounce(DispatchPolicy):
+    """
+    Deliver an event only once no further events have been dispatched for *delay*
+    seconds, using the most recent arguments (trailing). If *leading* is `True`, the
+    first event of a burst is delivered immediately and the rest of the burst dropped.
+    """
+
+    def __init__(
+        self,
+        delay: float,
+        leading: bool = False,
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> None:
+        super().__init__(key=key)
+        self.delay = delay
+        self.leading = leading
+
+    def _submit(self, loop, key, state, call) -> None:
+        if state.timer is None:
+            if self.leading:
+                self._deliver(key, state, call)
+        else:
+            state.timer.cancel()
+
+        if not self.leading:
+            state.pending = call
+        state.timer = loop.call_later(self.delay, self._expire, key)
+
+    def _expire(self, key: Tuple[Any, Hashable]) -> None:
+        state = self._states.pop(key)
+        if state.pending is not None:
+            self._deliver(key, state, state.pending)
+
+
+class Throttle(DispatchPolicy):
+    """
+    Deliver at most *rate* events every *per* seconds. Events exceeding the rate are
+    dropped, except for the most recent which is delivered once allowed if *trailing*
+    is `True`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        per: float = 1.0,
+        trailing: bool = True,
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        super().__init__(key=key)
+        self.interval = per / rate
+        self.trailing = trailing
+
+    def _submit(self, loop, key, state, call) -> None:
+        if state.timer is None:
+            self._deliver(key, state, call)
+            state.timer = loop.call_later(self.interval, self._expire, key)
+        elif self.trailing:
+            state.pending = call
+
+    def _expire(self, key: Tuple[Any, Hashable]) -> None:
+        state = self._states[key]
+        call, state.pending = state.pending, None
+        if call is None:
+            del self._states[key]
+            return
+        self._deliver(key, state, call)
+        state.timer = asyncio.get_running_loop().call_later(
+            self.interval, self._expire, key
+        )
+
+
+class Coalesce(DispatchPolicy):
+    """
+    Collect events dispatched within *delay* seconds of the first one and deliver them
+    as a single event, with arguments produced by *merge*.
+    """
+
+    def __init__(
+        self,
+        delay: float,
+        merge: Callable[[List[Call]], Call] = last,
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> None:
+        super().__init__(key=key)
+        self.delay = delay
+        self.merge = merge
+
+    def _submit(self, loop, key, state, call) -> None:
+        state.calls.append(call)
+        if state.timer is None:
+            state.timer = loop.call_later(self.delay, self._expire, key)
+
+    def _pending(self, state: _State) -> Optional[Call]:
+        return self.merge(state.calls) if state.calls else None
+
+    def _expire(self, key: Tuple[Any, Hashable]) -> None:
+        state = self._states.pop(key)
+        self._deliver(key, state, self.merge(state.calls))
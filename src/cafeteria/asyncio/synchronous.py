@@ -1,15 +1,166 @@
 import asyncio
-from asyncio import Task
-from typing import Any, Coroutine, Union
+import atexit
+import concurrent.futures
+import threading
+from asyncio import AbstractEventLoop, Task
+from typing import Any, Callable, Coroutine, Iterable, List, Optional, Union
+
+from cafeteria.asyncio.commons import cancel_all_tasks
+from cafeteria.logging import LoggedObject
+
+
+class AsyncioBridge(LoggedObject):
+    """
+    A bridge allowing synchronous code to execute coroutines on a single, long-lived
+    event loop running in a background thread. The loop is started lazily on first use
+    and all methods are safe to call from any number of threads.
+    """
+
+    def __init__(self, name: str = "asyncio-bridge") -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loop(self) -> AbstractEventLoop:
+        """
+        The event loop owned by this bridge, started if not already running.
+        """
+        loop = self._loop
+        if loop is None:
+            with self._lock:
+                if self._loop is None:
+                    self._start()
+                loop = self._loop
+        return loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            try:
+                loop.run_forever()
+            finally:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+
+    def submit(self, coroutine: Coroutine) -> concurrent.futures.Future:
+        """
+        Schedule *coroutine* for execution on the bridge's event loop.
+
+        :param coroutine: The coroutine to execute.
+        :return: A future resolving to the result of the coroutine.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Execute *coroutine* on the bridge's event loop and wait for its result.
+
+        :param coroutine: The coroutine to execute.
+        :param timeout: If specified, the maximum number of seconds to wait for, the
+            coroutine is cancelled if it does not complete in time.
+        :return: The result of the coroutine.
+        """
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("Cannot wait for a coroutine from the bridge's own loop")
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def map(
+        self,
+        function: Callable[..., Coroutine],
+        *iterables: Iterable[Any],
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """
+        Execute *function* for each set of arguments taken from *iterables*
+        concurrently on the bridge's event loop, as a single submission, and wait for
+        all results.
+
+        :param function: A coroutine function.
+        :param iterables: Iterables providing positional arguments to *function*.
+        :param timeout: If specified, the maximum number of seconds to wait for, all
+            pending executions are cancelled if they do not complete in time.
+        :return: Results in the order of the arguments.
+        """
+
+        async def gather() -> List[Any]:
+            return list(await asyncio.gather(*map(function, *iterables)))
+
+        return self.run(gather(), timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Cancel any outstanding tasks, stop the event loop and wait for the background
+        thread to exit. The bridge is started again if used after closing.
+
+        :param timeout: If specified, the maximum number of seconds to wait for
+            cancelled tasks to complete.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None:
+                return
+            self._loop = self._thread = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(
+                cancel_all_tasks(timeout=timeout), loop
+            ).result()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+
+    def __enter__(self) -> "AsyncioBridge":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+_default_bridge: Optional[AsyncioBridge] = None
+_default_bridge_lock = threading.Lock()
+
+
+def default_bridge() -> AsyncioBridge:
+    """
+    Retrieve the process wide :class:`AsyncioBridge`, closed automatically on exit.
+    """
+    global _default_bridge
+    if _default_bridge is None:
+        with _default_bridge_lock:
+            if _default_bridge is None:
+                _default_bridge = AsyncioBridge()
+                atexit.register(_default_bridge.close)
+    return _default_bridge
 
 
 def execute_async_method(coroutine: Coroutine) -> Union[Any, Task]:
+    """
+    Execute a coroutine from either synchronous or asynchronous code. If called from
+    a running event loop, a task is created and returned. Otherwise, the coroutine is
+    executed on the :func:`default_bridge` and its result returned.
+
+    :param coroutine: The coroutine to execute.
+    :return: The created task or the result of the coroutine.
+    """
     try:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
     except RuntimeError:
-        loop = asyncio.new_event_loop()
-
-    if loop.is_running():
-        return loop.create_task(coroutine)
-    else:
-        return loop.run_until_complete(coroutine)
+        return default_bridge().run(coroutine)
+    return loop.create_task(coroutine)
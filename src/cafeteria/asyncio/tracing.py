@@ -0,0 +1,168 @@
+import contextvars
+import logging
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Optional
+
+from cafeteria.asyncio.instrumentation import callback_name
+
+# the span of the dispatch or callback being executed in the current context
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar(
+    "cafeteria_asyncio_span", default=None
+)
+
+
+class SpanKind(Enum):
+    #: an event dispatched to a registry, ends once all triggered callbacks complete
+    DISPATCH = "dispatch"
+    #: a callback triggered for a dispatched event
+    CALLBACK = "callback"
+
+
+class Span:
+    """
+    Timing of a dispatch, or of a callback triggered by one, reported to a
+    :class:`Tracer`. Spans of callbacks are children of the span of the dispatch that
+    triggered them, and spans of events dispatched by a callback are children of the
+    callback span.
+    """
+
+    __slots__ = (
+        "kind",
+        "event_type",
+        "callback",
+        "parent",
+        "started",
+        "queued",
+        "duration",
+        "failed",
+        "data",
+        "_pending",
+        "_sealed",
+    )
+
+    def __init__(
+        self,
+        kind: SpanKind,
+        event_type: Any,
+        callback: Any = None,
+        parent: Optional["Span"] = None,
+    ) -> None:
+        self.kind = kind
+        self.event_type = event_type
+        self.callback = callback
+        self.parent = parent
+        #: :func:`time.perf_counter` value when the span started
+        self.started = time.perf_counter()
+        #: seconds between the span starting and execution starting, for a dispatch
+        #: this is the time spent in a registry queue if any
+        self.queued = 0.0
+        #: seconds spent executing, for a dispatch until all callbacks completed
+        self.duration = 0.0
+        self.failed = False
+        #: available to tracers, for example to hold a span of a tracing library
+        self.data: Any = None
+        # callbacks of a dispatch that have not completed, and whether all callbacks
+        # have been triggered
+        self._pending = 0
+        self._sealed = False
+
+    @property
+    def name(self) -> str:
+        if self.kind is SpanKind.DISPATCH:
+            return f"dispatch {self.event_type}"
+        return f"callback {callback_name(self.callback)}"
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self.name!r}, queued={self.queued:.6f}, "
+            f"duration={self.duration:.6f}, failed={self.failed})"
+        )
+
+
+def current_span() -> Optional[Span]:
+    """
+    :return: The span of the dispatch or callback being executed, if traced. This is
+        propagated to callback tasks and executor threads.
+    """
+    return _current_span.get()
+
+
+class Tracer(ABC):
+    """
+    Receives spans from a traced :class:`cafeteria.asyncio.callbacks.CallbackRegistry`.
+    Implement this to export spans to a tracing system. Methods are called on the event
+    loop, and should return quickly.
+    """
+
+    @abstractmethod
+    def on_start(self, span: Span) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def on_end(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def _start(self, kind: SpanKind, event_type: Any, callback: Any = None) -> Span:
+        parent = _current_span.get()
+        span = Span(kind, event_type, callback, parent)
+        if parent is not None and parent.kind is SpanKind.DISPATCH:
+            parent._pending += 1
+        self.on_start(span)
+        return span
+
+    def _end(self, span: Span) -> None:
+        self.on_end(span)
+        parent = span.parent
+        if parent is not None and parent.kind is SpanKind.DISPATCH:
+            parent.failed = parent.failed or span.failed
+            parent._pending -= 1
+            if parent._sealed and not parent._pending:
+                self._end_dispatch(parent)
+
+    def _seal(self, span: Span) -> None:
+        """
+        Mark all callbacks of a dispatch span as triggered, ending it once they have
+        completed.
+        """
+        span._sealed = True
+        if not span._pending:
+            self._end_dispatch(span)
+
+    def _end_dispatch(self, span: Span) -> None:
+        span.duration = time.perf_counter() - span.started - span.queued
+        self._end(span)
+
+
+class LoggingTracer(Tracer):
+    """
+    Log spans taking longer than *threshold* seconds in total, or all spans if not
+    specified.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.DEBUG,
+        threshold: Optional[float] = None,
+    ) -> None:
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+        self.threshold = threshold
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        if self.threshold is not None and span.queued + span.duration < self.threshold:
+            return
+        self.logger.log(
+            self.level,
+            "%s%s %s after %.6fs queued, %.6fs executing",
+            span.name,
+            "" if span.parent is None else f" (in {span.parent.name})",
+            "failed" if span.failed else "completed",
+            span.queued,
+            span.duration,
+        )
@@ -0,0 +1,93 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import threading
+from pathlib import Path
+
+from cafeteria.asyncio.patterns.application import AsyncioWorkerProcessApplication
+
+
+class RecordingApplication(AsyncioWorkerProcessApplication):
+    def __init__(self, directory: Path, crashes: int = 0, forever: bool = False):
+        super().__init__(
+            workers=2,
+            start_method="fork",
+            restart_backoff=0.01,
+            shutdown_timeout=5,
+            supervisor_check_interval=0.05,
+        )
+        self.directory = directory
+        self.crashes = crashes
+        self.forever = forever
+
+    async def main(self, worker_index: int, worker_count: int):
+        attempts = self.directory / f"attempts-{worker_index}"
+        with attempts.open("a") as f:
+            f.write(".")
+        if len(attempts.read_text()) <= self.crashes:
+            raise RuntimeError("crashed")
+
+        (self.directory / f"worker-{worker_index}").write_text(
+            f"{worker_index}/{worker_count}"
+        )
+        if self.forever:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                (self.directory / f"cancelled-{worker_index}").touch()
+                raise
+
+
+def test_worker_process_application(tmp_path):
+    assert RecordingApplication(tmp_path).run() == [0, 0]
+    assert (tmp_path / "worker-0").read_text() == "0/2"
+    assert (tmp_path / "worker-1").read_text() == "1/2"
+
+
+def test_worker_process_application_restart(tmp_path):
+    assert RecordingApplication(tmp_path, crashes=2).run() == [0, 0]
+    assert (tmp_path / "attempts-0").read_text() == "..."
+    assert (tmp_path / "attempts-1").read_text() == "..."
+
+
+def test_worker_process_application_terminate(tmp_path):
+    def terminate_when_ready():
+        for _ in range(500):
+            if all((tmp_path / f"worker-{i}").exists() for i in range(2)):
+                break
+            threading.Event().wait(0.01)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    thread = threading.Thread(target=terminate_when_ready)
+    thread.start()
+    try:
+        assert RecordingApplication(tmp_path, forever=True).run() == [0, 0]
+    finally:
+        thread.join()
+
+    assert (tmp_path / "cancelled-0").exists()
+    assert (tmp_path / "cancelled-1").exists()
+    assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
+
+
+def test_worker_process_application_supervisor_killed(tmp_path):
+    def ready(name):
+        for _ in range(500):
+            if all((tmp_path / f"{name}-{i}").exists() for i in range(2)):
+                return True
+            threading.Event().wait(0.01)
+        return False
+
+    supervisor = multiprocessing.get_context("fork").Process(
+        target=RecordingApplication(tmp_path, forever=True).run
+    )
+    supervisor.start()
+    try:
+        assert ready("worker")
+    finally:
+        supervisor.kill()
+        supervisor.join()
+
+    # orphaned workers stop gracefully instead of running forever
+    assert ready("cancelled")
@@ -0,0 +1,226 @@
+import asyncio
+import threading
+
+import pytest
+
+from cafeteria.asyncio.breakers import BreakerState, CircuitBreaker
+from cafeteria.asyncio.callbacks import CallbackRegistry
+from cafeteria.asyncio.executors import ProcessPoolStrategy
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [0.0]
+    mocker.patch("cafeteria.asyncio.breakers.time.monotonic", lambda: now[0])
+    return now
+
+
+def test_circuit_breaker_states(clock):
+    breaker = CircuitBreaker(
+        failure_rate=0.5, window=4, minimum_calls=4, reset_timeout=10
+    )
+    for failed in (False, True, False):
+        assert breaker.acquire()
+        breaker.release(0.1, failed)
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.observed_failure_rate == pytest.approx(1 / 3)
+
+    assert breaker.acquire()
+    breaker.release(0.1, True)
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.acquire()
+    assert breaker.rejected == 1
+
+    clock[0] = 10
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert breaker.acquire()
+    # only a single trial call is allowed
+    assert not breaker.acquire()
+    breaker.release(0.1, True)
+    assert breaker.state is BreakerState.OPEN
+
+    clock[0] = 20
+    assert breaker.acquire()
+    breaker.release(0.1, False)
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.observed_failure_rate == 0
+
+
+def test_circuit_breaker_window(clock):
+    breaker = CircuitBreaker(failure_rate=0.5, window=4, minimum_calls=2)
+    for failed in (True, False, False, False, False, True):
+        assert breaker.acquire()
+        breaker.release(0.1, failed)
+    # the first failure dropped out of the window
+    assert breaker.observed_failure_rate == 0.25
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_circuit_breaker_slow_calls_and_concurrency(clock):
+    breaker = CircuitBreaker(
+        window=2, minimum_calls=2, slow_call_duration=1, max_concurrency=2
+    )
+    assert breaker.acquire()
+    assert breaker.acquire()
+    assert not breaker.acquire()
+    assert breaker.in_flight == 2
+    assert breaker.state is BreakerState.CLOSED
+
+    breaker.release(0.5, False)
+    breaker.release(1.5, False)
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.copy().state is BreakerState.CLOSED
+
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_rate=0)
+    with pytest.raises(ValueError):
+        CircuitBreaker(window=5, minimum_calls=10)
+
+
+@pytest.mark.asyncio
+async def test_registry_circuit_breaker(mocker, caplog):
+    fallback = mocker.Mock()
+    healthy = mocker.Mock()
+
+    def sick(_):
+        raise ConnectionError("unavailable")
+
+    registry = CallbackRegistry(callbacks={"event": healthy})
+    registry.register(
+        "event",
+        sick,
+        circuit_breaker=CircuitBreaker(
+            window=2, minimum_calls=2, reset_timeout=60, fallback=fallback
+        ),
+    )
+    breaker = registry.circuit_breaker(sick)
+    assert registry.circuit_breaker(healthy) is None
+
+    for i in range(2):
+        registry.dispatch("event", i)
+        await registry.drain()
+    assert breaker.state is BreakerState.OPEN
+    # executor exceptions are observed and logged
+    assert "Callback Callback(function=<function" in caplog.text
+    assert "ConnectionError: unavailable" in caplog.text
+    fallback.assert_not_called()
+
+    registry.dispatch("event", 2)
+    await registry.drain()
+    fallback.assert_called_once_with(2)
+    assert healthy.call_count == 3
+
+    results = await registry.dispatch_and_wait("event", args=(3,))
+    assert results == [healthy.return_value, fallback.return_value]
+    fallback.assert_called_with(3)
+
+    registry.deregister("event", sick)
+    assert registry.circuit_breaker(sick) is None
+    assert registry._breakers == {}
+
+
+@pytest.mark.asyncio
+async def test_registry_circuit_breaker_default_concurrency():
+    release = asyncio.Event()
+    started = []
+
+    async def slow(value):
+        started.append(value)
+        await release.wait()
+
+    async def other(value):
+        started.append(-value)
+
+    registry = CallbackRegistry(circuit_breaker=CircuitBreaker(max_concurrency=2))
+    registry.register("event", slow)
+    registry.register("event", other)
+    assert registry.circuit_breaker(slow) is not registry.circuit_breaker(other)
+
+    for i in range(1, 5):
+        registry.dispatch("event", i)
+        await asyncio.sleep(0)
+    assert sorted(started) == [-4, -3, -2, -1, 1, 2]
+    assert registry.circuit_breaker(slow).rejected == 2
+
+    release.set()
+    await registry.drain()
+    assert registry.circuit_breaker(slow).in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_registry_circuit_breaker_cancelled():
+    async def slow():
+        await asyncio.sleep(10)
+
+    registry = CallbackRegistry()
+    registry.register(
+        "event",
+        slow,
+        circuit_breaker=CircuitBreaker(window=1, minimum_calls=1),
+    )
+    breaker = registry.circuit_breaker(slow)
+
+    # timed out calls are cancelled, and count as failed
+    with pytest.raises(asyncio.TimeoutError):
+        await registry.dispatch_and_wait("event", timeout=0.01)
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_registry_circuit_breaker_executor_cancelled():
+    release = threading.Event()
+
+    def blocking():
+        release.wait(5)
+
+    registry = CallbackRegistry()
+    registry.register(
+        "event", blocking, circuit_breaker=CircuitBreaker(max_concurrency=1)
+    )
+    breaker = registry.circuit_breaker(blocking)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await registry.dispatch_and_wait("event", timeout=0.01)
+    # the executor keeps running the call, so it keeps its slot
+    assert breaker.in_flight == 1
+    registry.dispatch("event")
+    assert breaker.rejected == 1
+
+    release.set()
+    for _ in range(100):
+        if not breaker.in_flight:
+            break
+        await asyncio.sleep(0.01)
+    assert breaker.in_flight == 0
+    assert breaker.observed_failure_rate == 1
+
+
+@pytest.mark.asyncio
+async def test_registry_circuit_breaker_process_pool():
+    strategy = ProcessPoolStrategy(max_workers=1)
+    registry = CallbackRegistry(strategy=strategy)
+    registry.register("event", abs, circuit_breaker=CircuitBreaker())
+    try:
+        assert await registry.dispatch_and_wait("event", (-4,)) == [4]
+    finally:
+        strategy.shutdown()
+    assert registry.circuit_breaker(abs).in_flight == 0
+
+
+def test_registry_circuit_breaker_shared_registrations(mocker):
+    handler = mocker.Mock()
+    breaker = CircuitBreaker()
+    registry = CallbackRegistry()
+    registry.register("a", handler)
+    registry.register("b", handler, circuit_breaker=breaker)
+    registry.register("c", handler)
+
+    # the breaker is kept until every registration of the handler is removed
+    registry.deregister("a", handler)
+    assert registry.circuit_breaker(handler) is breaker
+    registry.deregister("b", handler)
+    assert registry.circuit_breaker(handler) is breaker
+    registry.deregister("c", handler)
+    assert registry.circuit_breaker(handler) is None
+    assert registry._breakers == {}
@@ -0,0 +1,413 @@
+import asyncio
+import threading
+
+import pytest
+
+from cafeteria.asyncio.breakers import BreakerState, CircuitBreaker
+from cafeteria.asyncio.bus import (
+    BatchCallback,
+    Event,
+    OverflowPolicy,
+    QueuedCallbackRegistry,
+    Subscription,
+)
+from cafeteria.asyncio.callbacks import CallbackRegistry
+from cafeteria.asyncio.instrumentation import InMemorySink
+from cafeteria.asyncio.matching import Wildcard
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_delivery(mocker):
+    m = mocker.Mock()
+    registry = QueuedCallbackRegistry(callbacks={"event": m})
+
+    registry.dispatch("event", "one")
+    await registry.publish("event", "two")
+    m.assert_not_called()
+    assert registry.queued == 2
+
+    async with registry:
+        pass
+
+    assert m.call_args_list == [mocker.call("one"), mocker.call("two")]
+    assert registry.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_workers_bound_concurrency():
+    running = 0
+    peak = 0
+
+    async def handler():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    registry = QueuedCallbackRegistry(callbacks={"event": handler}, workers=2)
+    async with registry:
+        for _ in range(6):
+            await registry.publish("event")
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "overflow,expected",
+    [(OverflowPolicy.DROP_OLDEST, [2, 3]), (OverflowPolicy.DROP_NEWEST, [1, 2])],
+)
+async def test_queued_registry_overflow_drop(overflow, expected):
+    received = []
+    registry = QueuedCallbackRegistry(
+        callbacks={"event": received.append}, maxsize=2, overflow=overflow
+    )
+
+    for i in (1, 2, 3):
+        registry.dispatch("event", i)
+    assert registry.dropped == 1
+
+    async with registry:
+        pass
+    assert received == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overflow", [OverflowPolicy.RAISE, OverflowPolicy.BLOCK])
+async def test_queued_registry_overflow_raise(overflow):
+    registry = QueuedCallbackRegistry(maxsize=1, overflow=overflow)
+    registry.dispatch("event")
+    with pytest.raises(asyncio.QueueFull):
+        registry.dispatch("event")
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_overflow_block():
+    registry = QueuedCallbackRegistry(maxsize=1)
+    registry.dispatch("event")
+
+    publish = asyncio.ensure_future(registry.publish("event"))
+    await asyncio.sleep(0)
+    assert not publish.done()
+
+    registry.start()
+    await asyncio.wait_for(publish, 1)
+    assert await registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_partitioned(mocker):
+    registry = QueuedCallbackRegistry(
+        callbacks={"one": mocker.Mock(), "two": mocker.Mock()},
+        maxsize=1,
+        overflow=OverflowPolicy.RAISE,
+        partition_by_event_type=True,
+    )
+    registry.dispatch("one")
+    registry.dispatch("two")
+    assert registry.queued == 2
+    await registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_batch_size():
+    batches = []
+    registry = QueuedCallbackRegistry(
+        callbacks={"event": BatchCallback(batches.append, max_batch=2, max_delay=10)}
+    )
+
+    async with registry:
+        for i in range(5):
+            await registry.publish("event", i, key=i)
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][0] == Event("event", (0,), {"key": 0})
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_batch_delay():
+    batches = []
+    registry = QueuedCallbackRegistry(
+        callbacks={"event": BatchCallback(batches.append, max_batch=10, max_delay=0.01)}
+    )
+    registry.start()
+    await registry.publish("event", 1)
+    await registry.publish("event", 2)
+
+    await asyncio.sleep(0.05)
+    assert [[event.args for event in batch] for batch in batches] == [[(1,), (2,)]]
+    await registry.stop()
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_stop_without_drain_discards_batches():
+    batches = []
+    registry = QueuedCallbackRegistry(
+        callbacks={"event": BatchCallback(batches.append, max_batch=10, max_delay=0.01)}
+    )
+    registry.start()
+    await registry.publish("event", 1)
+    await asyncio.sleep(0)
+
+    await registry.stop(drain=False)
+    await asyncio.sleep(0.05)
+    assert batches == []
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_callback_failure(caplog):
+    async def failing():
+        raise KeyError("failed")
+
+    registry = QueuedCallbackRegistry(callbacks={"event": failing})
+    async with registry:
+        registry.dispatch("event")
+    assert "Callback failed handling event event" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_instrumentation():
+    sink = InMemorySink()
+
+    async def handler():
+        pass
+
+    async with QueuedCallbackRegistry(
+        callbacks={"event": handler}, instrumentation=sink
+    ) as registry:
+        registry.dispatch("event")
+        registry.dispatch("event")
+
+    snapshot = sink.snapshot()
+    assert snapshot["dispatches"] == {"event": 2}
+    assert [record["calls"] for record in snapshot["callbacks"].values()] == [2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("eager,expected", [(True, ["eager"]), (False, [])])
+async def test_queued_registry_eager(eager, expected):
+    calls = []
+
+    async def handler():
+        calls.append("eager")
+
+    async with QueuedCallbackRegistry(
+        callbacks={"event": handler}, eager=eager
+    ) as registry:
+        registry.dispatch("event")
+        # the worker takes the event, eager callbacks complete without a task
+        await asyncio.sleep(0)
+        assert calls == expected
+    assert calls == ["eager"]
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_loop(mocker):
+    m = mocker.Mock()
+    registry = QueuedCallbackRegistry(
+        callbacks={"event": m}, loop=asyncio.get_running_loop()
+    )
+
+    def produce():
+        for i in range(3):
+            registry.dispatch("event", i)
+
+    async with registry:
+        thread = threading.Thread(target=produce)
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+    assert m.call_args_list == [mocker.call(i) for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_circuit_breaker(mocker):
+    fallback = mocker.Mock()
+
+    async def sick(_):
+        raise ConnectionError("unavailable")
+
+    registry = QueuedCallbackRegistry(
+        callbacks={"event": sick},
+        circuit_breaker=CircuitBreaker(
+            window=2, minimum_calls=2, reset_timeout=60, fallback=fallback
+        ),
+    )
+    async with registry:
+        for i in range(3):
+            registry.dispatch("event", i)
+
+    assert registry.circuit_breaker(sick).state is BreakerState.OPEN
+    fallback.assert_called_once_with(2)
+
+
+def test_queued_registry_invalid_arguments():
+    with pytest.raises(ValueError):
+        QueuedCallbackRegistry(maxsize=0)
+    with pytest.raises(ValueError):
+        QueuedCallbackRegistry(workers=0)
+    with pytest.raises(ValueError):
+        BatchCallback(print, max_batch=0)
+
+
+@pytest.mark.asyncio
+async def test_subscription_iteration(mocker):
+    m = mocker.Mock()
+    registry = CallbackRegistry(callbacks={"order.created": m})
+    exact = registry.subscribe("order.created")
+    pattern = registry.subscribe(Wildcard("order.*"))
+    other = registry.subscribe("other")
+    assert isinstance(exact, Subscription)
+
+    registry.dispatch("order.created", 1, flag=True)
+    registry.dispatch("order.deleted", 2)
+    await registry.dispatch_and_wait("order.created", args=(3,))
+
+    assert len(exact) == 2
+    assert len(pattern) == 3
+    assert len(other) == 0
+    assert m.call_count == 2
+
+    first = await exact.get()
+    assert first == Event("order.created", (1,), {"flag": True})
+    # a single event instance is shared by all subscriptions
+    assert first is await pattern.get()
+
+    exact.close()
+    assert [event.args async for event in exact] == [(3,)]
+    registry.dispatch("order.created", 4)
+    assert len(exact) == 0
+    assert [event.args for event in list(pattern._buffer)] == [(2,), (3,), (4,)]
+
+    with pattern:
+        pass
+    assert registry._subscriptions == {"other": [other]}
+
+
+@pytest.mark.asyncio
+async def test_subscription_waits_for_events():
+    registry = CallbackRegistry()
+    subscription = registry.subscribe("event")
+
+    async def consume():
+        return [event.args async for event in subscription]
+
+    consumer = asyncio.ensure_future(consume())
+    await asyncio.sleep(0)
+    registry.dispatch("event", 1)
+    await asyncio.sleep(0)
+    registry.dispatch("event", 2)
+    subscription.close()
+
+    assert await asyncio.wait_for(consumer, 1) == [(1,), (2,)]
+
+
+@pytest.mark.asyncio
+async def test_subscription_batches():
+    registry = CallbackRegistry()
+    subscription = registry.subscribe("event")
+    for i in range(5):
+        registry.dispatch("event", i)
+
+    batches = subscription.batches(2)
+    assert [event.args for event in await batches.__anext__()] == [(0,), (1,)]
+    assert [event.args for event in await batches.__anext__()] == [(2,), (3,)]
+    assert [event.args for event in await batches.__anext__()] == [(4,)]
+
+    # waits up to the timeout for a batch to fill
+    timed = subscription.batches(3, timeout=0.05)
+    pending = asyncio.ensure_future(timed.__anext__())
+    await asyncio.sleep(0)
+    registry.dispatch("event", 5)
+    await asyncio.sleep(0.01)
+    registry.dispatch("event", 6)
+    await asyncio.sleep(0.01)
+    assert not pending.done()
+    assert [event.args for event in await pending] == [(5,), (6,)]
+
+    pending = asyncio.ensure_future(timed.__anext__())
+    await asyncio.sleep(0)
+    for i in range(3):
+        registry.dispatch("event", i)
+    assert len(await asyncio.wait_for(pending, 0.01)) == 3
+
+    subscription.close()
+    assert [batch async for batch in subscription.batches(2, timeout=1)] == []
+
+    with pytest.raises(ValueError):
+        await subscription.batches(0).__anext__()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "overflow, expected",
+    [
+        (OverflowPolicy.DROP_OLDEST, [(1,), (2,)]),
+        (OverflowPolicy.DROP_NEWEST, [(0,), (1,)]),
+    ],
+)
+async def test_subscription_overflow(overflow, expected):
+    registry = CallbackRegistry()
+    subscription = registry.subscribe("event", maxsize=2, overflow=overflow)
+    for i in range(3):
+        registry.dispatch("event", i)
+    assert subscription.dropped == 1
+    subscription.close()
+    assert [event.args async for event in subscription] == expected
+
+
+def test_subscription_overflow_raise():
+    registry = CallbackRegistry()
+    subscription = registry.subscribe("event", maxsize=1, overflow=OverflowPolicy.RAISE)
+    registry.dispatch("event", 1)
+    with pytest.raises(asyncio.QueueFull):
+        registry.dispatch("event", 2)
+
+    with pytest.raises(ValueError):
+        registry.subscribe("event", overflow=OverflowPolicy.BLOCK)
+    assert registry._subscriptions == {"event": [subscription]}
+
+
+@pytest.mark.asyncio
+async def test_subscription_overflow_raise_isolated():
+    calls = []
+    registry = CallbackRegistry(callbacks={"event": calls.append})
+    full = registry.subscribe("event", maxsize=1, overflow=OverflowPolicy.RAISE)
+    other = registry.subscribe("event")
+    registry.dispatch("event", 1)
+
+    # callbacks and other subscriptions still receive the event
+    with pytest.raises(asyncio.QueueFull):
+        registry.dispatch("event", 2)
+    with pytest.raises(asyncio.QueueFull):
+        await registry.dispatch_and_wait("event", (3,))
+    await asyncio.sleep(0)
+    assert calls == [1, 2, 3]
+    assert len(other) == 3
+    assert len(full) == 1
+
+
+@pytest.mark.asyncio
+async def test_queued_registry_subscription_overflow_raise(caplog):
+    calls = []
+    registry = QueuedCallbackRegistry(callbacks={"event": calls.append})
+    registry.subscribe("event", maxsize=1, overflow=OverflowPolicy.RAISE)
+    async with registry:
+        registry.dispatch("event", 1)
+        registry.dispatch("event", 2)
+
+    assert calls == [1, 2]
+    assert "Failed to publish event event" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_subscription_queued_registry():
+    registry = QueuedCallbackRegistry()
+    async with registry.subscribe("event") as subscription:
+        registry.dispatch("event", 1)
+        assert len(subscription) == 0
+        async with registry:
+            pass
+        assert (await subscription.get()).args == (1,)
+    assert subscription.closed
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from cafeteria.asyncio.caching import CachedCallback
+from cafeteria.asyncio.callbacks import Callback, CallbackRegistry
+
+
+class Lookup:
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        await self.release.wait()
+        return args
+
+
+def coroutine_function(lookup):
+    async def function(*args, **kwargs):
+        return await lookup(*args, **kwargs)
+
+    return function
+
+
+@pytest.mark.asyncio
+async def test_cached_callback_single_flight():
+    lookup = Lookup()
+    cb = CachedCallback(coroutine_function(lookup))
+
+    first = cb.trigger("key")
+    second = cb.trigger("key")
+    other = cb.trigger("other")
+
+    assert first is second
+    assert first is not other
+
+    lookup.release.set()
+    assert await first == ("key",)
+    assert await other == ("other",)
+    assert len(lookup.calls) == 2
+
+    # without memoization, completed calls are executed again
+    assert await cb.trigger("key") == ("key",)
+    assert len(lookup.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_callback_memoized():
+    lookup = Lookup()
+    lookup.release.set()
+    cb = CachedCallback(coroutine_function(lookup), maxsize=2)
+
+    assert await cb.trigger("a") == ("a",)
+    assert await cb.trigger("a") == ("a",)
+    assert await cb.trigger("a", flag=True) == ("a",)
+    assert len(lookup.calls) == 2
+
+    # least recently used entries are evicted
+    await cb.trigger("b")
+    await cb.trigger("a")
+    assert len(lookup.calls) == 4
+
+    cb.invalidate("b")
+    await cb.trigger("b")
+    assert len(lookup.calls) == 5
+
+    cb.clear()
+    await cb.trigger("b")
+    assert len(lookup.calls) == 6
+
+
+@pytest.mark.asyncio
+async def test_cached_callback_ttl():
+    lookup = Lookup()
+    lookup.release.set()
+    cb = CachedCallback(coroutine_function(lookup), maxsize=10, ttl=0.01)
+
+    await cb.trigger("a")
+    await cb.trigger("a")
+    assert len(lookup.calls) == 1
+
+    await asyncio.sleep(0.02)
+    await cb.trigger("a")
+    assert len(lookup.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_callback_failures_not_memoized():
+    calls = []
+
+    async def failing():
+        calls.append(True)
+        raise KeyError("failed")
+
+    cb = CachedCallback(failing, maxsize=10)
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            await cb.trigger()
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_callback_unhashable_arguments():
+    lookup = Lookup()
+    lookup.release.set()
+    cb = CachedCallback(coroutine_function(lookup), maxsize=10)
+
+    first = cb.trigger(["key"])
+    second = cb.trigger(["key"])
+    assert first is not second
+    await asyncio.gather(first, second)
+    assert len(lookup.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_callback_sync(mocker):
+    m = mocker.Mock(return_value="value")
+    cb = CachedCallback(m, maxsize=1)
+
+    assert await cb.trigger("a") == "value"
+    assert await cb.trigger("a") == "value"
+    m.assert_called_once_with("a")
+
+
+@pytest.mark.asyncio
+async def test_cached_callback_registry():
+    lookup = Lookup()
+    cb = CachedCallback(coroutine_function(lookup))
+    registry = CallbackRegistry(callbacks={"event": cb})
+
+    for _ in range(10):
+        registry.dispatch("event", "key")
+    assert registry.in_flight == {"event": 1}
+
+    lookup.release.set()
+    await registry.drain()
+    assert len(lookup.calls) == 1
+    assert registry.exists("event", Callback(cb.function)) is False
+    assert registry.exists("event", cb)
+
+
+def test_cached_callback_invalid_maxsize():
+    with pytest.raises(ValueError):
+        CachedCallback(print, maxsize=-1)
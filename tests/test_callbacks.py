@@ -1,9 +1,14 @@
 import asyncio
+import contextvars
+import gc
+import sys
+import weakref
 
 import pytest
 
 from cafeteria.asyncio.callbacks import (
     Callback,
+    LazyCallback,
     SimpleTriggerCallback,
     trigger_callback,
 )
@@ -55,3 +60,194 @@ async def test_trigger_callback_simple_trigger_callback(mocker):
 
     await result
     m.assert_called_once_with(*cb.args, **cb.kwargs)
+
+
+def test_callback_hash(mocker):
+    m = mocker.Mock()
+    assert hash(Callback(m, "foo", bar="baz")) == hash(Callback(m, "foo", bar="baz"))
+    assert hash(Callback(m, "foo")) != hash(Callback(m, "bar"))
+
+    # unhashable arguments fall back to hashing the function
+    assert hash(Callback(m, ["foo"])) == hash(Callback(m, ["foo"]))
+    assert Callback(m, ["foo"]) in {Callback(m, ["foo"])}
+
+
+def test_callback_compact(mocker):
+    m = mocker.Mock()
+    cb = Callback(m, "foo", bar="baz")
+    assert not hasattr(cb, "__dict__")
+    assert cb == Callback(m, "foo", bar="baz")
+    assert cb != Callback(m, "foo", bar="qux")
+    assert cb != SimpleTriggerCallback(m, "foo", bar="baz")
+    assert (
+        repr(cb) == f"Callback(function={m!r}, args=('foo',), kwargs={{'bar': 'baz'}})"
+    )
+
+
+def test_callback_weak_referenceable(mocker):
+    m = mocker.Mock()
+    cb = Callback(m, "foo")
+    lazy = LazyCallback("asyncio:sleep")
+    reference = weakref.ref(cb)
+    callbacks = weakref.WeakSet([cb, lazy])
+    keys = weakref.WeakKeyDictionary({cb: "callback"})
+
+    assert reference() is cb
+    assert len(callbacks) == 2
+    assert keys[cb] == "callback"
+
+    del cb
+    gc.collect()
+    assert reference() is None
+    assert list(callbacks) == [lazy]
+    assert len(keys) == 0
+
+
+@pytest.mark.asyncio
+async def test_callback_trigger_arguments(mocker):
+    received = []
+
+    async def handler(*args, **kwargs):
+        received.append((args, kwargs))
+
+    cb = Callback(handler, "default", key="default")
+    await cb.trigger()
+    await cb.trigger("first", key="override", extra=True)
+    await Callback(cb, "outer").trigger("first")
+    assert received == [
+        (("default",), {"key": "default"}),
+        (("first", "default"), {"key": "override", "extra": True}),
+        (("first", "outer", "default"), {"key": "default"}),
+    ]
+    # defaults are never modified by overrides
+    assert cb.kwargs == {"key": "default"}
+
+
+@pytest.mark.asyncio
+async def test_trigger_callback_eager_completes_synchronously():
+    calls = []
+
+    async def coroutine(value):
+        calls.append(value)
+        return value * 2
+
+    cb = Callback(coroutine, 2)
+    cb.eager = True
+    result = cb.trigger()
+
+    assert calls == [2]
+    assert result.done()
+    assert await result == 4
+
+
+@pytest.mark.asyncio
+async def test_trigger_callback_eager_suspends():
+    calls = []
+    release = asyncio.Event()
+
+    async def coroutine():
+        calls.append("started")
+        await release.wait()
+        calls.append("resumed")
+        await asyncio.sleep(0)
+        return "done"
+
+    cb = Callback(coroutine)
+    cb.eager = True
+    result = cb.trigger()
+
+    assert calls == ["started"]
+    assert isinstance(result, asyncio.Task)
+    assert not result.done()
+
+    release.set()
+    assert await result == "done"
+    assert calls == ["started", "resumed"]
+
+
+@pytest.mark.asyncio
+async def test_trigger_callback_eager_cancelled():
+    cancelled = []
+
+    async def coroutine():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    cb = Callback(coroutine)
+    cb.eager = True
+    result = cb.trigger()
+    result.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await result
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_trigger_callback_eager_exception():
+    async def coroutine():
+        raise KeyError("failed")
+
+    cb = Callback(coroutine)
+    cb.eager = True
+    result = cb.trigger()
+
+    assert result.done()
+    with pytest.raises(KeyError):
+        await result
+
+
+@pytest.mark.asyncio
+async def test_trigger_callback_eager_context_isolated():
+    variable = contextvars.ContextVar("variable", default="dispatcher")
+
+    async def coroutine():
+        variable.set("callback")
+        await asyncio.sleep(0)
+        return variable.get()
+
+    cb = Callback(coroutine)
+    cb.eager = True
+    result = cb.trigger()
+
+    assert variable.get() == "dispatcher"
+    assert await result == "callback"
+
+
+@pytest.mark.asyncio
+async def test_trigger_callback_eager_current_task():
+    dispatcher = asyncio.current_task()
+    tasks = []
+
+    async def coroutine():
+        tasks.append(asyncio.current_task())
+        await asyncio.sleep(0)
+        tasks.append(asyncio.current_task())
+
+    cb = Callback(coroutine)
+    cb.eager = True
+    result = cb.trigger()
+
+    assert asyncio.current_task() is dispatcher
+    await result
+    assert tasks == [result, result]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="requires asyncio.timeout")
+async def test_trigger_callback_eager_timeout():
+    async def coroutine():
+        async with asyncio.timeout(0.01):
+            await asyncio.sleep(10)
+
+    cb = Callback(coroutine)
+    cb.eager = True
+    result = cb.trigger()
+
+    with pytest.raises(TimeoutError):
+        await result
+    # the timeout cancels the callback task only, never the dispatcher
+    await asyncio.sleep(0.02)
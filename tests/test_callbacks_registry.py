@@ -1,6 +1,17 @@
+import asyncio
+import gc
+import sys
+import threading
+
 import pytest
 
-from cafeteria.asyncio.callbacks import Callback, CallbackRegistry
+from cafeteria.asyncio.callbacks import (
+    Callback,
+    CallbackRegistry,
+    LazyCallback,
+    SimpleTriggerCallback,
+    WeakCallback,
+)
 
 
 def test_callback_registry_simple(mocker):
@@ -138,3 +149,538 @@ async def test_callback_registry_handle_event(mocker):
     with pytest.warns(DeprecationWarning):
         await CallbackRegistry(callbacks={"one": callback}).handle_event("one", "one")
         callback.assert_called_once_with("one")
+
+
+def test_callback_registry_order_stable(mocker):
+    callbacks = [mocker.Mock() for _ in range(5)]
+    registry = CallbackRegistry(callbacks={"event": callbacks})
+
+    registry.deregister("event", callbacks[2])
+    registry.register("event", callbacks[2])
+
+    expected = [Callback(c) for c in callbacks[:2] + callbacks[3:] + [callbacks[2]]]
+    assert registry.callbacks("event") == expected
+
+
+def test_callback_registry_duplicate_registration(mocker):
+    callback = mocker.Mock()
+    registry = CallbackRegistry()
+    registry.register("one", callback)
+    registry.register("one", callback)
+
+    registry.dispatch("one")
+    assert callback.call_count == 2
+
+    registry.deregister("one", callback)
+    assert registry.exists("one", callback)
+    assert len(registry.callbacks("one")) == 1
+
+    registry.deregister("one", callback)
+    assert not registry.exists("one", callback)
+
+
+def test_callback_registry_callback_args_distinguished(mocker):
+    callback = mocker.Mock()
+    registry = CallbackRegistry()
+    registry.register("one", Callback(callback, "foo"))
+
+    assert registry.exists("one", Callback(callback, "foo"))
+    assert not registry.exists("one", Callback(callback, "bar"))
+    assert not registry.exists("one", callback)
+
+
+def test_callback_registry_plan_invalidated(mocker):
+    callback_one = mocker.Mock()
+    callback_two = mocker.Mock()
+    callback_default = mocker.Mock()
+    registry = CallbackRegistry(callbacks={"one": callback_one})
+
+    assert registry.callbacks("one") == [Callback(callback_one)]
+    assert registry.callbacks("two") == []
+
+    registry.register("one", callback_two)
+    registry.register(None, callback_default)
+    assert registry.callbacks("one") == [Callback(callback_one), Callback(callback_two)]
+    assert registry.callbacks("two") == [Callback(callback_default)]
+
+    # once all callbacks for an event type are removed, defaults apply
+    registry.deregister("one", callback_one)
+    registry.deregister("one", callback_two)
+    assert registry.callbacks("one") == [Callback(callback_default)]
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_dispatch_and_wait_results(mocker):
+    async def double(value):
+        await asyncio.sleep(0)
+        return value * 2
+
+    blocking = mocker.Mock(return_value="blocking")
+    registry = CallbackRegistry(callbacks={"event": [double, blocking]})
+
+    results = await registry.dispatch_and_wait("event", (2,))
+    assert results == [4, "blocking"]
+    blocking.assert_called_once_with(2)
+
+    assert await registry.dispatch_and_wait("unknown") == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("registry_limit,dispatch_limit", [(None, 2), (2, None)])
+async def test_callback_registry_dispatch_and_wait_concurrency(
+    registry_limit, dispatch_limit
+):
+    running = 0
+    peak = 0
+
+    async def handler(position):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return position
+
+    registry = CallbackRegistry(max_concurrency=registry_limit)
+    for i in range(6):
+        registry.register("event", Callback(handler, i))
+
+    results = await registry.dispatch_and_wait("event", concurrency=dispatch_limit)
+    assert results == list(range(6))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_dispatch_and_wait_registry_limit_tasks():
+    tasks = []
+
+    async def handler(_):
+        tasks.append(len(asyncio.all_tasks()))
+
+    registry = CallbackRegistry(max_concurrency=2)
+    for i in range(1000):
+        registry.register("event", Callback(handler, i))
+
+    baseline = len(asyncio.all_tasks())
+    await registry.dispatch_and_wait("event")
+    # callbacks and a worker task per allowed concurrent callback
+    assert max(tasks) <= baseline + 4
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_dispatch_and_wait_exceptions():
+    started = []
+
+    async def failing():
+        started.append("failing")
+        raise KeyError("failed")
+
+    async def succeeding():
+        started.append("succeeding")
+        return True
+
+    registry = CallbackRegistry(callbacks={"event": [failing, succeeding]})
+
+    results = await registry.dispatch_and_wait("event", return_exceptions=True)
+    assert isinstance(results[0], KeyError)
+    assert results[1] is True
+
+    started.clear()
+    with pytest.raises(KeyError):
+        await registry.dispatch_and_wait("event", concurrency=1)
+    assert started == ["failing"]
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_dispatch_and_wait_timeout():
+    async def slow():
+        await asyncio.sleep(10)
+
+    registry = CallbackRegistry(callbacks={"event": slow})
+
+    results = await registry.dispatch_and_wait(
+        "event", timeout=0.01, return_exceptions=True
+    )
+    assert isinstance(results[0], asyncio.TimeoutError)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await registry.dispatch_and_wait("event", timeout=0.01)
+
+
+def test_callback_registry_invalid_concurrency():
+    with pytest.raises(ValueError):
+        CallbackRegistry(max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_in_flight():
+    release = asyncio.Event()
+
+    async def waiting():
+        await release.wait()
+
+    registry = CallbackRegistry(callbacks={"one": waiting, "two": waiting})
+    registry.dispatch("one")
+    registry.dispatch("one")
+    registry.dispatch("two")
+
+    assert registry.in_flight == {"one": 2, "two": 1}
+    assert not await registry.flush(timeout=0.01)
+    assert not await registry.drain(timeout=0.01)
+
+    release.set()
+    assert await registry.drain(timeout=1)
+    assert registry.in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_drain_follow_up_work():
+    calls = []
+    registry = CallbackRegistry()
+
+    async def first():
+        await asyncio.sleep(0.01)
+        calls.append("first")
+        registry.dispatch("second")
+
+    async def second():
+        await asyncio.sleep(0.01)
+        calls.append("second")
+
+    registry.register("first", first)
+    registry.register("second", second)
+    registry.dispatch("first")
+
+    assert await registry.flush()
+    assert calls == ["first"]
+    assert registry.in_flight == {"second": 1}
+
+    assert await registry.drain()
+    assert calls == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_drain_from_callback():
+    drained = []
+    registry = CallbackRegistry()
+
+    async def draining():
+        drained.append(await registry.drain(timeout=1))
+
+    registry.register("event", draining)
+    registry.dispatch("event")
+
+    assert await registry.drain(timeout=1)
+    assert drained == [True]
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_eager():
+    calls = []
+
+    async def coroutine():
+        calls.append("eager")
+
+    lazy = Callback(coroutine)
+    lazy.eager = False
+
+    registry = CallbackRegistry(eager=True)
+    registry.register("event", coroutine)
+    registry.register("event", lazy)
+
+    registry.dispatch("event")
+    assert calls == ["eager"]
+    assert registry.in_flight == {"event": 1}
+
+    await registry.drain()
+    assert calls == ["eager", "eager"]
+
+
+class Subscriber:
+    def __init__(self):
+        self.events = []
+
+    def handle(self, *args):
+        self.events.append(args)
+
+
+def test_callback_registry_weak_bound_method():
+    registry = CallbackRegistry()
+    subscriber = Subscriber()
+    registry.register("event", subscriber.handle, weak=True)
+
+    assert registry.exists("event", subscriber.handle)
+    assert isinstance(registry.callbacks("event")[0], WeakCallback)
+
+    registry.dispatch("event", "one")
+    assert subscriber.events == [("one",)]
+
+    del subscriber
+    gc.collect()
+
+    assert registry.callbacks("event") == []
+    assert "event" not in registry._callbacks
+    assert "event" not in registry._index
+
+
+def test_callback_registry_weak_function():
+    registry = CallbackRegistry()
+    events = []
+
+    def handle(*args):
+        events.append(args)
+
+    registry.register("event", Callback(handle, "default"), weak=True)
+    registry.register("event", handle)
+    registry.dispatch("event")
+    assert events == [("default",), ()]
+
+    # a weak registration can be removed by the callback it was created from
+    registry.deregister("event", Callback(handle, "default"))
+    assert registry.callbacks("event") == [Callback(handle)]
+
+    registry.register("event", handle, weak=True)
+    registry.deregister("event", handle)
+    registry.deregister("event", handle)
+    assert registry.callbacks("event") == []
+
+    registry.register("event", handle, weak=True)
+    del handle
+    gc.collect()
+    assert registry.callbacks("event") == []
+
+
+def test_callback_registry_weak_mixed_with_strong():
+    registry = CallbackRegistry()
+    subscriber = Subscriber()
+    handle = subscriber.handle
+    registry.register("event", handle, weak=True)
+    registry.register("event", handle)
+    registry.register("other", Subscriber().handle, weak=True)
+
+    assert registry.callbacks("other") == []
+
+    registry.deregister("event", handle)
+    registry.deregister("event", handle)
+    assert registry.callbacks("event") == []
+
+    registry.register("event", subscriber.handle, weak=True)
+    registry.register("event", lambda: None)
+    del subscriber, handle
+    gc.collect()
+    assert len(registry.callbacks("event")) == 1
+
+
+class Unreferenceable:
+    __slots__ = ()
+
+    def __call__(self):
+        pass
+
+
+def test_callback_registry_weak_unsupported():
+    registry = CallbackRegistry()
+    with pytest.raises(TypeError):
+        registry.register("event", SimpleTriggerCallback(print), weak=True)
+    with pytest.raises(TypeError):
+        registry.register("event", Unreferenceable(), weak=True)
+    assert registry.callbacks("event") == []
+
+
+def test_weak_callback_dead_trigger():
+    subscriber = Subscriber()
+    callback = WeakCallback(subscriber.handle)
+    assert callback.alive
+    assert callback == Callback(subscriber.handle)
+    assert hash(callback) == hash(Callback(subscriber.handle))
+
+    del subscriber
+    gc.collect()
+    assert not callback.alive
+    assert callback.trigger("event") is None
+    assert callback == callback
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_threadsafe_dispatch(mocker):
+    loop = asyncio.get_running_loop()
+    received = []
+
+    async def handler(value):
+        assert asyncio.get_running_loop() is loop
+        received.append(value)
+
+    registry = CallbackRegistry(callbacks={"event": handler})
+    registry.bind()
+    assert registry.loop is loop
+    wakeup = mocker.spy(loop, "call_soon_threadsafe")
+
+    def produce():
+        for i in range(100):
+            registry.dispatch("event", i)
+
+    # block the loop while producing, events are handed off as a single batch
+    thread = threading.Thread(target=produce)
+    thread.start()
+    thread.join()
+    assert wakeup.call_count == 1
+
+    await asyncio.sleep(0)
+    await registry.drain()
+    assert received == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_threadsafe_dispatch_from_callback():
+    done = asyncio.Event()
+    registry = CallbackRegistry(loop=asyncio.get_running_loop())
+
+    async def finish():
+        done.set()
+
+    def relay():
+        # runs in the default executor
+        registry.dispatch("finish")
+
+    registry.register("relay", relay)
+    registry.register("finish", finish)
+    registry.dispatch("relay")
+    await asyncio.wait_for(done.wait(), 1)
+
+
+def test_callback_registry_threadsafe_dispatch_closed_loop():
+    loop = asyncio.new_event_loop()
+    registry = CallbackRegistry(loop=loop)
+    loop.close()
+    with pytest.raises(RuntimeError):
+        registry.dispatch("event")
+    assert registry._handoffs == []
+
+
+def test_callback_registry_concurrent_mutation():
+    registry = CallbackRegistry()
+    errors = []
+
+    def mutate(offset):
+        try:
+            for i in range(500):
+                callback = Callback(noop, offset + i)
+                registry.register("event", callback)
+                registry.dispatch("event")
+                assert registry.exists("event", callback)
+                registry.deregister("event", callback)
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=mutate, args=(i * 1000,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert registry.callbacks("event") == []
+    assert registry._index == {}
+
+
+def noop(*_):
+    pass
+
+
+@pytest.fixture
+def handlers_module(tmp_path, monkeypatch):
+    (tmp_path / "lazy_handlers.py").write_text(
+        "received = []\n"
+        "\n"
+        "def on_created(*args):\n"
+        "    received.append(('created', args))\n"
+        "\n"
+        "class Handlers:\n"
+        "    @staticmethod\n"
+        "    def on_deleted(*args):\n"
+        "        received.append(('deleted', args))\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_handlers", raising=False)
+    yield tmp_path
+    sys.modules.pop("lazy_handlers", None)
+
+
+def test_callback_registry_lazy(handlers_module):
+    registry = CallbackRegistry(
+        callbacks={
+            "created": "lazy_handlers:on_created",
+            "deleted": "lazy_handlers:Handlers.on_deleted",
+        }
+    )
+    registry.register("updated", LazyCallback("lazy_handlers.on_created", "updated"))
+    assert registry.exists("created", "lazy_handlers:on_created")
+    assert "lazy_handlers" not in sys.modules
+
+    registry.dispatch("created", 1)
+    module = sys.modules["lazy_handlers"]
+    assert module.received == [("created", (1,))]
+
+    (callback,) = registry.callbacks("created")
+    assert callback.resolved
+    assert callback.function is module.on_created
+    assert callback == LazyCallback("lazy_handlers:on_created")
+
+    registry.dispatch("deleted", 2)
+    registry.dispatch("updated", 3)
+    assert module.received[1:] == [("deleted", (2,)), ("created", (3, "updated"))]
+
+    registry.deregister("created", "lazy_handlers:on_created")
+    assert not registry.exists("created", "lazy_handlers:on_created")
+
+
+def test_callback_registry_lazy_invalid(handlers_module, caplog):
+    registry = CallbackRegistry(
+        callbacks={"event": ["lazy_handlers:missing", "lazy_handlers:on_created"]}
+    )
+    # a callback failing to import does not prevent others from being triggered
+    registry.dispatch("event", 1)
+    registry.dispatch("event", 2)
+    assert sys.modules["lazy_handlers"].received == [
+        ("created", (1,)),
+        ("created", (2,)),
+    ]
+    assert caplog.text.count("Failed to import callback lazy_handlers:missing") == 1
+
+    missing = registry.callbacks("event")[0]
+    assert not missing.resolved
+    with pytest.raises(AttributeError):
+        missing.resolve()
+    with pytest.raises(ValueError):
+        LazyCallback("lazy_handlers").resolve()
+    with pytest.raises(TypeError):
+        registry.register("event", "lazy_handlers:on_created", weak=True)
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_lazy_invalid_wait(handlers_module):
+    registry = CallbackRegistry(callbacks={"event": "lazy_handlers:missing"})
+    registry.dispatch("event")
+    results = await registry.dispatch_and_wait("event", return_exceptions=True)
+    assert isinstance(results[0], AttributeError)
+
+
+def test_callback_registry_entry_points(handlers_module):
+    dist_info = handlers_module / "lazy_handlers-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: lazy-handlers\nVersion: 1.0\n"
+    )
+    (dist_info / "entry_points.txt").write_text(
+        "[lazy_handlers.events]\n"
+        "created = lazy_handlers:on_created\n"
+        "deleted = lazy_handlers:Handlers.on_deleted [extra]\n"
+    )
+
+    registry = CallbackRegistry()
+    assert registry.register_entry_points("lazy_handlers.events", str.upper) == 2
+    assert registry.register_entry_points("lazy_handlers.missing") == 0
+    assert "lazy_handlers" not in sys.modules
+
+    registry.dispatch("DELETED", 1)
+    assert sys.modules["lazy_handlers"].received == [("deleted", (1,))]
@@ -3,7 +3,12 @@ import signal
 
 import pytest
 
-from cafeteria.asyncio.commons import cancel_all_tasks, cancel_tasks_on_termination
+from cafeteria.asyncio.commons import (
+    _TerminationHandler,
+    cancel_all_tasks,
+    cancel_tasks_on_termination,
+    graceful_shutdown,
+)
 
 
 # noinspection PyUnresolvedReferences,PyProtectedMember
@@ -91,3 +96,122 @@ async def test_cancel_all_tasks():
 
     # current task was ignored
     assert not (test_task.done() or test_task.cancelled())
+
+
+@pytest.mark.asyncio
+async def test_cancel_all_tasks_concurrent():
+    async def slow_cleanup():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.05)
+            raise
+
+    tasks = [asyncio.ensure_future(slow_cleanup()) for _ in range(10)]
+    await asyncio.sleep(0)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    assert await cancel_all_tasks() == set()
+
+    # cleanup runs concurrently, not one task after another
+    assert loop.time() - started < 0.4
+    assert all(task.cancelled() for task in tasks)
+
+
+@pytest.mark.asyncio
+async def test_cancel_all_tasks_timeout():
+    release = asyncio.Event()
+
+    async def stubborn():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await release.wait()
+
+    task = asyncio.ensure_future(stubborn())
+    await asyncio.sleep(0)
+
+    assert await cancel_all_tasks(None, asyncio.current_task(), timeout=0.01) == {task}
+    assert not task.done()
+
+    release.set()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_graceful_shutdown_phases():
+    calls = []
+
+    async def infinity():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            calls.append("cancelled")
+            raise
+
+    async def stop_producers():
+        calls.append("producers")
+
+    async def failing():
+        raise RuntimeError("failed")
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def drain():
+        calls.append("drain")
+
+    task = asyncio.ensure_future(infinity())
+    await asyncio.sleep(0)
+
+    pending = await graceful_shutdown(
+        stop_producers, failing, drain, ignore=[asyncio.current_task()]
+    )
+    assert pending == set()
+    assert calls == ["producers", "drain", "cancelled"]
+    assert task.cancelled()
+
+    # phases are skipped once the deadline is exceeded
+    calls.clear()
+    await graceful_shutdown(slow, drain, timeout=0.01)
+    assert calls == []
+
+
+def test_termination_handler_escalation(mocker):
+    loop = asyncio.new_event_loop()
+
+    async def blocking_phase():
+        await asyncio.sleep(10)
+
+    async def infinity():
+        await asyncio.sleep(10)
+
+    def run_briefly():
+        loop.call_later(0.01, loop.stop)
+        loop.run_forever()
+
+    try:
+        task = loop.create_task(infinity())
+        handler = _TerminationHandler(loop, [blocking_phase], None)
+
+        # the first signal starts a graceful shutdown blocked on the shutdown phase
+        loop.call_soon(handler)
+        run_briefly()
+        shutdown = handler.shutdown
+        assert shutdown is not None
+        assert not (task.done() or shutdown.done())
+
+        # the second signal cancels everything instead of starting another shutdown
+        loop.call_soon(handler)
+        run_briefly()
+        assert handler.shutdown is shutdown
+        assert task.cancelled()
+        assert shutdown.cancelled()
+
+        # further signals stop the loop
+        stop = mocker.patch.object(loop, "stop")
+        handler()
+        stop.assert_called_once()
+    finally:
+        loop.close()
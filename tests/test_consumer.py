@@ -0,0 +1,228 @@
+import asyncio
+import os
+import signal
+import threading
+
+import pytest
+
+from cafeteria.asyncio.patterns.consumer import (
+    AdaptiveLimiter,
+    AsyncioConsumerApplication,
+    IterableSource,
+    QueueSource,
+    Source,
+)
+
+
+class RecordingConsumer(AsyncioConsumerApplication):
+    def __init__(self, source, delay=0.0, fail=(), **kwargs):
+        super().__init__(source, **kwargs)
+        self.delay = delay
+        self.fail = fail
+        self.handled = []
+        self.concurrency = 0
+        self.max_concurrency = 0
+
+    async def handle(self, item):
+        self.concurrency += 1
+        self.max_concurrency = max(self.max_concurrency, self.concurrency)
+        try:
+            await asyncio.sleep(self.delay)
+            if item in self.fail:
+                raise ValueError(item)
+            self.handled.append(item)
+        finally:
+            self.concurrency -= 1
+
+
+class BatchingConsumer(RecordingConsumer):
+    def __init__(self, source, **kwargs):
+        super().__init__(source, **kwargs)
+        self.batches = []
+
+    async def handle_batch(self, items):
+        self.batches.append(list(items))
+
+
+def test_adaptive_limiter_increase():
+    limiter = AdaptiveLimiter(initial=2, maximum=4)
+    for _ in range(20):
+        while limiter.acquire_nowait():
+            pass
+        assert limiter.available == 0
+        for _ in range(limiter.in_flight):
+            limiter.release(0.01)
+    assert limiter.limit == 4
+    assert limiter.throughput > 0
+
+    # completions while not saturated do not increase the limit
+    limiter = AdaptiveLimiter(initial=2)
+    for _ in range(20):
+        assert limiter.acquire_nowait()
+        limiter.release(0.01)
+    assert limiter.limit == 2
+
+
+def test_adaptive_limiter_decrease():
+    limiter = AdaptiveLimiter(initial=16, minimum=2)
+    for _ in range(16):
+        assert limiter.acquire_nowait()
+    limiter.release(0.01)
+    assert limiter.limit == 16
+
+    # only the first slow call of the round in flight decreases the limit
+    for _ in range(15):
+        limiter.release(1.0)
+    assert limiter.limit == 8
+    assert limiter.latency > 0.01
+
+    for _ in range(4):
+        assert limiter.acquire_nowait()
+        limiter.release(0.01, failed=True)
+    assert limiter.limit == 2
+
+
+def test_adaptive_limiter_validation():
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(initial=8, maximum=4)
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(decrease=1.0)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_acquire():
+    limiter = AdaptiveLimiter(initial=1, maximum=1)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.cancel()
+    await asyncio.wait_for(waiter, 1)
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_consumer_concurrency():
+    consumer = RecordingConsumer(
+        IterableSource(range(50)),
+        delay=0.01,
+        fail=(7,),
+        limiter=AdaptiveLimiter(initial=2, maximum=8),
+    )
+    await consumer.main()
+
+    assert sorted(consumer.handled) == [i for i in range(50) if i != 7]
+    assert consumer.limiter.limit > 2
+    assert 2 < consumer.max_concurrency <= 8
+    assert consumer.limiter.in_flight == 0
+
+
+class ShrinkingSource(Source):
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.limits = []
+
+    async def fetch(self, limit):
+        self.limits.append(limit)
+        if len(self.limits) > 1:
+            return []
+        # a call failing elsewhere while fetching halves the limit
+        assert self.limiter.acquire_nowait()
+        self.limiter.release(0.01, failed=True)
+        return list(range(limit))
+
+
+@pytest.mark.asyncio
+async def test_consumer_limit_decreased_while_fetching():
+    limiter = AdaptiveLimiter(initial=8)
+    source = ShrinkingSource(limiter)
+    consumer = RecordingConsumer(source, delay=0.01, limiter=limiter)
+    await consumer.main()
+
+    assert source.limits[0] == 8
+    assert sorted(consumer.handled) == list(range(8))
+    # items fetched beyond the decreased limit waited for a slot
+    assert consumer.max_concurrency <= 4
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_consumer_async_iterable():
+    async def items():
+        for i in range(5):
+            yield i
+
+    consumer = RecordingConsumer(IterableSource(items()))
+    await consumer.main()
+    assert sorted(consumer.handled) == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_consumer_batching():
+    consumer = BatchingConsumer(IterableSource(range(25)), batch_size=10)
+    assert consumer.batching
+    assert not RecordingConsumer(IterableSource(())).batching
+
+    await consumer.main()
+    assert sorted(map(len, consumer.batches)) == [5, 10, 10]
+    assert sorted(i for batch in consumer.batches for i in batch) == list(range(25))
+    assert consumer.handled == []
+
+
+@pytest.mark.asyncio
+async def test_consumer_stop_drains():
+    queue = asyncio.Queue()
+    for i in range(4):
+        queue.put_nowait(i)
+    consumer = RecordingConsumer(QueueSource(queue), delay=0.05)
+
+    main = asyncio.ensure_future(consumer.main())
+    await asyncio.sleep(0.01)
+    assert consumer.concurrency == 4
+
+    await consumer.stop()
+    assert sorted(consumer.handled) == [0, 1, 2, 3]
+    await asyncio.wait_for(main, 1)
+    # all items were acknowledged
+    await asyncio.wait_for(queue.join(), 1)
+
+
+class ClosingQueueSource(QueueSource):
+    closed = False
+
+    async def close(self):
+        await asyncio.sleep(0.01)
+        self.closed = True
+
+
+class QueueConsumer(RecordingConsumer):
+    def __init__(self, items, **kwargs):
+        super().__init__(None, **kwargs)
+        self.items = items
+
+    async def main(self):
+        # the queue must be created on the application event loop
+        self.source = ClosingQueueSource(asyncio.Queue())
+        for item in self.items:
+            self.source.queue.put_nowait(item)
+        await super().main()
+
+
+def test_consumer_terminate():
+    consumer = QueueConsumer(range(3), delay=0.2)
+
+    def terminate():
+        threading.Event().wait(0.1)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    thread = threading.Thread(target=terminate)
+    thread.start()
+    try:
+        consumer.run()
+    finally:
+        thread.join()
+
+    # items in flight were handled rather than cancelled
+    assert sorted(consumer.handled) == [0, 1, 2]
+    assert consumer.source.closed
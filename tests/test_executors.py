@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+import pytest
+
+from cafeteria.asyncio.callbacks import Callback, CallbackRegistry
+from cafeteria.asyncio.executors import (
+    ExecutorStrategy,
+    InlineStrategy,
+    ProcessPoolStrategy,
+    StrategySaturatedError,
+    ThreadPoolStrategy,
+)
+
+
+def square(value):
+    return value * value
+
+
+@pytest.mark.asyncio
+async def test_inline_strategy(mocker):
+    m = mocker.Mock(side_effect=lambda *_, **__: threading.current_thread())
+
+    cb = Callback(m, "foo", bar="baz")
+    cb.strategy = InlineStrategy()
+    result = cb.trigger()
+
+    assert result.done()
+    assert await result is threading.current_thread()
+    m.assert_called_once_with("foo", bar="baz")
+
+
+@pytest.mark.asyncio
+async def test_inline_strategy_exception():
+    def failing():
+        raise KeyError("failed")
+
+    result = InlineStrategy().submit(failing, (), {})
+    with pytest.raises(KeyError):
+        await result
+
+
+def test_strategy_without_loop(mocker):
+    m = mocker.Mock()
+    assert ThreadPoolStrategy().submit(m, ("foo",), {}) is None
+    m.assert_called_once_with("foo")
+
+
+@pytest.mark.asyncio
+async def test_thread_pool_strategy():
+    strategy = ThreadPoolStrategy(max_workers=1, thread_name_prefix="callbacks")
+    try:
+        result = strategy.submit(lambda: threading.current_thread().name, (), {})
+        assert strategy.pending == 1
+        assert (await result).startswith("callbacks")
+        assert strategy.pending == 0
+    finally:
+        strategy.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_strategy():
+    strategy = ProcessPoolStrategy(max_workers=1)
+    try:
+        assert await strategy.submit(square, (4,), {}) == 16
+    finally:
+        strategy.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_strategy_saturated():
+    event = threading.Event()
+    strategy = ExecutorStrategy(max_pending=1)
+
+    first = strategy.submit(event.wait, (), {})
+    second = strategy.submit(event.wait, (), {})
+    with pytest.raises(StrategySaturatedError):
+        await second
+
+    event.set()
+    await first
+
+
+@pytest.mark.asyncio
+async def test_strategy_saturated_fallback(mocker):
+    event = threading.Event()
+    m = mocker.Mock(return_value="inline")
+    strategy = ExecutorStrategy(max_pending=1, fallback=InlineStrategy())
+
+    first = strategy.submit(event.wait, (), {})
+    assert await strategy.submit(m, (), {}) == "inline"
+
+    event.set()
+    await first
+
+
+@pytest.mark.asyncio
+async def test_callback_registry_strategy(mocker):
+    m = mocker.Mock()
+    explicit = Callback(mocker.Mock())
+    explicit.strategy = ExecutorStrategy()
+    shared = Callback(mocker.Mock())
+
+    registry = CallbackRegistry(strategy=InlineStrategy())
+    registry.register("event", m)
+    registry.register("event", explicit)
+    registry.register("event", shared)
+
+    callbacks = registry.callbacks("event")
+    assert isinstance(callbacks[0].strategy, InlineStrategy)
+    assert callbacks[1].strategy is explicit.strategy
+    assert isinstance(callbacks[2].strategy, InlineStrategy)
+
+    # registry defaults are not applied to the caller's instance
+    assert shared.strategy is None
+    assert registry.exists("event", shared)
+
+    registry.dispatch("event", "foo")
+    m.assert_called_once_with("foo")
+
+    await asyncio.gather(*(cb.trigger() for cb in callbacks))
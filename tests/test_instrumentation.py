@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from cafeteria.asyncio.callbacks import Callback, CallbackRegistry
+from cafeteria.asyncio.executors import InlineStrategy
+from cafeteria.asyncio.instrumentation import (
+    Histogram,
+    InMemorySink,
+    LoggingSink,
+    callback_name,
+)
+
+
+async def succeeding():
+    await asyncio.sleep(0.01)
+
+
+async def failing():
+    raise KeyError("failed")
+
+
+def blocking():
+    time.sleep(0.01)
+
+
+def test_histogram():
+    histogram = Histogram(bounds=(1, 2, 3))
+    for value in (0.5, 1.5, 1.5, 2.5, 10):
+        histogram.record(value)
+
+    assert histogram.buckets == [1, 2, 1, 1]
+    assert histogram.snapshot() == {
+        "count": 5,
+        "mean": 3.2,
+        "min": 0.5,
+        "max": 10,
+        "p50": 2,
+        "p99": 10,
+    }
+    assert Histogram().snapshot()["p50"] == 0.0
+
+
+def test_callback_name():
+    assert callback_name(Callback(Callback(blocking))) == "blocking"
+
+
+@pytest.mark.asyncio
+async def test_instrumented_registry():
+    sink = InMemorySink()
+    registry = CallbackRegistry(
+        callbacks={"event": [succeeding, failing, blocking]}, instrumentation=sink
+    )
+
+    registry.dispatch("event")
+    registry.dispatch("event")
+    assert await registry.drain(timeout=1)
+
+    snapshot = sink.snapshot()
+    assert snapshot["dispatches"] == {"event": 2}
+
+    callbacks = snapshot["callbacks"]
+    assert set(callbacks) == {
+        ("event", "succeeding"),
+        ("event", "failing"),
+        ("event", "blocking"),
+    }
+    assert callbacks[("event", "succeeding")]["calls"] == 2
+    assert callbacks[("event", "succeeding")]["failures"] == 0
+    assert callbacks[("event", "succeeding")]["duration"]["min"] >= 0.01
+    assert callbacks[("event", "failing")]["failures"] == 2
+    assert callbacks[("event", "blocking")]["duration"]["min"] >= 0.01
+
+    sink.reset()
+    assert sink.snapshot() == {"dispatches": {}, "callbacks": {}}
+
+
+@pytest.mark.asyncio
+async def test_instrumented_registry_inline():
+    sink = InMemorySink()
+    registry = CallbackRegistry(
+        callbacks={"event": blocking}, instrumentation=sink, strategy=InlineStrategy()
+    )
+    assert await registry.dispatch_and_wait("event") == [None]
+    assert sink.snapshot()["callbacks"][("event", "blocking")]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_instrumented_registry_queued_time():
+    sink = InMemorySink()
+    registry = CallbackRegistry(callbacks={"event": succeeding}, instrumentation=sink)
+
+    registry.dispatch("event")
+    # block the loop, delaying the start of the dispatched task
+    time.sleep(0.02)
+    await registry.drain()
+
+    queued = sink.snapshot()["callbacks"][("event", "succeeding")]["queued"]
+    assert queued["min"] >= 0.02
+
+
+@pytest.mark.asyncio
+async def test_logging_sink(caplog):
+    caplog.set_level(logging.INFO)
+    registry = CallbackRegistry(
+        callbacks={"event": succeeding}, instrumentation=LoggingSink(level=logging.INFO)
+    )
+    registry.dispatch("event")
+    await registry.drain()
+
+    assert "Dispatched event to 1 callbacks" in caplog.text
+    assert "Callback succeeding for event completed" in caplog.text
@@ -0,0 +1,250 @@
+import asyncio
+import os
+import stat
+import sys
+
+import pytest
+
+from cafeteria.asyncio.bus import Event, QueuedCallbackRegistry
+from cafeteria.asyncio.callbacks import CallbackRegistry
+from cafeteria.asyncio.ipc import IPCTransport, JSONSerializer, PickleSerializer
+from cafeteria.asyncio.matching import Wildcard
+
+
+async def eventually(condition, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "events.sock")
+
+
+def test_serializers():
+    events = [Event("a", (1, "b"), {"c": [2]}), Event("d", (), {})]
+    for serializer in (PickleSerializer(), JSONSerializer()):
+        assert serializer.loads(serializer.dumps(events)) == events
+
+
+@pytest.mark.asyncio
+async def test_ipc_transport(mocker, socket_path):
+    server, client = CallbackRegistry(), CallbackRegistry()
+    on_server, on_client = mocker.Mock(), mocker.Mock()
+    server.register("ping", on_server)
+    client.register("ping", on_client)
+
+    async with IPCTransport(server, ["ping"]) as hub:
+        async with IPCTransport(client, ["ping"]) as peer:
+            await hub.serve(socket_path)
+            assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+            await peer.connect(socket_path)
+            await eventually(lambda: hub.peers == 1)
+
+            server.dispatch("ping", 1, value="server")
+            await eventually(lambda: on_client.called)
+            on_client.assert_called_once_with(1, value="server")
+            on_server.assert_called_once_with(1, value="server")
+
+            client.dispatch("ping", 2, value="client")
+            await eventually(lambda: on_server.call_count == 2)
+            on_server.assert_called_with(2, value="client")
+
+            # received events are not sent back out
+            await asyncio.sleep(0.05)
+            assert on_server.call_count == 2
+            assert on_client.call_count == 2
+
+            # event types not forwarded stay local
+            client.register("local", on_server)
+            client.dispatch("local")
+            await asyncio.sleep(0.05)
+            assert on_server.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_ipc_transport_request_response(socket_path):
+    server, client = CallbackRegistry(), CallbackRegistry(eager=True)
+    pongs = []
+    server.register("pong", pongs.append)
+
+    async def ping(value):
+        # handled synchronously while the received event is dispatched
+        client.dispatch("pong", value)
+
+    client.register("ping", ping)
+
+    async with IPCTransport(server, ["ping"]) as hub:
+        async with IPCTransport(client, ["pong"]) as peer:
+            await hub.serve(socket_path)
+            await peer.connect(socket_path)
+            await eventually(lambda: hub.peers == 1)
+
+            server.dispatch("ping", 1)
+            await eventually(lambda: pongs == [1])
+
+
+@pytest.mark.asyncio
+async def test_ipc_transport_close_serving(socket_path):
+    errors = []
+    asyncio.get_running_loop().set_exception_handler(
+        lambda _, context: errors.append(context)
+    )
+    hub, peer = IPCTransport(CallbackRegistry(), []), IPCTransport(
+        CallbackRegistry(), []
+    )
+    await hub.serve(socket_path)
+    await peer.connect(socket_path)
+    await eventually(lambda: hub.peers == 1)
+
+    # on Python 3.12+ servers wait for their connections to close
+    await asyncio.wait_for(hub.close(), 1)
+    await eventually(lambda: peer.peers == 0)
+    await peer.close()
+    await asyncio.sleep(0.01)
+    assert errors == []
+
+
+@pytest.mark.asyncio
+async def test_ipc_transport_relay(mocker, socket_path):
+    registries = [CallbackRegistry() for _ in range(3)]
+    mocks = [mocker.Mock() for _ in registries]
+    for registry, mock in zip(registries, mocks):
+        registry.register(Wildcard("order.*"), mock)
+    transports = [
+        IPCTransport(registry, [Wildcard("order.*")]) for registry in registries
+    ]
+
+    await transports[0].serve(socket_path)
+    for transport in transports[1:]:
+        await transport.connect(socket_path)
+    await eventually(lambda: transports[0].peers == 2)
+
+    registries[1].dispatch("order.created", 42)
+    await eventually(lambda: all(mock.called for mock in mocks))
+    await asyncio.sleep(0.05)
+    for mock in mocks:
+        mock.assert_called_once_with(42)
+
+    for transport in reversed(transports):
+        await transport.close()
+    assert transports[0].peers == 0
+
+
+@pytest.mark.asyncio
+async def test_ipc_transport_batching(mocker, socket_path):
+    server, client = CallbackRegistry(), CallbackRegistry()
+    received = []
+
+    async def tick(value):
+        received.append(value)
+
+    client.register("tick", tick)
+    serializer = PickleSerializer()
+    dumps = mocker.spy(serializer, "dumps")
+
+    async with IPCTransport(server, ["tick"], serializer=serializer) as hub:
+        async with IPCTransport(client, []) as peer:
+            await hub.serve(socket_path)
+            await peer.connect(socket_path)
+            await eventually(lambda: hub.peers == 1)
+
+            for i in range(1000):
+                server.dispatch("tick", i)
+            await eventually(lambda: len(received) == 1000)
+
+    assert received == list(range(1000))
+    assert dumps.call_count <= 1000 / hub.batch_size + 1
+
+
+@pytest.mark.asyncio
+async def test_ipc_transport_unserializable(caplog, socket_path):
+    server, client = CallbackRegistry(), CallbackRegistry()
+    received = []
+    client.register("event", received.append)
+
+    async with IPCTransport(server, ["event"], serializer=JSONSerializer()) as hub:
+        async with IPCTransport(client, [], serializer=JSONSerializer()) as peer:
+            await hub.serve(socket_path)
+            await peer.connect(socket_path)
+            await eventually(lambda: hub.peers == 1)
+
+            server.dispatch("event", 1)
+            server.dispatch("event", object())
+            server.dispatch("event", 2)
+            await eventually(lambda: len(received) == 2)
+
+    assert received == [1, 2]
+    assert "Failed to serialize event event" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_ipc_transport_queued_registry(mocker, socket_path):
+    server, client = QueuedCallbackRegistry(), QueuedCallbackRegistry()
+    on_server, on_client = mocker.AsyncMock(), mocker.AsyncMock()
+    server.register("ping", on_server)
+    client.register("ping", on_client)
+
+    async with server, client:
+        async with IPCTransport(server, ["ping"]) as hub:
+            async with IPCTransport(client, ["ping"]) as peer:
+                await hub.serve(socket_path)
+                await peer.connect(socket_path)
+                await eventually(lambda: hub.peers == 1)
+
+                client.dispatch("ping", "hello")
+                await eventually(lambda: on_server.called)
+                await asyncio.sleep(0.05)
+                on_server.assert_awaited_once_with("hello")
+                on_client.assert_awaited_once_with("hello")
+                assert not peer._received
+
+
+CHILD = """
+import asyncio, sys
+from cafeteria.asyncio.callbacks import CallbackRegistry
+from cafeteria.asyncio.ipc import IPCTransport
+
+async def main():
+    registry = CallbackRegistry()
+    done = asyncio.Event()
+
+    async def ping(value):
+        registry.dispatch("pong", value * 2, pid=sys.argv[2])
+        done.set()
+
+    registry.register("ping", ping)
+    async with IPCTransport(registry, ["pong"]) as transport:
+        await transport.connect(sys.argv[1])
+        await asyncio.wait_for(done.wait(), 5)
+        await asyncio.sleep(0.1)
+
+asyncio.run(main())
+"""
+
+
+@pytest.mark.asyncio
+async def test_ipc_transport_processes(socket_path):
+    registry = CallbackRegistry()
+    pongs = []
+    registry.register("pong", lambda value, pid: pongs.append((value, pid)))
+
+    async with IPCTransport(registry, ["ping"]) as transport:
+        await transport.serve(socket_path)
+        processes = [
+            await asyncio.create_subprocess_exec(
+                sys.executable, "-c", CHILD, socket_path, str(index)
+            )
+            for index in range(2)
+        ]
+        await eventually(lambda: transport.peers == 2, timeout=10)
+
+        registry.dispatch("ping", 21)
+        await eventually(lambda: len(pongs) == 2, timeout=10)
+        for process in processes:
+            assert await asyncio.wait_for(process.wait(), 10) == 0
+
+    assert sorted(pongs) == [(42, "0"), (42, "1")]
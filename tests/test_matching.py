@@ -0,0 +1,120 @@
+from enum import Enum
+
+import pytest
+
+from cafeteria.asyncio.callbacks import Callback, CallbackRegistry
+from cafeteria.asyncio.matching import TypeHierarchy, Wildcard
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Shape(Enum):
+    CIRCLE = "circle"
+
+
+def test_wildcard():
+    pattern = Wildcard("order.*")
+    assert pattern.matches("order.created")
+    assert pattern.matches("order.item.added")
+    assert not pattern.matches("order")
+    assert not pattern.matches("invoice.created")
+    assert not pattern.matches(1)
+    assert pattern == Wildcard("order.*")
+    assert hash(pattern) == hash(Wildcard("order.*"))
+
+
+def test_type_hierarchy():
+    pattern = TypeHierarchy(LookupError)
+    assert pattern.matches(KeyError)
+    assert pattern.matches(KeyError("key"))
+    assert pattern.matches(LookupError)
+    assert not pattern.matches(ValueError)
+    assert not pattern.matches("KeyError")
+
+    assert TypeHierarchy(Color).matches(Color.RED)
+    assert not TypeHierarchy(Color).matches(Shape.CIRCLE)
+
+
+def test_callback_registry_patterns(mocker):
+    exact = mocker.Mock()
+    orders = mocker.Mock()
+    everything = mocker.Mock()
+    default = mocker.Mock()
+
+    registry = CallbackRegistry()
+    registry.register(Wildcard("order.*"), orders)
+    registry.register("order.created", exact)
+    registry.register(Wildcard("*"), everything)
+    registry.register(None, default)
+
+    # registration order is retained across exact and pattern registrations
+    assert registry.callbacks("order.created") == [
+        Callback(orders),
+        Callback(exact),
+        Callback(everything),
+    ]
+    assert registry.callbacks("order.cancelled") == [
+        Callback(orders),
+        Callback(everything),
+    ]
+    assert registry.callbacks(1) == [Callback(default)]
+    assert registry.callbacks() == [Callback(default)]
+
+    registry.dispatch("order.cancelled", "payload")
+    orders.assert_called_once_with("payload")
+    everything.assert_called_once_with("payload")
+    exact.assert_not_called()
+    default.assert_not_called()
+
+    assert registry.exists("order.cancelled", orders)
+    assert not registry.exists("order.cancelled", exact)
+
+    registry.deregister(Wildcard("*"), everything)
+    assert registry.callbacks("order.cancelled") == [Callback(orders)]
+
+    registry.deregister(Wildcard("order.*"), orders)
+    assert registry.callbacks("order.cancelled") == [Callback(default)]
+
+
+@pytest.mark.parametrize(
+    "event_type,expected",
+    [(KeyError, ["lookup", "key"]), (IndexError, ["lookup"]), (ValueError, [])],
+)
+def test_callback_registry_type_hierarchy(event_type, expected):
+    received = []
+    registry = CallbackRegistry()
+    registry.register(TypeHierarchy(LookupError), lambda: received.append("lookup"))
+    registry.register(KeyError, lambda: received.append("key"))
+
+    for callback in registry.callbacks(event_type):
+        callback.function()
+    assert received == expected
+
+
+def test_callback_registry_enum_group(mocker):
+    colors = mocker.Mock()
+    registry = CallbackRegistry(callbacks={TypeHierarchy(Color): colors})
+
+    assert registry.callbacks(Color.RED) == [Callback(colors)]
+    assert registry.callbacks(Color.BLUE) == [Callback(colors)]
+    assert registry.callbacks(Shape.CIRCLE) == []
+
+
+def test_callback_registry_pattern_resolution_cached(mocker):
+    registry = CallbackRegistry()
+    pattern = Wildcard("order.*")
+    registry.register(pattern, mocker.Mock())
+
+    matches = mocker.spy(Wildcard, "matches")
+    registry.callbacks("order.created")
+    registry.callbacks("order.created")
+    registry.dispatch("order.created")
+    assert matches.call_count == 1
+
+    # registry changes invalidate cached resolutions
+    registry.register("order.created", mocker.Mock())
+    registry.callbacks("order.created")
+    assert matches.call_count == 2
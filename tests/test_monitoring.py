@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+
+from cafeteria.asyncio.callbacks import CallbackRegistry
+from cafeteria.asyncio.executors import ThreadPoolStrategy
+from cafeteria.asyncio.instrumentation import InMemorySink
+from cafeteria.asyncio.monitoring import (
+    BlockedLoop,
+    HealthReporter,
+    LoggingHealthReporter,
+    LoopHealth,
+    LoopMonitor,
+)
+from cafeteria.asyncio.patterns.application import AsyncioGracefulApplication
+
+
+class RecordingReporter(HealthReporter):
+    def __init__(self):
+        self.health = []
+        self.blocked = []
+
+    def report_health(self, health: LoopHealth) -> None:
+        self.health.append(health)
+
+    def report_blocked(self, blocked: BlockedLoop) -> None:
+        self.blocked.append(blocked)
+
+
+async def idle():
+    await asyncio.sleep(10)
+
+
+def block_loop(seconds):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_health():
+    reporter = RecordingReporter()
+    strategy = ThreadPoolStrategy(max_workers=1)
+    tasks = [asyncio.ensure_future(idle()) for _ in range(3)]
+
+    async with LoopMonitor(
+        interval=0.05, block_threshold=1, reporter=reporter, executor=strategy
+    ) as monitor:
+        assert monitor.running
+        await asyncio.sleep(0.12)
+        block_loop(0.15)
+        await asyncio.sleep(0.06)
+    assert not monitor.running
+
+    for task in tasks:
+        task.cancel()
+    strategy.shutdown()
+
+    assert len(reporter.health) >= 2
+    assert reporter.health[0].tasks["idle"] == 3
+    assert reporter.health[0].executor_queue == 0
+    assert max(health.lag for health in reporter.health) >= 0.09
+    assert reporter.blocked == []
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_task_names():
+    registry = CallbackRegistry(
+        callbacks={"event": idle}, eager=True, instrumentation=InMemorySink()
+    )
+    for _ in range(2):
+        registry.dispatch("event")
+
+    reporter = RecordingReporter()
+    async with LoopMonitor(interval=0.02, block_threshold=1, reporter=reporter):
+        await asyncio.sleep(0.03)
+    for futures in registry._in_flight.values():
+        for future in futures:
+            future.cancel()
+
+    # callback coroutines wrapped by the registry are reported by their own name
+    assert reporter.health[0].tasks["idle"] == 2
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_blocked():
+    reporter = RecordingReporter()
+
+    async def blocking():
+        block_loop(0.3)
+
+    async with LoopMonitor(interval=10, block_threshold=0.05, reporter=reporter):
+        await asyncio.ensure_future(blocking())
+        await asyncio.sleep(0)
+
+    assert len(reporter.blocked) == 1
+    blocked = reporter.blocked[0]
+    assert blocked.duration >= 0.05
+    assert blocked.task == "test_loop_monitor_blocked.<locals>.blocking"
+    assert "block_loop" in blocked.stack
+
+
+def test_loop_monitor_logging(caplog):
+    reporter = LoggingHealthReporter()
+    with caplog.at_level("DEBUG"):
+        reporter.report_health(LoopHealth(0.1, {"idle": 2}, None))
+        reporter.report_blocked(BlockedLoop(1.5, None, "stack"))
+    assert "2 tasks" in caplog.records[0].getMessage()
+    assert caplog.records[1].levelname == "WARNING"
+
+    with pytest.raises(ValueError):
+        LoopMonitor(interval=0)
+
+
+def test_application_monitor():
+    reporter = RecordingReporter()
+
+    class Application(AsyncioGracefulApplication):
+        monitor = LoopMonitor(interval=0.01, reporter=reporter)
+
+        async def main(self):
+            assert self.monitor.running
+            await asyncio.sleep(0.05)
+            return "done"
+
+    application = Application()
+    assert application.run() == "done"
+    assert not application.monitor.running
+    assert reporter.health
@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from cafeteria.asyncio.bus import QueuedCallbackRegistry
+from cafeteria.asyncio.callbacks import CallbackRegistry
+from cafeteria.asyncio.executors import InlineStrategy
+from cafeteria.asyncio.policies import Coalesce, Debounce, Throttle, accumulate
+
+
+def registry_with_policy(policy):
+    received = []
+    registry = CallbackRegistry(
+        callbacks={"event": lambda *args, **kwargs: received.append((args, kwargs))},
+        strategy=InlineStrategy(),
+    )
+    registry.set_policy("event", policy)
+    return registry, received
+
+
+@pytest.mark.asyncio
+async def test_debounce_trailing():
+    registry, received = registry_with_policy(Debounce(0.02))
+    for i in range(5):
+        registry.dispatch("event", i)
+        await asyncio.sleep(0.005)
+    assert received == []
+
+    await asyncio.sleep(0.04)
+    assert received == [((4,), {})]
+
+
+@pytest.mark.asyncio
+async def test_debounce_leading():
+    registry, received = registry_with_policy(Debounce(0.02, leading=True))
+    for i in range(5):
+        registry.dispatch("event", i)
+    assert received == [((0,), {})]
+
+    await asyncio.sleep(0.04)
+    registry.dispatch("event", 5)
+    assert received == [((0,), {}), ((5,), {})]
+
+
+@pytest.mark.asyncio
+async def test_debounce_key():
+    registry, received = registry_with_policy(Debounce(0.01, key=lambda k, _: k))
+    registry.dispatch("event", "a", 1)
+    registry.dispatch("event", "b", 1)
+    registry.dispatch("event", "a", 2)
+
+    await asyncio.sleep(0.03)
+    assert sorted(received) == [(("a", 2), {}), (("b", 1), {})]
+
+
+# noinspection PyProtectedMember
+@pytest.mark.asyncio
+async def test_throttle():
+    registry, received = registry_with_policy(Throttle(rate=1, per=0.03))
+    for i in range(5):
+        registry.dispatch("event", i)
+    assert received == [((0,), {})]
+
+    # the most recent event is delivered once the rate allows
+    await asyncio.sleep(0.045)
+    assert received == [((0,), {}), ((4,), {})]
+
+    await asyncio.sleep(0.045)
+    assert received == [((0,), {}), ((4,), {})]
+    assert registry._policies["event"]._states == {}
+
+
+@pytest.mark.asyncio
+async def test_throttle_without_trailing():
+    registry, received = registry_with_policy(
+        Throttle(rate=2, per=0.04, trailing=False)
+    )
+    for i in range(5):
+        registry.dispatch("event", i)
+    await asyncio.sleep(0.03)
+    registry.dispatch("event", 5)
+    assert received == [((0,), {}), ((5,), {})]
+
+
+@pytest.mark.asyncio
+async def test_coalesce():
+    registry, received = registry_with_policy(Coalesce(0.01))
+    registry.dispatch("event", 1, key="a")
+    registry.dispatch("event", 2, key="b")
+
+    await asyncio.sleep(0.03)
+    assert received == [((2,), {"key": "b"})]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_accumulate():
+    registry, received = registry_with_policy(Coalesce(0.01, merge=accumulate))
+    registry.dispatch("event", 1)
+    registry.dispatch("event", 2, key="b")
+
+    await asyncio.sleep(0.03)
+    assert received == [(([((1,), {}), ((2,), {"key": "b"})],), {})]
+
+
+@pytest.mark.asyncio
+async def test_policy_flush_and_cancel():
+    policy = Coalesce(10)
+    registry, received = registry_with_policy(policy)
+    registry.dispatch("event", 1)
+    policy.flush()
+    assert received == [((1,), {})]
+
+    registry.dispatch("event", 2)
+    policy.cancel()
+    await asyncio.sleep(0)
+    assert received == [((1,), {})]
+
+
+@pytest.mark.asyncio
+async def test_policy_replaced():
+    registry, received = registry_with_policy(Debounce(10))
+    registry.dispatch("event", 1)
+
+    # replacing a policy flushes pending events
+    registry.set_policy("event", None)
+    assert received == [((1,), {})]
+
+    registry.dispatch("event", 2)
+    assert received == [((1,), {}), ((2,), {})]
+
+
+@pytest.mark.asyncio
+async def test_policy_queued_registry():
+    received = []
+
+    async def handler(value):
+        received.append(value)
+
+    async with QueuedCallbackRegistry(callbacks={"event": handler}) as registry:
+        registry.set_policy("event", Debounce(0.02))
+        for i in range(5):
+            registry.dispatch("event", i)
+        await registry.publish("event", 5)
+        assert registry.queued == 0
+
+        await asyncio.sleep(0.04)
+    assert received == [5]
+
+
+def test_policy_without_loop():
+    registry, received = registry_with_policy(Debounce(10))
+    registry.dispatch("event", 1)
+    assert received == [((1,), {})]
+
+
+def test_throttle_invalid_rate():
+    with pytest.raises(ValueError):
+        Throttle(rate=0)
@@ -0,0 +1,101 @@
+import asyncio
+import concurrent.futures
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cafeteria.asyncio.synchronous import (
+    AsyncioBridge,
+    default_bridge,
+    execute_async_method,
+)
+
+
+async def identify(value=None):
+    await asyncio.sleep(0)
+    return value, threading.current_thread().name, asyncio.get_running_loop()
+
+
+def test_bridge_reuses_loop():
+    with AsyncioBridge(name="bridge") as bridge:
+        _, thread_one, loop_one = bridge.run(identify())
+        _, thread_two, loop_two = bridge.run(identify())
+
+    assert thread_one == thread_two == "bridge"
+    assert loop_one is loop_two
+    assert loop_one.is_closed()
+
+
+def test_bridge_map():
+    async def double(value):
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    with AsyncioBridge() as bridge:
+        assert bridge.map(double, range(100), timeout=1) == [i * 2 for i in range(100)]
+
+
+def test_bridge_timeout_cancels():
+    cancelled = []
+
+    async def slow(value):
+        try:
+            await asyncio.sleep(value)
+        except asyncio.CancelledError:
+            cancelled.append(value)
+            raise
+        return value
+
+    with AsyncioBridge() as bridge:
+        with pytest.raises(concurrent.futures.TimeoutError):
+            bridge.run(slow(60), timeout=0.01)
+        with pytest.raises(concurrent.futures.TimeoutError):
+            bridge.map(slow, [0, 30, 60], timeout=0.05)
+        # cancellation is delivered on the bridge loop
+        bridge.run(asyncio.sleep(0.01))
+        assert sorted(cancelled) == [30, 60, 60]
+
+
+def test_bridge_concurrent_callers():
+    with AsyncioBridge() as bridge:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: bridge.run(identify(i)), range(50)))
+
+    assert [value for value, _, _ in results] == list(range(50))
+    assert len({loop for _, _, loop in results}) == 1
+
+
+def test_bridge_close_cancels_pending():
+    bridge = AsyncioBridge()
+    future = bridge.submit(asyncio.sleep(60))
+    bridge.close()
+    assert future.cancelled()
+
+    # the bridge is started again when used after closing
+    assert bridge.run(identify("again"))[0] == "again"
+    bridge.close()
+
+
+def test_bridge_run_from_own_loop():
+    async def nested():
+        return bridge.run(identify())
+
+    with AsyncioBridge() as bridge:
+        with pytest.raises(RuntimeError):
+            bridge.run(nested())
+
+
+def test_execute_async_method_without_loop():
+    value, _, loop = execute_async_method(identify("sync"))
+    assert value == "sync"
+    assert loop is default_bridge().loop
+
+
+@pytest.mark.asyncio
+async def test_execute_async_method_with_loop():
+    task = execute_async_method(identify("async"))
+    assert isinstance(task, asyncio.Task)
+    value, _, loop = await task
+    assert value == "async"
+    assert loop is asyncio.get_running_loop()
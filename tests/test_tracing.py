@@ -0,0 +1,229 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+
+import pytest
+
+from cafeteria.asyncio.bus import QueuedCallbackRegistry
+from cafeteria.asyncio.callbacks import CallbackRegistry
+from cafeteria.asyncio.executors import ThreadPoolStrategy
+from cafeteria.asyncio.tracing import (
+    LoggingTracer,
+    Span,
+    SpanKind,
+    Tracer,
+    current_span,
+)
+
+request_id: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+
+
+class RecordingTracer(Tracer):
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_start(self, span: Span) -> None:
+        self.started.append(span)
+
+    def on_end(self, span: Span) -> None:
+        self.ended.append(span)
+
+    def spans(self, kind):
+        return [span for span in self.ended if span.kind is kind]
+
+
+def blocking():
+    time.sleep(0.05)
+
+
+async def failing():
+    raise KeyError("failed")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", [None, ThreadPoolStrategy(max_workers=2)])
+async def test_context_propagation(strategy):
+    seen = []
+
+    def handler(value):
+        seen.append((request_id.get(), value, threading.current_thread().name))
+
+    registry = CallbackRegistry(callbacks={"event": handler}, strategy=strategy)
+    for value in range(3):
+        request_id.set(f"request-{value}")
+        registry.dispatch("event", value)
+    assert await registry.drain(timeout=1)
+
+    assert sorted(seen)[0][:2] == ("request-0", 0)
+    assert sorted(item[:2] for item in seen) == [
+        (f"request-{value}", value) for value in range(3)
+    ]
+    assert all(name != threading.current_thread().name for *_, name in seen)
+
+
+@pytest.mark.asyncio
+async def test_context_propagation_handoff():
+    seen = []
+
+    async def handler(value):
+        seen.append((request_id.get(), value))
+
+    registry = CallbackRegistry(callbacks={"event": handler})
+    registry.bind()
+
+    def produce():
+        for value in range(3):
+            request_id.set(f"thread-{value}")
+            registry.dispatch("event", value)
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    thread.join()
+    await asyncio.sleep(0)
+    assert await registry.drain(timeout=1)
+    assert seen == [(f"thread-{value}", value) for value in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_context_propagation_queued():
+    seen = []
+
+    async def handler(value):
+        seen.append((request_id.get(), value))
+
+    async with QueuedCallbackRegistry(callbacks={"event": handler}) as registry:
+        for value in range(3):
+            request_id.set(f"queued-{value}")
+            registry.dispatch("event", value)
+        request_id.set(None)
+
+    assert seen == [(f"queued-{value}", value) for value in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_tracer_spans():
+    tracer = RecordingTracer()
+    registry = CallbackRegistry(tracer=tracer)
+    spans = {}
+
+    async def handler():
+        spans["handler"] = current_span()
+        registry.dispatch("nested")
+        await asyncio.sleep(0.02)
+
+    def sync_handler():
+        spans["sync"] = current_span()
+
+    registry.register("event", handler)
+    registry.register("event", sync_handler)
+    registry.register("event", failing)
+    registry.register("nested", blocking)
+
+    registry.dispatch("event")
+    assert current_span() is None
+    assert await registry.drain(timeout=1)
+
+    dispatches = tracer.spans(SpanKind.DISPATCH)
+    callbacks = tracer.spans(SpanKind.CALLBACK)
+    assert len(tracer.started) == len(tracer.ended) == 6
+    assert [span.event_type for span in dispatches] == ["event", "nested"]
+    event, nested = dispatches
+
+    by_name = {span.name: span for span in callbacks}
+    assert set(by_name) == {
+        "callback test_tracer_spans.<locals>.handler",
+        "callback test_tracer_spans.<locals>.sync_handler",
+        "callback failing",
+        "callback blocking",
+    }
+    handler_span = by_name["callback test_tracer_spans.<locals>.handler"]
+    assert spans == {
+        "handler": handler_span,
+        "sync": by_name["callback test_tracer_spans.<locals>.sync_handler"],
+    }
+    assert handler_span.parent is event
+    assert handler_span.duration >= 0.02
+    assert by_name["callback failing"].failed
+    assert event.failed
+
+    # the nested dispatch is a child of the callback dispatching it, and ends with it
+    assert nested.parent is handler_span
+    assert by_name["callback blocking"].parent is nested
+    assert nested.duration >= by_name["callback blocking"].duration >= 0.05
+    assert not nested.failed
+
+    # a dispatch ends once all its callbacks have completed
+    assert tracer.ended.index(event) > tracer.ended.index(handler_span)
+    assert event.duration >= handler_span.duration
+
+
+@pytest.mark.asyncio
+async def test_tracer_queued_time():
+    tracer = RecordingTracer()
+    registry = CallbackRegistry(
+        callbacks={"event": [blocking, blocking]},
+        strategy=ThreadPoolStrategy(max_workers=1),
+        tracer=tracer,
+    )
+    registry.dispatch("event")
+    assert await registry.drain(timeout=1)
+
+    first, second = sorted(tracer.spans(SpanKind.CALLBACK), key=lambda s: s.queued)
+    # the second call waits for the only executor thread
+    assert first.duration >= 0.05
+    assert second.queued >= 0.04
+    assert tracer.spans(SpanKind.DISPATCH)[0].duration >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_tracer_queued_registry():
+    tracer = RecordingTracer()
+    registry = QueuedCallbackRegistry(callbacks={"event": blocking}, tracer=tracer)
+    registry.dispatch("event")
+    registry.dispatch("event")
+    async with registry:
+        pass
+
+    first, second = tracer.spans(SpanKind.DISPATCH)
+    # the second event waits for the callback of the first to complete
+    assert first.duration >= 0.05
+    assert second.queued >= 0.04
+    assert all(
+        span.parent in (first, second) for span in tracer.spans(SpanKind.CALLBACK)
+    )
+
+
+@pytest.mark.asyncio
+async def test_tracer_dispatch_and_wait():
+    tracer = RecordingTracer()
+    registry = CallbackRegistry(callbacks={"event": [blocking, failing]}, tracer=tracer)
+    await registry.dispatch_and_wait("event", return_exceptions=True)
+
+    (dispatch,) = tracer.spans(SpanKind.DISPATCH)
+    assert dispatch.failed
+    assert dispatch.duration >= 0.05
+    assert {span.parent for span in tracer.spans(SpanKind.CALLBACK)} == {dispatch}
+
+
+@pytest.mark.asyncio
+async def test_logging_tracer(caplog):
+    caplog.set_level(logging.DEBUG)
+    registry = CallbackRegistry(
+        callbacks={"event": blocking, "fast": lambda: None},
+        tracer=LoggingTracer(threshold=0.04),
+    )
+    registry.dispatch("event")
+    registry.dispatch("fast")
+    assert await registry.drain(timeout=1)
+
+    messages = [
+        record.getMessage()
+        for record in caplog.records
+        if record.name == "cafeteria.asyncio.tracing"
+    ]
+    assert len(messages) == 2
+    assert messages[0].startswith("callback blocking (in dispatch event) completed")
+    assert messages[1].startswith("dispatch event completed")